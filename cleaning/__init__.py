@@ -0,0 +1,32 @@
+"""Núcleo de limpieza de datos, utilizable sin tkinter
+
+Contiene las funciones de procesamiento (teléfonos, fechas, comentarios y
+fusión) que usa la interfaz gráfica y que también pueden ejecutarse desde la
+línea de comandos (python -m cleaning). Depende de pandas, numpy y openpyxl.
+"""
+from cleaning.carga import BaseDatos, iterar_bloques, leer_base, leer_encabezados
+from cleaning.comentarios import generar_comentarios
+from cleaning.consolidacion import consolidar_telefonos
+from cleaning.fechas import formatear_columna_fechas, interpretar_fecha
+from cleaning.flujo import procesar_archivo, procesar_por_bloques
+from cleaning.fusion import IndiceCedulas, anexar_columnas, fusionar_por_cedula
+from cleaning.progreso import ProcesoCancelado
+from cleaning.telefonos import procesar_telefonos
+
+__all__ = [
+    "BaseDatos",
+    "IndiceCedulas",
+    "ProcesoCancelado",
+    "anexar_columnas",
+    "consolidar_telefonos",
+    "formatear_columna_fechas",
+    "fusionar_por_cedula",
+    "generar_comentarios",
+    "interpretar_fecha",
+    "iterar_bloques",
+    "leer_base",
+    "leer_encabezados",
+    "procesar_archivo",
+    "procesar_por_bloques",
+    "procesar_telefonos",
+]
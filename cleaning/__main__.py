@@ -0,0 +1,132 @@
+"""Ejecución sin interfaz gráfica de la limpieza de teléfonos
+
+Ejemplo:
+    python -m cleaning base.xlsx --cedula CEDULA --telefonos TEL1 TEL2 TEL3 --salida limpia.xlsx
+
+Para bases muy grandes, --bloques N procesa el archivo de N en N filas sin
+cargarlo completo en memoria:
+    python -m cleaning base.xlsx --cedula CEDULA --telefonos TEL1 TEL2 --salida limpia.xlsx --bloques 50000
+
+El formato de salida se toma de la extensión (.xlsx, .csv, .csv.gz o
+.parquet) o de --formato.
+
+Con --consolidar queda una sola fila por cédula con todos sus teléfonos
+(ver cleaning.consolidacion).
+
+Al terminar se imprime en la salida estándar un resumen en JSON con las
+estadísticas del proceso. Los logs se escriben en la salida de errores.
+"""
+import argparse
+import json
+import logging
+import sys
+
+from cleaning.flujo import procesar_archivo, procesar_por_bloques
+from cleaning.lote import configuracion_desde_argumentos, guardar_configuracion
+from cleaning.salida import FORMATOS_SALIDA, formato_de_ruta
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Códigos de salida
+EXITO = 0
+ERROR_PROCESO = 1
+ERROR_ARGUMENTOS = 2
+
+def crear_parser():
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m cleaning",
+        description="Limpieza de teléfonos dominicanos sin interfaz gráfica"
+    )
+    parser.add_argument("archivo", help="Archivo de entrada: Excel, CSV/TSV (también .gz) o Parquet")
+    parser.add_argument("--hoja", help="Hoja del Excel de entrada (por defecto, la primera)")
+    parser.add_argument("--cedula", required=True, help="Columna de cédula")
+    parser.add_argument("--telefonos", required=True, nargs="+",
+                        help="Columnas de teléfono, en el orden deseado")
+    parser.add_argument("--salida", required=True,
+                        help="Archivo de salida (.xlsx, .csv, .csv.gz o .parquet)")
+    parser.add_argument("--formato", choices=FORMATOS_SALIDA,
+                        help="Formato de salida; por defecto se toma de la extensión de --salida")
+    parser.add_argument("--fechas", nargs="+", default=[],
+                        help="Columnas de fecha a formatear como DD/MM/YYYY")
+    parser.add_argument("--comentarios", nargs="+", default=[],
+                        help="Elementos de la columna COMENTARIOS, con la sintaxis de la "
+                             "interfaz: 'COLUMNA', 'COLUMNA (RD$)', 'COLUMNA (US$)' o '(texto)'")
+    parser.add_argument("--cero", nargs="+", default=[],
+                        help="Columnas de COMENTARIOS donde 0 se escribe como 1 (RD$0 como RD$1)")
+    parser.add_argument("--consolidar", action="store_true",
+                        help="Dejar una fila por cédula con los teléfonos de todas sus filas")
+    parser.add_argument("--bloques", type=int, metavar="N",
+                        help="Procesar el archivo por bloques de N filas (bases muy grandes)")
+    parser.add_argument("--estadisticas",
+                        help="Guardar también el resumen JSON en este archivo")
+    parser.add_argument("--guardar-configuracion", metavar="ARCHIVO",
+                        help="Guardar las columnas y opciones en un JSON para procesar "
+                             "lotes de archivos con python -m cleaning.lote")
+    parser.add_argument("--nivel-log", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Nivel de detalle de los logs (por defecto INFO)")
+    return parser
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos; retorna el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, args.nivel_log),
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        stream=sys.stderr
+    )
+
+    if args.bloques is not None and args.bloques <= 0:
+        logger.error("--bloques debe ser un número positivo")
+        return ERROR_ARGUMENTOS
+
+    try:
+        formato = args.formato or formato_de_ruta(args.salida)
+    except ValueError as e:
+        logger.error(str(e))
+        return ERROR_ARGUMENTOS
+
+    if args.bloques and args.consolidar:
+        logger.error("--consolidar necesita la base completa y no se puede usar con --bloques")
+        return ERROR_ARGUMENTOS
+
+    if args.guardar_configuracion:
+        guardar_configuracion(configuracion_desde_argumentos(args), args.guardar_configuracion)
+        logger.info(f"Configuración guardada en: {args.guardar_configuracion}")
+
+    logger.info(f"Archivo: {args.archivo}")
+    try:
+        if args.bloques:
+            estadisticas = procesar_por_bloques(
+                args.archivo, args.salida, args.cedula, args.telefonos,
+                columnas_fecha=args.fechas, order_items=args.comentarios,
+                columnas_cero=args.cero, tamano_bloque=args.bloques, formato=formato, hoja=args.hoja
+            )
+        else:
+            estadisticas = procesar_archivo(
+                args.archivo, args.salida, args.cedula, args.telefonos,
+                columnas_fecha=args.fechas, order_items=args.comentarios, columnas_cero=args.cero,
+                consolidar=args.consolidar, formato=formato, hoja=args.hoja
+            )
+    except KeyError as e:
+        logger.error(e.args[0])
+        return ERROR_ARGUMENTOS
+    except Exception as e:
+        logger.error(f"Error durante la limpieza: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return ERROR_PROCESO
+
+    resumen = {"archivo": args.archivo, "salida": args.salida, **estadisticas}
+    if args.estadisticas:
+        with open(args.estadisticas, "w", encoding="utf-8") as f:
+            json.dump(resumen, f, ensure_ascii=False, indent=2)
+    print(json.dumps(resumen, ensure_ascii=False))
+
+    return EXITO
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Caché en disco de las columnas leídas de archivos Excel
+
+Cada columna leída de un Excel (ya como texto y sin espacios sobrantes, o
+como datetime64 si solo tiene fechas) se guarda como archivo Feather sin comprimir, en una carpeta por archivo
+identificada por su ruta, tamaño y fecha de modificación. Las siguientes
+lecturas abren la columna con memory map en lugar de volver a interpretar el
+XML del Excel. Si el archivo cambia, su clave cambia y la caché anterior
+termina descartándose por antigüedad.
+
+Requiere pyarrow; si no está instalado la caché simplemente no se usa.
+
+Para vaciarla desde la línea de comandos:
+    python -m cleaning.cache
+"""
+import hashlib
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Carpeta de la caché (se puede cambiar con la variable de entorno LIMPIEZA_CACHE)
+DIRECTORIO_CACHE = os.environ.get(
+    "LIMPIEZA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "limpieza_telefonos")
+)
+
+# Versión del formato guardado; al cambiarla las claves anteriores dejan de usarse
+VERSION_CACHE = 2
+
+# Tamaño máximo de la caché; al superarlo se borran los archivos usados hace más tiempo
+TAMANO_MAXIMO_CACHE = 2 * 1024 ** 3
+
+def cache_disponible():
+    """Indica si pyarrow está instalado y la caché se puede usar"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def clave_archivo(ruta, hoja=None):
+    """Genera la clave de caché de un archivo a partir de su ruta, tamaño y fecha de modificación
+
+    Si se indica una hoja, la clave también la incluye (cada hoja se guarda aparte).
+    """
+    info = os.stat(ruta)
+    texto = f"{os.path.abspath(ruta)}|{info.st_size}|{info.st_mtime_ns}|{VERSION_CACHE}"
+    if hoja is not None:
+        texto += f"|{hoja}"
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+def _ruta_columna(clave, posicion, directorio):
+    return os.path.join(directorio, clave, f"{posicion}.feather")
+
+def leer_columna(clave, posicion, directorio=None):
+    """Lee de la caché la columna en la posición indicada; retorna None si no está guardada"""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    directorio = directorio or DIRECTORIO_CACHE
+    ruta = _ruta_columna(clave, posicion, directorio)
+    if not os.path.exists(ruta):
+        return None
+
+    try:
+        columna = feather.read_table(ruta, memory_map=True).column(0)
+        if pa.types.is_timestamp(columna.type):
+            serie = columna.to_pandas()
+        else:
+            valores = columna.to_numpy(zero_copy_only=False).astype(object)
+            # Las celdas vacías se guardan como nulos de Arrow y se leen como NaN
+            valores[pd.isna(valores)] = np.nan
+            serie = pd.Series(valores, dtype=object)
+    except Exception as e:
+        logger.warning(f"⚠ No se pudo leer la caché {ruta}: {str(e)}")
+        return None
+
+    # Marcar la carpeta como usada recientemente
+    os.utime(os.path.join(directorio, clave))
+    return serie
+
+def guardar_columna(clave, posicion, serie, directorio=None, tamano_maximo=TAMANO_MAXIMO_CACHE):
+    """Guarda una columna en la caché y descarta lo más antiguo si se supera el tamaño máximo"""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    directorio = directorio or DIRECTORIO_CACHE
+    ruta = _ruta_columna(clave, posicion, directorio)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+    try:
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            arreglo = pa.array(serie, from_pandas=True)
+        else:
+            arreglo = pa.array(serie.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+        # Escribir en un archivo temporal y renombrar, para no dejar archivos a medias
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        feather.write_feather(pa.table({"valor": arreglo}), temporal, compression="uncompressed")
+        os.replace(temporal, ruta)
+    except Exception as e:
+        logger.warning(f"⚠ No se pudo guardar la caché {ruta}: {str(e)}")
+        return
+
+    aplicar_limite(directorio, tamano_maximo, conservar=clave)
+
+def _tamano_carpeta(carpeta):
+    total = 0
+    for nombre in os.listdir(carpeta):
+        try:
+            total += os.path.getsize(os.path.join(carpeta, nombre))
+        except OSError:
+            pass
+    return total
+
+def tamano_cache(directorio=None):
+    """Retorna el tamaño total de la caché en bytes"""
+    directorio = directorio or DIRECTORIO_CACHE
+    if not os.path.isdir(directorio):
+        return 0
+    return sum(_tamano_carpeta(entrada.path) for entrada in os.scandir(directorio) if entrada.is_dir())
+
+def aplicar_limite(directorio=None, tamano_maximo=TAMANO_MAXIMO_CACHE, conservar=None):
+    """Borra los archivos en caché usados hace más tiempo hasta quedar bajo tamano_maximo"""
+    directorio = directorio or DIRECTORIO_CACHE
+    if not os.path.isdir(directorio):
+        return
+
+    carpetas = [entrada for entrada in os.scandir(directorio) if entrada.is_dir()]
+    tamanos = {carpeta.path: _tamano_carpeta(carpeta.path) for carpeta in carpetas}
+    total = sum(tamanos.values())
+
+    # La fecha de modificación de cada carpeta indica su último uso
+    for carpeta in sorted(carpetas, key=lambda c: c.stat().st_mtime):
+        if total <= tamano_maximo:
+            break
+        if carpeta.name == conservar:
+            continue
+        shutil.rmtree(carpeta.path, ignore_errors=True)
+        total -= tamanos[carpeta.path]
+        logger.info(f"Caché descartada por antigüedad: {carpeta.name}")
+
+def purgar_cache(directorio=None):
+    """Borra toda la caché; retorna la cantidad de bytes liberados"""
+    directorio = directorio or DIRECTORIO_CACHE
+    liberados = tamano_cache(directorio)
+    if os.path.isdir(directorio):
+        shutil.rmtree(directorio, ignore_errors=True)
+    return liberados
+
+if __name__ == "__main__":
+    liberados = purgar_cache()
+    print(f"Caché vaciada ({DIRECTORIO_CACHE}): {liberados / 1024 ** 2:.1f} MB liberados")
@@ -0,0 +1,446 @@
+"""Lectura de archivos de entrada sin dependencias de interfaz gráfica
+
+Se aceptan archivos Excel, CSV/TSV (también comprimidos con gzip) y Parquet.
+El formato se toma de la extensión; en los CSV el separador y la
+codificación se detectan leyendo solo el inicio del archivo.
+"""
+import csv
+import gzip
+import io
+import logging
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cleaning.cache import cache_disponible, clave_archivo, guardar_columna, leer_columna
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Cantidad de filas por bloque al leer archivos grandes
+TAMANO_BLOQUE = 50000
+
+# Textos que pandas interpreta como vacíos al leer con dtype=str
+VALORES_NULOS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+# Códigos de error de Excel (pandas los lee como vacíos)
+ERRORES_EXCEL = frozenset(['#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'])
+
+# Extensiones de los archivos de entrada; las que no son de texto delimitado ni
+# de Parquet se leen como Excel
+EXTENSIONES_EXCEL = (".xlsx", ".xlsm")
+EXTENSIONES_CSV = (".csv", ".tsv", ".tab", ".txt", ".csv.gz", ".tsv.gz", ".txt.gz")
+EXTENSIONES_PARQUET = (".parquet", ".pq")
+
+# Bytes del inicio de un CSV que se leen para detectar el separador y la codificación
+TAMANO_MUESTRA_CSV = 64 * 1024
+
+# Separadores y codificaciones que se prueban, en orden de preferencia
+SEPARADORES_CSV = ",;\t|"
+CODIFICACIONES_CSV = ("utf-8", "cp1252", "latin-1")
+
+def formato_entrada(ruta):
+    """Retorna el formato de un archivo de entrada según su extensión: excel, csv o parquet"""
+    nombre = os.path.basename(ruta).lower()
+    if nombre.endswith(EXTENSIONES_CSV):
+        return "csv"
+    if nombre.endswith(EXTENSIONES_PARQUET):
+        return "parquet"
+    return "excel"
+
+def leer_base(ruta, hoja=None):
+    """Lee un archivo completo con todas las columnas como texto y sin espacios sobrantes
+
+    Es un único bloque de iterar_bloques, así que las columnas con solo
+    fechas quedan como datetime64, igual que en BaseDatos. En los Excel se
+    lee la hoja indicada (por defecto, la primera).
+    """
+    df = next(iterar_bloques(ruta, None, hoja=hoja), None)
+    if df is None:
+        # Archivo sin filas
+        return pd.DataFrame(columns=leer_encabezados(ruta, hoja), dtype=object)
+    return df
+
+def convertir_celda(valor):
+    """Convierte el valor de una celda de openpyxl al texto que produce pd.read_excel(dtype=str)
+
+    Las celdas con formato de fecha se conservan como datetime para que
+    _crear_bloque pueda dejar tipadas las columnas de fechas.
+    """
+    if valor is None:
+        return np.nan
+    if isinstance(valor, str):
+        return np.nan if valor in VALORES_NULOS or valor in ERRORES_EXCEL else valor
+    if isinstance(valor, bool):
+        return str(valor)
+    if isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, (int, float)):
+        # Los números enteros guardados como decimales se leen sin ".0"
+        entero = int(valor)
+        return str(entero) if entero == valor else str(float(valor))
+    return str(valor)
+
+def nombres_columnas(encabezado):
+    """Genera los nombres de columnas igual que pandas (Unnamed: n, nombres repetidos con .1)"""
+    nombres = []
+    usados = {}
+    for i, valor in enumerate(encabezado):
+        if valor is None or valor == "":
+            nombre = f"Unnamed: {i}"
+        elif isinstance(valor, float) and valor == int(valor):
+            nombre = int(valor)
+        else:
+            nombre = valor
+        if nombre in usados:
+            usados[nombre] += 1
+            nombre_nuevo = f"{nombre}.{usados[nombre]}"
+            while nombre_nuevo in usados:
+                usados[nombre] += 1
+                nombre_nuevo = f"{nombre}.{usados[nombre]}"
+            usados[nombre_nuevo] = 0
+            nombre = nombre_nuevo
+        else:
+            usados[nombre] = 0
+        nombres.append(nombre)
+    return nombres
+
+def _verificar_columnas(columnas, nombres):
+    """Lanza KeyError si alguna de las columnas pedidas no está en el archivo"""
+    faltantes = [col for col in columnas if col not in nombres]
+    if faltantes:
+        raise KeyError(f"Columnas no encontradas en el archivo: {', '.join(map(str, faltantes))}")
+
+def detectar_formato_csv(ruta):
+    """Detecta el separador, la codificación y los encabezados de un CSV
+
+    Solo se lee el inicio del archivo (TAMANO_MUESTRA_CSV bytes). La
+    codificación es la primera de CODIFICACIONES_CSV con la que la muestra se
+    puede leer; el separador se detecta con csv.Sniffer entre los de
+    SEPARADORES_CSV o, si no lo logra, es el que más aparece en el
+    encabezado. Retorna (separador, codificación, nombres de columnas).
+    """
+    abrir = gzip.open if ruta.lower().endswith(".gz") else open
+    with abrir(ruta, "rb") as archivo:
+        muestra = archivo.read(TAMANO_MUESTRA_CSV)
+
+    # Descartar la última línea si quedó cortada (podría cortar un carácter)
+    if len(muestra) == TAMANO_MUESTRA_CSV and b"\n" in muestra:
+        muestra = muestra[:muestra.rfind(b"\n") + 1]
+
+    for codificacion in CODIFICACIONES_CSV:
+        try:
+            texto = muestra.decode(codificacion)
+            break
+        except UnicodeDecodeError:
+            continue
+    texto = texto.lstrip("\ufeff")
+
+    lineas = [linea for linea in texto.splitlines() if linea.strip()]
+    if ruta.lower().endswith((".tsv", ".tab", ".tsv.gz")):
+        separador = "\t"
+    else:
+        try:
+            separador = csv.Sniffer().sniff("\n".join(lineas[:50]), delimiters=SEPARADORES_CSV).delimiter
+        except csv.Error:
+            separador = max(SEPARADORES_CSV, key=lineas[0].count) if lineas else ","
+
+    encabezado = next(csv.reader(io.StringIO(texto), delimiter=separador), [])
+    nombres = [str(nombre) for nombre in nombres_columnas(encabezado)]
+    return separador, codificacion, nombres
+
+def hojas_excel(ruta):
+    """Retorna los nombres de las hojas de un archivo Excel, sin cargar los datos"""
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True)
+    try:
+        return list(libro.sheetnames)
+    finally:
+        libro.close()
+
+def _hoja_libro(libro, hoja):
+    """Hoja indicada de un libro de openpyxl (la primera si hoja es None)"""
+    if hoja is None:
+        return libro.worksheets[0]
+    if hoja not in libro.sheetnames:
+        raise KeyError(f"Hoja no encontrada en el archivo: {hoja}")
+    return libro[hoja]
+
+def leer_encabezados(ruta, hoja=None):
+    """Lee solo la fila de encabezados de un archivo, sin cargar los datos
+
+    En los Excel se lee la hoja indicada (por defecto, la primera).
+    """
+    formato = formato_entrada(ruta)
+    if formato == "csv":
+        return detectar_formato_csv(ruta)[2]
+    if formato == "parquet":
+        from pyarrow import parquet
+        return list(parquet.read_schema(ruta).names)
+
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_libro = _hoja_libro(libro, hoja)
+        encabezado = next(hoja_libro.iter_rows(max_row=1, values_only=True), ())
+        # Las celdas vacías al final del encabezado no son columnas
+        encabezado = list(encabezado)
+        while encabezado and (encabezado[-1] is None or encabezado[-1] == ""):
+            encabezado.pop()
+        return nombres_columnas(encabezado)
+    finally:
+        libro.close()
+
+def _bloque_desde_arrow(tabla, inicio):
+    """Convierte una tabla de pyarrow en un bloque de texto sin espacios sobrantes
+
+    Las columnas de fecha quedan como datetime64 (igual que las fechas de
+    Excel); las demás se convierten a texto. Los espacios se quitan dentro
+    de pyarrow, antes de pasar a pandas.
+    """
+    import pyarrow as pa
+    from pyarrow import compute
+
+    columnas = {}
+    for nombre, columna in zip(tabla.column_names, tabla.columns):
+        if pa.types.is_timestamp(columna.type) or pa.types.is_date(columna.type):
+            if pa.types.is_date(columna.type):
+                columna = columna.cast(pa.timestamp("ms"))
+            columnas[nombre] = columna.to_pandas()
+            continue
+        if not (pa.types.is_string(columna.type) or pa.types.is_large_string(columna.type)):
+            columna = columna.cast(pa.string())
+        columnas[nombre] = compute.utf8_trim_whitespace(columna).to_pandas()
+
+    df = pd.DataFrame(columnas, columns=tabla.column_names)
+    df.index = pd.RangeIndex(inicio, inicio + len(df))
+    return df
+
+def _reagrupar_lotes(lotes, esquema, tamano_bloque):
+    """Reagrupa lotes de pyarrow de cualquier tamaño en bloques de tamano_bloque filas
+
+    El esquema indicado solo se usa si no hay ningún lote; si no, se toma el
+    de los lotes.
+    """
+    import pyarrow as pa
+
+    pendientes = []
+    filas = 0
+    inicio = 0
+    for lote in lotes:
+        esquema = lote.schema
+        pendientes.append(lote)
+        filas += lote.num_rows
+        while tamano_bloque and filas >= tamano_bloque:
+            tabla = pa.Table.from_batches(pendientes, esquema)
+            yield _bloque_desde_arrow(tabla.slice(0, tamano_bloque), inicio)
+            resto = tabla.slice(tamano_bloque)
+            pendientes = resto.to_batches()
+            filas = resto.num_rows
+            inicio += tamano_bloque
+
+    if filas or inicio == 0:
+        yield _bloque_desde_arrow(pa.Table.from_batches(pendientes, esquema), inicio)
+
+def _iterar_bloques_csv(ruta, tamano_bloque, columnas):
+    """Lee un CSV por bloques con el lector multihilo de pyarrow (o con pandas si no está)"""
+    separador, codificacion, nombres = detectar_formato_csv(ruta)
+    if columnas is not None:
+        _verificar_columnas(columnas, nombres)
+
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as csv_arrow
+    except ImportError:
+        lector = pd.read_csv(ruta, sep=separador, encoding="utf-8-sig" if codificacion == "utf-8" else codificacion,
+                             dtype=str, header=0, names=nombres, usecols=columnas, chunksize=tamano_bloque)
+        for bloque in ([lector] if tamano_bloque is None else lector):
+            for col in bloque.columns:
+                bloque[col] = bloque[col].str.strip()
+            yield bloque
+        return
+
+    # Todas las columnas como texto; los textos vacíos o "NA", "NULL"... quedan vacíos (como en pandas)
+    opciones_lectura = csv_arrow.ReadOptions(use_threads=True, column_names=nombres, skip_rows=1,
+                                             encoding="utf8" if codificacion == "utf-8" else codificacion)
+    opciones_formato = csv_arrow.ParseOptions(delimiter=separador)
+    opciones_conversion = csv_arrow.ConvertOptions(
+        column_types={nombre: pa.string() for nombre in nombres}, include_columns=columnas,
+        null_values=sorted(VALORES_NULOS), strings_can_be_null=True
+    )
+
+    if tamano_bloque is None:
+        tabla = csv_arrow.read_csv(ruta, opciones_lectura, opciones_formato, opciones_conversion)
+        yield _bloque_desde_arrow(tabla, 0)
+        return
+
+    lector = csv_arrow.open_csv(ruta, opciones_lectura, opciones_formato, opciones_conversion)
+    yield from _reagrupar_lotes(lector, lector.schema, tamano_bloque)
+
+def _iterar_bloques_parquet(ruta, tamano_bloque, columnas):
+    """Lee un archivo Parquet por bloques de filas (requiere pyarrow)"""
+    from pyarrow import parquet
+
+    archivo = parquet.ParquetFile(ruta)
+    if columnas is not None:
+        _verificar_columnas(columnas, archivo.schema_arrow.names)
+
+    if tamano_bloque is None:
+        yield _bloque_desde_arrow(archivo.read(columns=columnas, use_threads=True), 0)
+        return
+
+    lotes = archivo.iter_batches(batch_size=tamano_bloque, columns=columnas, use_threads=True)
+    yield from _reagrupar_lotes(lotes, archivo.schema_arrow, tamano_bloque)
+
+def iterar_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, columnas=None, hoja=None):
+    """Lee un archivo por bloques de filas sin cargarlo completo en memoria
+
+    Produce DataFrames de hasta tamano_bloque filas (None para un único
+    bloque), con todas las columnas como texto sin espacios sobrantes,
+    salvo las columnas con solo fechas, que quedan como datetime64. Si se
+    indican columnas, solo se convierten y retornan esas columnas. Los Excel
+    se leen con openpyxl en modo read_only (de la hoja indicada o de la
+    primera); los CSV y Parquet, con pyarrow.
+    """
+    formato = formato_entrada(ruta)
+    if formato == "csv":
+        yield from _iterar_bloques_csv(ruta, tamano_bloque, columnas)
+        return
+    if formato == "parquet":
+        yield from _iterar_bloques_parquet(ruta, tamano_bloque, columnas)
+        return
+
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_libro = _hoja_libro(libro, hoja)
+        hoja_libro.reset_dimensions()
+        filas = hoja_libro.iter_rows(values_only=True)
+
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        encabezado = list(encabezado)
+        while encabezado and (encabezado[-1] is None or encabezado[-1] == ""):
+            encabezado.pop()
+        nombres = nombres_columnas(encabezado)
+
+        if columnas is None:
+            posiciones = list(range(len(nombres)))
+        else:
+            _verificar_columnas(columnas, nombres)
+            posiciones = [nombres.index(col) for col in columnas]
+        seleccion = [nombres[posicion] for posicion in posiciones]
+        fila_vacia = [np.nan] * len(posiciones)
+
+        bloque = []
+        vacias_pendientes = 0
+        inicio = 0
+        for fila in filas:
+            # Las filas vacías al final del archivo se descartan (igual que pandas)
+            if all(valor is None or valor == "" for valor in fila):
+                vacias_pendientes += 1
+                continue
+            bloque.extend([fila_vacia] * vacias_pendientes)
+            vacias_pendientes = 0
+
+            ancho = len(fila)
+            bloque.append([convertir_celda(fila[posicion]) if posicion < ancho else np.nan
+                           for posicion in posiciones])
+
+            if tamano_bloque and len(bloque) >= tamano_bloque:
+                yield _crear_bloque(bloque, seleccion, inicio)
+                inicio += len(bloque)
+                bloque = []
+
+        if bloque or inicio == 0:
+            yield _crear_bloque(bloque, seleccion, inicio)
+    finally:
+        libro.close()
+
+def _crear_bloque(filas, columnas, inicio):
+    """Crea el DataFrame de un bloque y limpia los espacios sobrantes
+
+    Una columna cuyas celdas con valor son todas fechas se convierte a
+    datetime64 sin pasar por texto. Si mezcla fechas con otros valores, las
+    fechas se convierten al mismo texto que produce pd.read_excel(dtype=str).
+    """
+    df = pd.DataFrame(filas, columns=columnas, dtype=object,
+                      index=pd.RangeIndex(inicio, inicio + len(filas)))
+    for col in df.columns:
+        tipo = pd.api.types.infer_dtype(df[col], skipna=True)
+        if tipo == "datetime":
+            df[col] = pd.to_datetime(df[col])
+            continue
+        if tipo.startswith("mixed"):
+            df[col] = pd.Series([str(valor) if isinstance(valor, datetime) else valor for valor in df[col]],
+                                index=df.index, dtype=object)
+        df[col] = df[col].str.strip()
+    return df
+
+class BaseDatos:
+    """Base de datos (Excel, CSV o Parquet) que lee cada columna del archivo solo cuando se necesita
+
+    Al crearla se leen únicamente los encabezados. Las columnas pedidas con
+    cargar() se leen una sola vez y quedan guardadas para los siguientes usos.
+    Si usar_cache es verdadero (y pyarrow está instalado), cada columna leída
+    de un Excel se guarda también en la caché en disco (ver cleaning.cache),
+    de modo que al volver a abrir el mismo archivo no se interpreta de nuevo
+    el Excel. Los CSV y Parquet se leen lo bastante rápido para no usarla.
+    En los Excel se usa la hoja indicada (por defecto, la primera).
+
+    cargar() y completa() se pueden llamar desde varios hilos (la interfaz y
+    el hilo de trabajo): un candado evita que una misma columna se lea dos
+    veces o que dos hilos escriban a la vez el mismo archivo de la caché.
+    """
+
+    def __init__(self, ruta, usar_cache=True, hoja=None):
+        self.ruta = ruta
+        self.hoja = hoja
+        self.columnas = leer_encabezados(ruta, hoja)
+        self.cargadas = {}
+        self.candado = threading.Lock()
+        usar_cache = usar_cache and formato_entrada(ruta) == "excel" and cache_disponible()
+        self.clave_cache = clave_archivo(ruta, hoja) if usar_cache else None
+
+    def cargar(self, columnas):
+        """Retorna un DataFrame con las columnas pedidas, leyendo del archivo solo las que faltan"""
+        with self.candado:
+            return self._cargar(columnas)
+
+    def _cargar(self, columnas):
+        faltantes = [col for col in dict.fromkeys(columnas) if col not in self.cargadas]
+
+        if faltantes and self.clave_cache is not None:
+            desde_cache = 0
+            for col in list(faltantes):
+                serie = leer_columna(self.clave_cache, self.columnas.index(col))
+                if serie is not None:
+                    self.cargadas[col] = serie.rename(col)
+                    faltantes.remove(col)
+                    desde_cache += 1
+            if desde_cache:
+                logger.info(f"Columnas leídas desde la caché: {desde_cache}")
+
+        if faltantes:
+            logger.info(f"Leyendo {len(faltantes)} columna(s) del archivo...")
+            df = next(iterar_bloques(self.ruta, None, faltantes, self.hoja))
+            for col in faltantes:
+                self.cargadas[col] = df[col]
+                if self.clave_cache is not None:
+                    guardar_columna(self.clave_cache, self.columnas.index(col), df[col])
+
+        return pd.DataFrame({col: self.cargadas[col] for col in columnas})
+
+    def completa(self):
+        """Retorna todas las columnas de la base"""
+        with self.candado:
+            return self._cargar(self.columnas)
@@ -0,0 +1,111 @@
+"""Normalización de cédulas dominicanas a claves enteras sin dependencias de interfaz gráfica
+
+Una cédula tiene 11 dígitos (001-1234567-8): el último es un dígito
+verificador calculado con el algoritmo de Luhn sobre los 10 anteriores. Las
+cédulas llegan con guiones, sin ellos o como número sin los ceros iniciales;
+todas esas formas se convierten a la misma clave int64, que ocupa menos
+memoria y se compara más rápido que el texto.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Cantidad de dígitos de una cédula y clave de las que no son válidas
+DIGITOS_CEDULA = 11
+CLAVE_INVALIDA = -1
+
+# Potencias de 10 para separar los dígitos de una clave (el primero a la izquierda)
+POTENCIAS = 10 ** np.arange(DIGITOS_CEDULA - 1, -1, -1, dtype=np.int64)
+
+# Pesos de Luhn para los 10 primeros dígitos
+PESOS_LUHN = np.array([1, 2] * 5, dtype=np.int64)
+
+# Forma de una cédula escrita con separadores: solo dígitos, guiones y espacios
+PATRON_CEDULA = r'[\s\-]*[0-9][0-9\s\-]*'
+
+def digitos_cedula(cedulas):
+    """Retorna los dígitos de cada cédula (sin guiones ni espacios) y la máscara de nulos
+
+    Los números con decimales en cero (00112345678.0) se toman sin ellos.
+    Solo se quitan los separadores de los valores con forma de cédula: los
+    que tienen letras u otros caracteres (PB1234567, RD40212345678) no son
+    cédulas y quedan como "", igual que las vacías.
+    """
+    serie = pd.Series(cedulas).reset_index(drop=True)
+    nulos = serie.isna().to_numpy(dtype=bool)
+    digitos = np.full(len(serie), "", dtype=object)
+    if (~nulos).any():
+        textos = serie[~nulos].astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+        parecen_cedula = textos.str.fullmatch(PATRON_CEDULA).to_numpy(dtype=bool)
+        solo_digitos = textos.str.replace(r'[^0-9]', '', regex=True).to_numpy(dtype=object)
+        digitos[~nulos] = np.where(parecen_cedula, solo_digitos, "")
+    return digitos, nulos
+
+def digito_verificador_valido(claves):
+    """Indica, para cada clave de 11 dígitos, si su último dígito es el verificador de Luhn"""
+    digitos = claves[:, None] // POTENCIAS % 10
+    productos = digitos[:, :-1] * PESOS_LUHN
+    suma = (productos - 9 * (productos > 9)).sum(axis=1)
+    return (10 - suma % 10) % 10 == digitos[:, -1]
+
+def claves_cedula(cedulas):
+    """Convierte cédulas a claves int64 normalizadas
+
+    Se quitan los guiones y espacios y se completan con ceros a la izquierda
+    hasta 11 dígitos. Las cédulas vacías, con letras, con más de 11 dígitos o
+    con dígito verificador incorrecto reciben CLAVE_INVALIDA. Retorna las
+    claves y, para comparar las inválidas como texto, los dígitos
+    completados (o el texto original sin espacios en los extremos si no
+    tiene forma de cédula; NaN si es nula).
+    """
+    digitos, nulos = digitos_cedula(cedulas)
+    longitudes = np.fromiter(map(len, digitos), dtype=np.int64, count=len(digitos))
+    completas = (longitudes > 0) & (longitudes <= DIGITOS_CEDULA)
+
+    normalizadas = digitos.copy()
+    if completas.any():
+        normalizadas[completas] = pd.Series(digitos[completas], dtype=object).str.zfill(DIGITOS_CEDULA).to_numpy()
+
+    claves = np.full(len(digitos), CLAVE_INVALIDA, dtype=np.int64)
+    claves[completas] = normalizadas[completas].astype(np.int64)
+    validas = completas.copy()
+    validas[completas] = digito_verificador_valido(claves[completas])
+    claves[~validas] = CLAVE_INVALIDA
+
+    # Texto con el que se comparan las cédulas inválidas
+    textos = normalizadas
+    sin_digitos = (longitudes == 0) & ~nulos
+    if sin_digitos.any():
+        originales = pd.Series(cedulas).reset_index(drop=True)[sin_digitos]
+        textos[sin_digitos] = originales.astype(str).str.strip().to_numpy(dtype=object)
+    textos[nulos] = np.nan
+    return claves, textos
+
+def codigos_cedula(cedulas, vacias_separadas=False):
+    """Agrupa cédulas iguales bajo un mismo código entero (0, 1, 2...)
+
+    Las claves válidas reciben los primeros códigos y los textos inválidos
+    los siguientes. Las cédulas vacías forman un solo grupo, como en
+    pd.merge, salvo con vacias_separadas, donde cada una recibe su propio
+    código al final. Retorna los códigos, las claves únicas, los textos
+    únicos y la cantidad de cédulas inválidas.
+    """
+    claves, textos = claves_cedula(cedulas)
+    validas = claves >= 0
+    invalidas = np.flatnonzero(~validas)
+    if vacias_separadas:
+        textos_invalidos = pd.Series(textos[invalidas], dtype=object)
+        vacias = (textos_invalidos.isna() | (textos_invalidos == "")).to_numpy(dtype=bool)
+        invalidas, vacias = invalidas[~vacias], invalidas[vacias]
+
+    codigos = np.empty(len(claves), dtype=np.int64)
+    codigos_claves, claves_unicas = pd.factorize(claves[validas])
+    codigos_textos, textos_unicos = pd.factorize(textos[invalidas], use_na_sentinel=False)
+    codigos[validas] = codigos_claves
+    codigos[invalidas] = len(claves_unicas) + codigos_textos
+    if vacias_separadas:
+        codigos[vacias] = len(claves_unicas) + len(textos_unicos) + np.arange(len(vacias))
+    return codigos, claves_unicas, textos_unicos, int((~validas).sum())
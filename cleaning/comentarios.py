@@ -0,0 +1,229 @@
+"""Construcción de la columna COMENTARIOS sin dependencias de interfaz gráfica"""
+import logging
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cleaning.progreso import notificar
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Texto que muestra la lista de orden cuando un texto personalizado está vacío
+TEXTO_VACIO = "[Texto vacío]"
+
+def interpretar_item(item):
+    """Interpreta un elemento de la lista de orden de concatenación
+
+    Retorna (None, texto_personalizado) para los textos de los apartados
+    "Otros" o (nombre_columna, tipo) para las columnas, donde tipo puede ser
+    "normal", "RD$", "US$" o "reemplazos".
+    """
+    # Manejar texto personalizado de apartados "Otros"
+    if "(texto)" in item:
+        # Extraer el texto personalizado entre comillas
+        match = re.search(r'"([^"]*)"', item)
+        texto_personalizado = match.group(1) if match else ""
+        return None, texto_personalizado
+
+    # Extraer nombre de columna y tipo de procesamiento
+    if " (" in item:
+        col_name, tipo = item.split(" (", 1)
+        tipo = tipo.rstrip(")")
+    else:
+        col_name = item
+        tipo = "normal"
+
+    return col_name, tipo
+
+def compilar_plan(order_items, columnas):
+    """Interpreta una sola vez la lista de orden de concatenación
+
+    Retorna los pasos (nombre_columna, tipo) o (None, texto) que aportan algo
+    al comentario: se omiten los textos vacíos y las columnas que no existen.
+    """
+    plan = []
+    for col_name, tipo in map(interpretar_item, order_items):
+        if col_name is None:
+            # Texto personalizado: "tipo" contiene el texto
+            if tipo and tipo != TEXTO_VACIO:
+                plan.append((None, tipo))
+        elif col_name in columnas:
+            plan.append((col_name, tipo))
+    return plan
+
+def reglas_independientes(reglas):
+    """Indica si las reglas dan el mismo resultado aplicadas en una sola pasada que en orden
+
+    Es así cuando ninguna regla puede encadenar con otra: ningún texto
+    (original o nuevo) de una regla contiene al original de otra, está
+    contenido en él o se solapa con su inicio o su final. Además cada
+    original debe empezar y terminar con letra o número, para que
+    reemplazarlo no cambie los límites de palabra vecinos, y los textos
+    nuevos no deben tener barras invertidas, que re.sub interpreta.
+    """
+    originales = [original for original, _ in reglas]
+    if not all(re.fullmatch(r'\w(?:.*\w)?', original, re.DOTALL) for original in originales):
+        return False
+    if any("\\" in nuevo for _, nuevo in reglas):
+        return False
+
+    # Prefijos y sufijos de cada original, con las reglas a las que pertenecen
+    prefijos, sufijos = defaultdict(set), defaultdict(set)
+    for j, original in enumerate(originales):
+        for k in range(1, len(original)):
+            prefijos[original[:k]].add(j)
+            sufijos[original[k:]].add(j)
+    regla_de = {original: j for j, original in enumerate(originales)}
+    longitudes = sorted({len(original) for original in originales})
+
+    # Todos los originales en un solo texto, para buscar un texto dentro de ellos
+    unidos = "\0".join(originales)
+    inicios = np.cumsum([0] + [len(original) + 1 for original in originales[:-1]])
+
+    def encadena(texto, i):
+        if not texto:
+            return len(reglas) > 1
+        # Una coincidencia de otro original solo puede empezar o terminar en un límite de palabra
+        inicios_palabra = [m.start() for m in re.finditer(r'\b\w', texto)]
+        finales_palabra = [m.end() for m in re.finditer(r'\w\b', texto)]
+        for inicio in inicios_palabra:
+            if any(regla_de.get(texto[inicio:inicio + largo], i) != i for largo in longitudes):
+                return True
+            if inicio > 0 and prefijos.get(texto[inicio:], set()) - {i}:
+                return True
+        if any(sufijos.get(texto[:fin], set()) - {i} for fin in finales_palabra if fin < len(texto)):
+            return True
+
+        posicion = unidos.find(texto)
+        while posicion != -1:
+            j = int(np.searchsorted(inicios, posicion, side="right")) - 1
+            if j != i and posicion + len(texto) <= inicios[j] + len(originales[j]):
+                return True
+            posicion = unidos.find(texto, posicion + 1)
+        return False
+
+    return not any(encadena(original, i) or encadena(nuevo, i) for i, (original, nuevo) in enumerate(reglas))
+
+@lru_cache(maxsize=32)
+def compilar_reemplazos(reglas):
+    """Compila una sola vez las reglas de reemplazo de una columna
+
+    reglas es una tupla de pares (original, nuevo). Si las reglas son
+    independientes (ver reglas_independientes) se compilan en una sola
+    expresión regular con todos los originales y un diccionario original ->
+    nuevo, y cada texto se recorre una sola vez. Si alguna regla encadena
+    con otra (TARJETA -> TC y después TC -> TARJETA DE CREDITO) el
+    resultado depende del orden, y se compila una expresión por regla para
+    aplicarlas una tras otra. Se guarda en caché para no recompilar en cada
+    bloque.
+    """
+    if reglas_independientes(reglas):
+        alternativas = "|".join(re.escape(original) for original, _ in reglas)
+        return re.compile(r'\b(?:' + alternativas + r')\b'), dict(reglas), ()
+
+    secuenciales = tuple((original, re.compile(r'\b' + re.escape(original) + r'\b'), nuevo)
+                         for original, nuevo in reglas)
+    return None, None, secuenciales
+
+def aplicar_reemplazos(texto, reglas):
+    """Reemplaza palabras completas de un texto con reglas ya compiladas
+
+    Con reglas independientes se hace una sola pasada de la expresión
+    combinada. Si no, las reglas se aplican en orden, cada una sobre el
+    resultado de la anterior, y la expresión de una regla solo se evalúa si
+    su texto original aparece en el texto.
+    """
+    patron, nuevos, secuenciales = reglas
+    if patron is not None:
+        return patron.sub(lambda coincidencia: nuevos[coincidencia.group()], texto)
+
+    for original, patron, nuevo in secuenciales:
+        if original in texto:
+            texto = patron.sub(nuevo, texto)
+    return texto
+
+def _textos_columna(serie):
+    """Retorna str(valor) de cada valor no nulo de la columna y la máscara de nulos"""
+    nulos = serie.isna().to_numpy(dtype=bool)
+    textos = serie.to_numpy(dtype=object)[~nulos]
+    if pd.api.types.infer_dtype(textos, skipna=False) != "string":
+        textos = np.array([str(valor) for valor in textos], dtype=object)
+    return textos, nulos
+
+def valores_frecuentes(serie, ordenar=True):
+    """Cuenta los valores distintos no vacíos de una columna, del más al menos frecuente
+
+    Los valores se cuentan como el texto con el que aparecen en el
+    comentario (str(valor)). Retorna una Series de conteos indexada por ese
+    texto; sin ordenar, los valores quedan en orden de primera aparición.
+    """
+    textos, _ = _textos_columna(serie)
+    conteos = pd.Series(textos, dtype=object).value_counts(sort=ordenar)
+    return conteos[np.asarray(conteos.index.str.strip() != "", dtype=bool)]
+
+def piezas_columna(serie, col_name, tipo, reemplazos_columnas, columnas_cero):
+    """Calcula la parte del comentario que aporta una columna en cada fila
+
+    Cada valor distinto se procesa una sola vez: prefijo RD$/US$, reemplazos
+    y regla de 0 por 1 (límite diferido). Los valores vacíos aportan "".
+    Retorna un arreglo de textos con una posición por fila.
+    """
+    textos, nulos = _textos_columna(serie)
+    codigos, piezas = pd.factorize(textos)
+    piezas = np.asarray(piezas, dtype=object)
+
+    if tipo == "RD$":
+        piezas = "RD$" + piezas
+    elif tipo == "US$":
+        piezas = "US$" + piezas
+    elif tipo == "reemplazos" and col_name in reemplazos_columnas:
+        reglas = compilar_reemplazos(tuple(reemplazos_columnas[col_name].items()))
+        piezas = np.array([aplicar_reemplazos(pieza, reglas) for pieza in piezas], dtype=object)
+
+    # Caso especial: reemplazar "0" o "RD$0" por "1" o "RD$1" en límite diferido
+    if col_name in columnas_cero:
+        if tipo == "RD$":
+            piezas[piezas == "RD$0"] = "RD$1"
+        piezas[piezas == "0"] = "1"
+
+    # Los nulos usan el código -1, que apunta al "" agregado al final
+    codigos_filas = np.full(len(serie), -1, dtype=np.int64)
+    codigos_filas[~nulos] = codigos
+    return np.append(piezas, "")[codigos_filas]
+
+def generar_comentarios(df, order_items, reemplazos_columnas=None, columnas_cero=(), progreso=None):
+    """Genera el comentario de cada fila según el orden de concatenación
+
+    columnas_cero contiene las columnas a las que se aplica la regla de
+    reemplazar 0 por 1 (límite de crédito diferido). El comentario se arma
+    columna por columna sobre todas las filas a la vez, uniendo con un
+    espacio las partes no vacías. Se llama a progreso (ver cleaning.progreso)
+    después de cada columna. Retorna una Series con el mismo índice que df.
+    """
+    reemplazos_columnas = reemplazos_columnas or {}
+    plan = compilar_plan(order_items, set(df.columns))
+    total_filas = len(df)
+
+    comentarios = np.full(total_filas, "", dtype=object)
+    con_texto = np.zeros(total_filas, dtype=bool)
+
+    for numero, (col_name, tipo) in enumerate(plan, 1):
+        if col_name is None:
+            piezas = np.full(total_filas, tipo, dtype=object)
+        else:
+            piezas = piezas_columna(df[col_name], col_name, tipo, reemplazos_columnas, columnas_cero)
+
+        # Concatenar partes con un espacio, omitiendo las vacías
+        no_vacias = piezas != ""
+        separar = no_vacias & con_texto
+        comentarios[separar] = comentarios[separar] + " "
+        comentarios[no_vacias] = comentarios[no_vacias] + piezas[no_vacias]
+        con_texto |= no_vacias
+
+        notificar(progreso, total_filas * numero // len(plan), total_filas)
+
+    notificar(progreso, total_filas, total_filas)
+    return pd.Series(comentarios, index=df.index, dtype=object)
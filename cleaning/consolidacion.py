@@ -0,0 +1,109 @@
+"""Consolidación de teléfonos por cédula sin dependencias de interfaz gráfica
+
+Una misma persona puede aparecer en varias filas (una por producto), cada
+una con sus propias columnas de teléfono. La consolidación deja una sola
+fila por cédula con todos sus teléfonos, sin repetir, compactados a la
+izquierda. Todo el agrupamiento se hace con arreglos de numpy, sin recorrer
+las filas en Python.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from cleaning.cedulas import codigos_cedula
+from cleaning.telefonos import mascara_valores_validos
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Nombre de las columnas que se agregan cuando una cédula tiene más
+# teléfonos que columnas seleccionadas
+PREFIJO_COLUMNA_EXTRA = "TELEFONO_EXTRA_"
+
+def _columnas_extra(cantidad, existentes):
+    """Nombres libres para las columnas de teléfono adicionales"""
+    nombres = []
+    numero = 1
+    while len(nombres) < cantidad:
+        nombre = f"{PREFIJO_COLUMNA_EXTRA}{numero}"
+        if nombre not in existentes:
+            nombres.append(nombre)
+        numero += 1
+    return nombres
+
+def consolidar_telefonos(df, cedula_col, tel_cols):
+    """Deja una fila por cédula con todos los teléfonos de sus filas
+
+    Las cédulas se agrupan por su clave normalizada (ver cleaning.cedulas),
+    así que 001-1234567-8 y 00112345678 son la misma persona; las filas con
+    la cédula vacía no se agrupan. Los teléfonos de cada cédula se toman en
+    orden de fila y de columna, sin repetir. Si alguna tiene más teléfonos
+    que columnas se agregan columnas TELEFONO_EXTRA_N. Las demás columnas se
+    toman de la primera fila de cada cédula. Pensada para aplicarse sobre el
+    resultado de procesar_telefonos; retorna el DataFrame consolidado y sus
+    estadísticas.
+    """
+    codigos, _, _, _ = codigos_cedula(df[cedula_col], vacias_separadas=True)
+
+    # Grupos numerados en orden de primera aparición
+    grupos, unicos = pd.factorize(codigos)
+    total_grupos = len(unicos)
+    _, primeras_filas = np.unique(grupos, return_index=True)
+
+    # Teléfonos apilados fila por fila, con el grupo de su fila
+    valores = df[tel_cols].to_numpy(dtype=object)
+    validos = mascara_valores_validos(valores).ravel()
+    telefonos = pd.Series(valores.ravel()[validos], dtype=object).astype(str).str.strip()
+    grupo_telefono = np.repeat(grupos, len(tel_cols))[validos]
+
+    # Quitar los teléfonos repetidos dentro de cada grupo (gana el primero):
+    # cada par (grupo, teléfono) se reduce a un solo entero
+    codigos_telefono, telefonos_unicos = pd.factorize(telefonos)
+    pares = grupo_telefono * max(len(telefonos_unicos), 1) + codigos_telefono
+    unicos_grupo = ~pd.Series(pares).duplicated().to_numpy(dtype=bool)
+    repetidos = int((~unicos_grupo).sum())
+    grupo_telefono = grupo_telefono[unicos_grupo]
+    telefonos = telefonos.to_numpy(dtype=object)[unicos_grupo]
+
+    # Posición de cada teléfono dentro de su grupo: orden estable por grupo
+    orden = np.argsort(grupo_telefono, kind="stable")
+    cantidad = np.bincount(grupo_telefono, minlength=total_grupos)
+    inicio = np.concatenate([[0], np.cumsum(cantidad)[:-1]]).astype(np.int64)
+    posicion = np.empty(len(orden), dtype=np.int64)
+    posicion[orden] = np.arange(len(orden)) - inicio[grupo_telefono[orden]]
+
+    ancho = max(len(tel_cols), int(cantidad.max()) if total_grupos else 0)
+    matriz = np.full((total_grupos, ancho), np.nan, dtype=object)
+    matriz[grupo_telefono, posicion] = telefonos
+
+    extra = _columnas_extra(ancho - len(tel_cols), set(df.columns))
+    columnas = {}
+    for col in df.columns:
+        if col in tel_cols:
+            columnas[col] = matriz[:, tel_cols.index(col)]
+        else:
+            columnas[col] = df[col].array.take(primeras_filas)
+    for i, col in enumerate(extra, len(tel_cols)):
+        columnas[col] = matriz[:, i]
+    df_consolidado = pd.DataFrame(columnas, copy=False)
+
+    filas_por_grupo = np.bincount(grupos, minlength=total_grupos)
+    estadisticas = {
+        "registros_antes_consolidar": len(df),
+        "cedulas_consolidadas": int((filas_por_grupo > 1).sum()),
+        "filas_unidas": int(len(df) - total_grupos),
+        "telefonos_repetidos_por_cedula": repetidos,
+        "columnas_extra": extra,
+    }
+
+    logger.info("\n🔍 CONSOLIDACIÓN POR CÉDULA")
+    logger.info("-"*30)
+    logger.info(f"✓ Registros antes: {len(df)}")
+    logger.info(f"✓ Registros después: {total_grupos}")
+    logger.info(f"✓ Cédulas con varias filas: {estadisticas['cedulas_consolidadas']}")
+    logger.info(f"✓ Teléfonos repetidos de una misma cédula: {repetidos}")
+    if extra:
+        logger.info(f"✓ Columnas agregadas para teléfonos adicionales: {', '.join(extra)}")
+    logger.info("-"*50)
+
+    return df_consolidado, estadisticas
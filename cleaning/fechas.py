@@ -0,0 +1,483 @@
+"""Formateo de fechas al formato dd/mm/yyyy sin dependencias de interfaz gráfica"""
+import csv
+import logging
+import os
+import re
+import unicodedata
+from datetime import date
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from cleaning.memoria import CacheResultados
+from cleaning.progreso import FILAS_POR_BLOQUE, notificar
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Patrón compilado para eliminar todo lo que no sea dígito
+PATRON_NO_DIGITOS = re.compile(r'\D')
+
+# Tabla de fechas especiales (CSV con columnas valor,fecha); se puede indicar
+# otro archivo con la variable de entorno LIMPIEZA_FECHAS_ESPECIALES
+RUTA_FECHAS_ESPECIALES = os.environ.get(
+    "LIMPIEZA_FECHAS_ESPECIALES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fechas_especiales.csv")
+)
+PATRON_FECHA_FORMATEADA = re.compile(r'\d{2}/\d{2}/\d{4}')
+
+# Tabla vigente (solo lectura) y firma del archivo del que se leyó
+FECHAS_ESPECIALES = MappingProxyType({})
+_firma_especiales = None
+
+def cargar_fechas_especiales(ruta=None):
+    """Lee una tabla de fechas especiales y la retorna como diccionario de solo lectura
+
+    Las líneas que comienzan con # se ignoran. Las filas cuya fecha no
+    tiene el formato dd/mm/yyyy se descartan con una advertencia.
+    """
+    ruta = ruta or RUTA_FECHAS_ESPECIALES
+    tabla = {}
+    with open(ruta, encoding="utf-8", newline="") as f:
+        lineas = (linea for linea in f if not linea.lstrip().startswith("#"))
+        for numero, fila in enumerate(csv.DictReader(lineas), 1):
+            valor = (fila.get("valor") or "").strip()
+            fecha = (fila.get("fecha") or "").strip()
+            if not valor or not PATRON_FECHA_FORMATEADA.fullmatch(fecha):
+                logger.warning(f"⚠ Fila {numero} ignorada en {ruta}: {fila}")
+                continue
+            tabla[valor] = fecha
+    return MappingProxyType(tabla)
+
+def recargar_fechas_especiales():
+    """Vuelve a leer la tabla de fechas especiales y descarta los resultados en caché"""
+    global FECHAS_ESPECIALES, _firma_especiales
+
+    try:
+        info = os.stat(RUTA_FECHAS_ESPECIALES)
+        _firma_especiales = (info.st_mtime_ns, info.st_size)
+        FECHAS_ESPECIALES = cargar_fechas_especiales()
+        logger.info(f"Tabla de fechas especiales cargada: {len(FECHAS_ESPECIALES)} casos")
+    except OSError as e:
+        _firma_especiales = None
+        FECHAS_ESPECIALES = MappingProxyType({})
+        logger.warning(f"⚠ No se pudo leer la tabla de fechas especiales: {str(e)}")
+
+    CACHE_FECHAS.limpiar()
+    return FECHAS_ESPECIALES
+
+def fechas_especiales():
+    """Retorna la tabla de fechas especiales, recargándola si el archivo cambió"""
+    try:
+        info = os.stat(RUTA_FECHAS_ESPECIALES)
+        firma = (info.st_mtime_ns, info.st_size)
+    except OSError:
+        firma = None
+
+    if firma != _firma_especiales:
+        recargar_fechas_especiales()
+    return FECHAS_ESPECIALES
+
+# Resultados de interpretar_fechas por texto, compartidos entre columnas de la sesión
+CACHE_FECHAS = CacheResultados()
+
+# Cargar la tabla de fechas especiales al importar el módulo
+fechas_especiales()
+
+# Textos precalculados para formatear día, mes y año sin f-strings por fila
+ANIO_MINIMO, ANIO_MAXIMO = 1900, 2030
+DOS_DIGITOS = np.array([f"{i:02d}" for i in range(100)], dtype=object)
+ANIOS = np.array([str(anio) for anio in range(ANIO_MINIMO, ANIO_MAXIMO + 1)], dtype=object)
+
+# Fechas seriales de Excel: días desde 30/12/1899. Solo se aceptan números de
+# 5 dígitos (desde 1927); los más cortos suelen ser años u otros códigos
+ORIGEN_EXCEL = "1899-12-30"
+PATRON_SERIAL_EXCEL = r'[1-9][0-9]{4}(\.[0-9]*)?'
+
+# Texto de una fecha de Excel leída como texto (str de un datetime)
+PATRON_FECHA_HORA = r'[0-9]{4}-[0-9]{2}-[0-9]{2}[ T][0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]+)?'
+
+def _entre(valores, minimo, maximo):
+    return (valores >= minimo) & (valores <= maximo)
+
+def _siglo(anio_corto):
+    """Determina el siglo: 19xx para años >= 30, 20xx para < 30"""
+    return np.where(anio_corto >= 30, 1900 + anio_corto, 2000 + anio_corto)
+
+def _a_enteros(textos):
+    """Convierte textos de dígitos ASCII a un arreglo int64"""
+    return textos.astype(np.int64).to_numpy()
+
+def _serie_texto(textos):
+    """Crea una Series de texto; con pyarrow las operaciones .str se ejecutan en C++"""
+    try:
+        return pd.Series(textos, dtype="string[pyarrow]").reset_index(drop=True)
+    except ImportError:
+        return pd.Series(textos, dtype=object).reset_index(drop=True)
+
+def _digitos_ascii(texto):
+    """Reemplaza los dígitos Unicode (árabes, de ancho completo...) por dígitos ASCII"""
+    return "".join(str(unicodedata.decimal(c)) if c.isdecimal() else c for c in texto)
+
+def _fecha_valida(dia, mes, anio):
+    return _entre(dia, 1, 31) & _entre(mes, 1, 12) & _entre(anio, ANIO_MINIMO, ANIO_MAXIMO)
+
+def _formatear_componentes(dia, mes, anio):
+    """Arma los textos dd/mm/yyyy de arreglos de día, mes y año ya validados"""
+    return DOS_DIGITOS[dia] + "/" + DOS_DIGITOS[mes] + "/" + ANIOS[anio - ANIO_MINIMO]
+
+def _componentes(fechas):
+    """Arreglos de día, mes y año de un DatetimeIndex sin NaT"""
+    return fechas.day.to_numpy(np.int64), fechas.month.to_numpy(np.int64), fechas.year.to_numpy(np.int64)
+
+def _desde_serial(seriales):
+    """Convierte fechas seriales de Excel (días desde ORIGEN_EXCEL) a arreglos de día, mes y año"""
+    return _componentes(pd.to_datetime(np.floor(seriales), unit="D", origin=ORIGEN_EXCEL))
+
+def _es_fecha_nativa(valor):
+    return isinstance(valor, (date, np.datetime64))
+
+def formatear_fechas_nativas(fechas):
+    """Formatea fechas ya tipadas (datetime, Timestamp, datetime64) sin interpretar texto
+
+    Retorna un arreglo con el texto dd/mm/yyyy de cada fecha, o None si es
+    nula o su año está fuera del rango aceptado.
+    """
+    fechas = pd.DatetimeIndex(fechas)
+    resultado = np.full(len(fechas), None, dtype=object)
+    posiciones = np.flatnonzero(~fechas.isna())
+    d, m, a = _componentes(fechas[posiciones])
+    ok = _entre(a, ANIO_MINIMO, ANIO_MAXIMO)
+    resultado[posiciones[ok]] = _formatear_componentes(d[ok], m[ok], a[ok])
+    return resultado
+
+class _Textos:
+    """Textos a interpretar y los arreglos que comparten las reglas, calculados una vez"""
+
+    def __init__(self, textos):
+        self.textos = textos
+        self.limpias = textos.str.replace(PATRON_NO_DIGITOS.pattern, '', regex=True)
+        self.longitudes = self.limpias.str.len().to_numpy(dtype=np.int64)
+
+        # Valor entero de los textos con 5 a 8 dígitos
+        self.numericas = _entre(self.longitudes, 5, 8)
+        self.valores = np.zeros(len(textos), dtype=np.int64)
+        self.valores[self.numericas] = _a_enteros(self.limpias[self.numericas])
+
+    def digitos(self, pendientes, longitud):
+        """Posiciones pendientes con la cantidad de dígitos indicada y sus valores"""
+        posiciones = np.flatnonzero(pendientes & (self.longitudes == longitud))
+        return posiciones, self.valores[posiciones]
+
+# Cada regla recibe los textos y la máscara de filas aún sin interpretar, y
+# retorna las posiciones que reconoce con sus arreglos de día, mes y año
+
+def _regla_ddmmyyyy(datos, pendientes):
+    posiciones, valores = datos.digitos(pendientes, 8)
+    d, m, a = valores // 1000000, valores // 10000 % 100, valores % 10000
+    ok = _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _regla_yyyymmdd(datos, pendientes):
+    posiciones, valores = datos.digitos(pendientes, 8)
+    a, m, d = valores // 10000, valores // 100 % 100, valores % 100
+    ok = _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _regla_dmmyyyy(datos, pendientes):
+    posiciones, valores = datos.digitos(pendientes, 7)
+    d, m, a = valores // 1000000, valores // 10000 % 100, valores % 10000
+    ok = _entre(d, 1, 9) & _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _regla_ddmmyy(datos, pendientes):
+    posiciones, valores = datos.digitos(pendientes, 6)
+    d, m, a = valores // 10000, valores // 100 % 100, _siglo(valores % 100)
+    ok = _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _regla_dmmyy(datos, pendientes):
+    posiciones, valores = datos.digitos(pendientes, 5)
+    d, m, a = valores // 10000, valores // 100 % 100, _siglo(valores % 100)
+    ok = _entre(d, 1, 9) & _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _partes_separadas(texto):
+    """Interpreta un texto con separadores cuyas partes no son solo dígitos
+
+    int() acepta espacios, signos y guiones bajos en cada parte, así que
+    estos casos poco comunes se interpretan uno a uno. Retorna (dia, mes,
+    anio) o None si la fecha no es válida.
+    """
+    partes = texto.replace('-', '/').replace('.', '/').split('/')
+    try:
+        if len(partes[0]) == 4 and partes[0].isdigit():
+            anio, mes, dia = int(partes[0]), int(partes[1]), int(partes[2])
+        else:
+            dia, mes, anio = int(partes[0]), int(partes[1]), int(partes[2])
+            if anio < 100:
+                anio = 1900 + anio if anio >= 30 else 2000 + anio
+    except ValueError:
+        return None
+
+    if 1 <= dia <= 31 and 1 <= mes <= 12 and ANIO_MINIMO <= anio <= ANIO_MAXIMO:
+        return dia, mes, anio
+    return None
+
+def _regla_separadores(datos, pendientes):
+    """Fechas dd/mm/yyyy, d-m-yy, yyyy.mm.dd... si la cantidad de dígitos no es de 5 a 8"""
+    candidatas = pendientes & ~datos.numericas
+    candidatas[candidatas] = datos.textos[candidatas].str.contains(r'[/.\-]', regex=True).to_numpy(dtype=bool)
+    normalizadas = datos.textos[candidatas].str.replace('-', '/', regex=False).str.replace('.', '/', regex=False)
+    tres_partes = (normalizadas.str.count('/') == 2).to_numpy(dtype=bool)
+    posiciones = np.flatnonzero(candidatas)[tres_partes]
+    vacio = np.zeros(0, dtype=np.int64)
+    if len(posiciones) == 0:
+        return vacio, vacio, vacio, vacio
+
+    partes = normalizadas[tres_partes].str.split('/', n=2, expand=True)
+    simples = np.ones(len(posiciones), dtype=bool)
+    for col in range(3):
+        simples &= partes[col].str.fullmatch(r'[0-9]{1,9}').to_numpy(dtype=bool)
+    partes = partes[simples]
+
+    primera = _a_enteros(partes[0])
+    segunda = _a_enteros(partes[1])
+    tercera = _a_enteros(partes[2])
+    anio_primero = (partes[0].str.len() == 4).to_numpy(dtype=bool)
+
+    d = np.where(anio_primero, tercera, primera)
+    m = segunda
+    a = np.where(anio_primero, primera, tercera)
+    a = np.where(~anio_primero & (a < 100), _siglo(a), a)
+    ok = _fecha_valida(d, m, a)
+    posiciones_ok, d, m, a = [posiciones[simples][ok]], [d[ok]], [m[ok]], [a[ok]]
+
+    # Partes con espacios, signos u otros caracteres
+    for posicion in posiciones[~simples]:
+        fecha = _partes_separadas(datos.textos.iloc[posicion])
+        if fecha is not None:
+            posiciones_ok.append([posicion])
+            d.append([fecha[0]])
+            m.append([fecha[1]])
+            a.append([fecha[2]])
+
+    return tuple(np.concatenate(arreglos).astype(np.int64) for arreglos in (posiciones_ok, d, m, a))
+
+def _regla_fecha_hora(datos, pendientes):
+    """Fechas con hora como 1999-07-19 00:00:00 (texto de una celda de fecha de Excel)"""
+    candidatas = pendientes & (datos.longitudes >= 14)
+    candidatas[candidatas] = datos.textos[candidatas].str.fullmatch(PATRON_FECHA_HORA).to_numpy(dtype=bool)
+    posiciones = np.flatnonzero(candidatas)
+    valores = datos.textos[candidatas]
+    a = _a_enteros(valores.str.slice(0, 4))
+    m = _a_enteros(valores.str.slice(5, 7))
+    d = _a_enteros(valores.str.slice(8, 10))
+    ok = _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+def _regla_serial_excel(datos, pendientes):
+    """Números de Excel como 36360 o 36360.5 (días desde ORIGEN_EXCEL)"""
+    candidatas = pendientes.copy()
+    candidatas[candidatas] = datos.textos[candidatas].str.fullmatch(PATRON_SERIAL_EXCEL).to_numpy(dtype=bool)
+    posiciones = np.flatnonzero(candidatas)
+    d, m, a = _desde_serial(datos.textos[candidatas].astype(float).to_numpy())
+    ok = _fecha_valida(d, m, a)
+    return posiciones[ok], d[ok], m[ok], a[ok]
+
+# Reglas en orden de prioridad: cada una se aplica, de forma vectorizada, solo
+# a las filas que las reglas anteriores no reconocieron
+REGLAS_FECHAS = (
+    ("DDMMYYYY", _regla_ddmmyyyy),
+    ("YYYYMMDD", _regla_yyyymmdd),
+    ("DMMYYYY", _regla_dmmyyyy),
+    ("DDMMYY", _regla_ddmmyy),
+    ("DMMYY", _regla_dmmyy),
+    ("separadores", _regla_separadores),
+    ("fecha y hora", _regla_fecha_hora),
+    ("serial de Excel", _regla_serial_excel),
+)
+
+def interpretar_fechas(textos):
+    """Interpreta textos de fecha no vacíos y los devuelve como dd/mm/yyyy
+
+    Maneja múltiples formatos como:
+    - DDMMYYYY (18081973) y YYYYMMDD (19731123)
+    - DMMYYYY (9041991)
+    - DDMMYY (150167)
+    - DMMYY (10567)
+    - Fechas con separadores (dd/mm/yyyy, yyyy-mm-dd, dd.mm.yy)
+    - Fechas con hora (1999-07-19 00:00:00)
+    - Fechas seriales de Excel (36360)
+
+    Primero se buscan todos los textos en la tabla de fechas especiales con
+    un solo map; el resto pasa por REGLAS_FECHAS en orden, cada regla sobre
+    las filas que siguen sin interpretar. Retorna un arreglo con el
+    resultado de cada texto (None si no se reconoce).
+    """
+    textos = _serie_texto(textos)
+    total = len(textos)
+    resultado = np.full(total, None, dtype=object)
+    if total == 0:
+        return resultado
+
+    # Los textos de la tabla de fechas especiales no se interpretan
+    casos = textos.map(FECHAS_ESPECIALES).to_numpy(dtype=object)
+    especial = ~pd.isna(casos)
+    resultado[especial] = casos[especial]
+
+    # Los dígitos no ASCII (p. ej. árabes) se convierten antes de aplicar las reglas
+    no_ascii = np.flatnonzero(textos.str.contains(r'[^\x00-\x7f]', regex=True).to_numpy(dtype=bool))
+    if len(no_ascii):
+        textos = textos.copy()
+        textos.iloc[no_ascii] = [_digitos_ascii(texto) for texto in textos.iloc[no_ascii]]
+
+    datos = _Textos(textos)
+    pendientes = ~especial
+    dia = np.zeros(total, dtype=np.int64)
+    mes = np.zeros(total, dtype=np.int64)
+    anio = np.zeros(total, dtype=np.int64)
+
+    for _, regla in REGLAS_FECHAS:
+        if not pendientes.any():
+            break
+        posiciones, d, m, a = regla(datos, pendientes)
+        dia[posiciones], mes[posiciones], anio[posiciones] = d, m, a
+        pendientes[posiciones] = False
+
+    # Formatear todas las fechas reconocidas en una sola operación
+    validas = ~pendientes & ~especial
+    if validas.any():
+        resultado[validas] = _formatear_componentes(dia[validas], mes[validas], anio[validas])
+
+    return resultado
+
+def interpretar_fecha(fecha_str):
+    """Interpreta un solo texto de fecha no vacío con las reglas de interpretar_fechas
+
+    Retorna el texto dd/mm/yyyy o None si no se reconoce el formato.
+    """
+    return interpretar_fechas([fecha_str])[0]
+
+def _valores_crudos(valores):
+    """Prepara los valores no nulos de una columna para factorize
+
+    Las fechas nativas se conservan y el resto se pasa a texto, para que
+    valores como True y 1 no se confundan al agruparlos.
+    """
+    if pd.api.types.infer_dtype(valores, skipna=False) == "string":
+        return valores
+    return np.array([valor if _es_fecha_nativa(valor) else str(valor) for valor in valores], dtype=object)
+
+def _interpretar_unicos(unicos):
+    """Interpreta valores distintos y no nulos de una columna de fechas
+
+    Las fechas nativas se formatean directamente; el resto se interpreta
+    como texto sin espacios sobrantes (ver interpretar_fechas). Retorna los
+    resultados (None si no se reconocen) y el texto de cada valor ("" si
+    está vacío).
+    """
+    textos = np.array([str(valor).strip() for valor in unicos], dtype=object)
+    nativas = np.array([_es_fecha_nativa(valor) for valor in unicos], dtype=bool)
+    resultados = np.full(len(unicos), None, dtype=object)
+    if nativas.any():
+        resultados[nativas] = formatear_fechas_nativas(list(unicos[nativas]))
+
+    por_interpretar = ~nativas & (textos != "")
+    resultados[por_interpretar] = CACHE_FECHAS.resolver(textos[por_interpretar], interpretar_fechas)
+    return resultados, textos
+
+def _formatear_bloque(bloque):
+    """Formatea un bloque de una columna de fechas; retorna el bloque, procesadas y errores"""
+    nativa = pd.api.types.is_datetime64_any_dtype(bloque)
+    presentes = np.flatnonzero(bloque.notna().to_numpy())
+
+    # Cada valor distinto se interpreta una sola vez (ver cleaning.memoria); las
+    # columnas datetime64 se agrupan sin convertir cada fila a Timestamp
+    if nativa:
+        codigos, unicos = pd.factorize(bloque.to_numpy()[presentes])
+        unicos = pd.DatetimeIndex(unicos).astype(object).to_numpy()
+        valores = np.full(len(bloque), pd.NaT, dtype=object)
+    else:
+        valores = bloque.to_numpy(dtype=object, copy=True)
+        codigos, unicos = pd.factorize(_valores_crudos(valores[presentes]))
+
+    # El valor original se conserva tal cual si está vacío o no se puede interpretar
+    resultados_unicos, textos = _interpretar_unicos(unicos)
+    resultados = resultados_unicos[codigos]
+    reconocidas = ~pd.isna(resultados)
+    fallidas = ~reconocidas & (textos != "")[codigos]
+    valores[presentes[reconocidas]] = resultados[reconocidas]
+    if nativa:
+        valores[presentes[~reconocidas]] = unicos[codigos[~reconocidas]]
+
+    for fecha_str in textos[codigos[fallidas]]:
+        logger.error(f"No se pudo formatear la fecha: '{fecha_str}'")
+
+    formateadas = pd.Series(valores, index=bloque.index, name=bloque.name)
+    return formateadas, int(reconocidas.sum()), int(fallidas.sum())
+
+def formatear_columna_fechas(serie, progreso=None):
+    """Formatea una columna completa de fechas al formato dd/mm/yyyy
+
+    Los valores vacíos se conservan y los que no se pueden interpretar se
+    dejan con su valor original. Las fechas ya tipadas (datetime64 o
+    datetime) se formatean sin interpretar texto y los números seriales de
+    Excel se convierten de forma vectorizada. La columna se procesa por bloques (ver
+    interpretar_fechas) y se llama a progreso (ver cleaning.progreso) después
+    de cada uno. Retorna la columna formateada, la cantidad de fechas
+    formateadas y la cantidad de errores.
+    """
+    errores = 0
+    fechas_procesadas = 0
+    fechas_especiales()
+
+    total_filas = len(serie)
+    bloques = []
+    for inicio in range(0, total_filas, FILAS_POR_BLOQUE):
+        formateadas, procesadas, con_error = _formatear_bloque(serie.iloc[inicio:inicio + FILAS_POR_BLOQUE])
+        bloques.append(formateadas)
+        fechas_procesadas += procesadas
+        errores += con_error
+        notificar(progreso, min(inicio + FILAS_POR_BLOQUE, total_filas), total_filas)
+
+    formateadas = pd.concat(bloques) if bloques else serie.copy()
+    return formateadas, fechas_procesadas, errores
+
+def previsualizar_fechas(serie):
+    """Formatea una muestra de fechas para mostrarla en la previsualización
+
+    A diferencia de formatear_columna_fechas, los valores vacíos se muestran
+    como "" y los que no se pueden interpretar como "Error: <valor>". Retorna
+    la lista de textos, la cantidad de fechas formateadas y de errores.
+    """
+    fechas_especiales()
+    valores = serie.to_numpy(dtype=object)
+    presentes = ~pd.isna(valores)
+    crudos = _valores_crudos(valores[presentes])
+    unicos = pd.unique(crudos)
+    interpretadas = dict(zip(unicos, zip(*_interpretar_unicos(unicos))))
+    textos = iter(crudos)
+
+    fechas_nuevas = []
+    fechas_procesadas = 0
+    errores = 0
+
+    for presente in presentes:
+        if not presente:
+            fechas_nuevas.append("")
+            continue
+
+        resultado, fecha_str = interpretadas[next(textos)]
+        if not fecha_str:
+            fechas_nuevas.append("")
+            continue
+
+        if resultado is not None:
+            fechas_procesadas += 1
+            fechas_nuevas.append(resultado)
+        else:
+            errores += 1
+            fechas_nuevas.append(f"Error: {fecha_str}")
+
+    return fechas_nuevas, fechas_procesadas, errores
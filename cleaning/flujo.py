@@ -0,0 +1,122 @@
+"""Limpieza completa de un archivo: de la base de entrada al archivo de salida
+
+procesar_archivo carga la base en memoria; procesar_por_bloques es para
+bases demasiado grandes para cargarse completas: cada bloque de filas se
+lee, se limpia (teléfonos, fechas y comentarios) y se escribe en el archivo
+de salida antes de leer el siguiente, de modo que la memoria usada depende
+del tamaño del bloque y no del tamaño de la base.
+"""
+import logging
+
+from cleaning.carga import TAMANO_BLOQUE, BaseDatos, iterar_bloques, leer_encabezados
+from cleaning.comentarios import generar_comentarios
+from cleaning.consolidacion import consolidar_telefonos
+from cleaning.fechas import formatear_columna_fechas
+from cleaning.salida import abrir_escritor, guardar_base
+from cleaning.telefonos import limpiar_bloque_telefonos, procesar_telefonos
+
+logger = logging.getLogger('limpieza_telefonos')
+
+def acumular_estadisticas(totales, estadisticas):
+    """Suma las estadísticas de un bloque a las estadísticas acumuladas
+
+    Los valores que no son números (como la lista columnas_extra) no se suman.
+    """
+    for clave, valor in estadisticas.items():
+        if isinstance(valor, dict):
+            destino = totales.setdefault(clave, {})
+            for subclave, subvalor in valor.items():
+                destino[subclave] = destino.get(subclave, 0) + subvalor
+        elif isinstance(valor, (int, float)):
+            totales[clave] = totales.get(clave, 0) + valor
+    return totales
+
+def procesar_archivo(ruta, salida, cedula_col, tel_cols, columnas_fecha=(), order_items=None,
+                     reemplazos_columnas=None, columnas_cero=(), consolidar=False, formato=None, hoja=None,
+                     usar_cache=True):
+    """Limpia una base cargándola completa en memoria y guarda el resultado
+
+    Sin fechas ni comentarios solo se leen y se guardan la cédula y los
+    teléfonos; con ellos se guarda la base completa, como en
+    procesar_por_bloques. Con consolidar queda una fila por cédula (ver
+    cleaning.consolidacion). usar_cache se pasa a BaseDatos. Lanza KeyError
+    si faltan columnas. Retorna las estadísticas del proceso.
+    """
+    base = BaseDatos(ruta, usar_cache=usar_cache, hoja=hoja)
+    faltantes = [col for col in [cedula_col, *tel_cols, *columnas_fecha] if col not in base.columnas]
+    if faltantes:
+        raise KeyError(f"Columnas no encontradas en el archivo: {', '.join(map(str, faltantes))}")
+
+    completa = bool(columnas_fecha or order_items)
+    df = base.completa() if completa else base.cargar([cedula_col] + tel_cols)
+
+    df_limpio, estadisticas = procesar_telefonos(df, cedula_col, tel_cols)
+    if completa:
+        df[tel_cols] = df_limpio[tel_cols].to_numpy()
+        df_limpio = df
+
+    if consolidar:
+        df_limpio, consolidacion = consolidar_telefonos(df_limpio, cedula_col, tel_cols)
+        estadisticas.update(consolidacion)
+
+    for col in columnas_fecha:
+        df_limpio[col], procesadas, errores = formatear_columna_fechas(df_limpio[col])
+        estadisticas.setdefault("fechas_procesadas", {})[col] = procesadas
+        estadisticas.setdefault("fechas_con_error", {})[col] = errores
+
+    if order_items:
+        df_limpio["COMENTARIOS"] = generar_comentarios(
+            df_limpio, order_items, reemplazos_columnas, columnas_cero
+        )
+
+    logger.info("\nGuardando resultado...")
+    columnas_texto = [cedula_col, *tel_cols, *estadisticas.get("columnas_extra", [])]
+    guardar_base(df_limpio, salida, columnas_texto, formato)
+    logger.info(f"✅ Archivo guardado como: {salida}")
+    return estadisticas
+
+def procesar_por_bloques(ruta, salida, cedula_col, tel_cols, columnas_fecha=(),
+                         order_items=None, reemplazos_columnas=None, columnas_cero=(),
+                         tamano_bloque=TAMANO_BLOQUE, formato=None, hoja=None):
+    """Limpia una base (Excel, CSV o Parquet) por bloques y escribe el resultado de forma incremental
+
+    El formato de salida se toma de la extensión de salida, salvo que se
+    indique formato (ver cleaning.salida). En los Excel se lee la hoja
+    indicada (por defecto, la primera).
+
+    El archivo de salida contiene la base completa con los teléfonos limpios,
+    las columnas de columnas_fecha formateadas y, si se indican order_items,
+    la columna COMENTARIOS. Los duplicados se eliminan en toda la base: un
+    número ya visto en un bloque anterior se descarta en los siguientes.
+    Lanza KeyError si faltan columnas, sin crear el archivo de salida.
+    Retorna las estadísticas acumuladas.
+    """
+    # Verificar las columnas antes de crear el archivo de salida
+    encabezados = leer_encabezados(ruta, hoja)
+    faltantes = [col for col in [cedula_col, *tel_cols, *columnas_fecha] if col not in encabezados]
+    if faltantes:
+        raise KeyError(f"Columnas no encontradas en el archivo: {', '.join(map(str, faltantes))}")
+
+    vistos = set()
+    estadisticas = {}
+
+    with abrir_escritor(salida, [cedula_col, *tel_cols], formato) as escritor:
+        for numero, bloque in enumerate(iterar_bloques(ruta, tamano_bloque, hoja=hoja), 1):
+            bloque, estadisticas_bloque = limpiar_bloque_telefonos(bloque, tel_cols, vistos)
+
+            for col in columnas_fecha:
+                bloque[col], procesadas, errores = formatear_columna_fechas(bloque[col])
+                estadisticas_bloque.setdefault("fechas_procesadas", {})[col] = procesadas
+                estadisticas_bloque.setdefault("fechas_con_error", {})[col] = errores
+
+            if order_items:
+                bloque["COMENTARIOS"] = generar_comentarios(
+                    bloque, order_items, reemplazos_columnas, columnas_cero
+                )
+
+            escritor.escribir(bloque)
+            acumular_estadisticas(estadisticas, estadisticas_bloque)
+            logger.info(f"Bloque {numero}: {escritor.filas_escritas} filas escritas")
+
+    logger.info(f"✅ Archivo guardado como: {salida}")
+    return estadisticas
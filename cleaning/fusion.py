@@ -0,0 +1,138 @@
+"""Fusión de la base limpia con la base original sin dependencias de interfaz gráfica"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from cleaning.cedulas import claves_cedula, codigos_cedula
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Cantidad de cédulas repetidas que se muestran como ejemplo en el log
+EJEMPLOS_REPETIDAS = 5
+
+def quitar_columnas_telefono(df_origen, tel_cols):
+    """Retorna la base de origen sin las columnas de teléfono que se van a reemplazar"""
+    columnas_a_eliminar = [col for col in tel_cols if col in df_origen.columns]
+    return df_origen.drop(columns=columnas_a_eliminar)
+
+def _ocurrencias(codigos):
+    """Número de aparición (0, 1, 2...) de cada código entre los anteriores iguales"""
+    orden = np.argsort(codigos, kind="stable")
+    ordenados = codigos[orden]
+    inicio_grupo = np.r_[True, ordenados[1:] != ordenados[:-1]] if len(ordenados) else np.zeros(0, dtype=bool)
+    posiciones = np.arange(len(ordenados))
+    inicios = np.maximum.accumulate(np.where(inicio_grupo, posiciones, 0))
+    ocurrencias = np.empty(len(codigos), dtype=np.int64)
+    ocurrencias[orden] = posiciones - inicios
+    return ocurrencias
+
+class IndiceCedulas:
+    """Índice cédula -> posiciones de fila de una base, construido una sola vez
+
+    Las cédulas se comparan por su clave int64 normalizada (ver
+    cleaning.cedulas), así que 001-1234567-8, 00112345678 y 112345678 son
+    la misma. Las que no son válidas se comparan por sus dígitos como texto,
+    y las vacías se tratan como un valor más, igual que en pd.merge.
+
+    Las cédulas repetidas se detectan al construir el índice. Al buscar, la
+    k-ésima aparición de una cédula se empareja con la k-ésima aparición en
+    esta base (o con la primera, si aquí aparece menos veces), de modo que
+    la fusión nunca multiplica filas.
+    """
+
+    def __init__(self, cedulas):
+        codigos, claves_unicas, textos_unicos, self.invalidas = codigos_cedula(cedulas)
+        self.claves = pd.Index(claves_unicas)
+        self.textos = pd.Index(textos_unicos)
+
+        # Posiciones de cada cédula, agrupadas y en orden de aparición
+        self.orden = np.argsort(codigos, kind="stable")
+        self.cantidad = np.bincount(codigos, minlength=len(self.claves) + len(self.textos))
+        self.inicio = np.concatenate([[0], np.cumsum(self.cantidad)[:-1]]).astype(np.int64)
+
+        repetidas = np.flatnonzero(self.cantidad > 1)
+        self.repetidas = len(repetidas)
+        primeras = self.orden[self.inicio[repetidas[:EJEMPLOS_REPETIDAS]]]
+        self.ejemplos_repetidas = list(pd.Series(cedulas).iloc[primeras])
+
+    def codigos(self, cedulas):
+        """Código de cada cédula en este índice (-1 si no está)"""
+        claves, textos = claves_cedula(cedulas)
+        validas = claves >= 0
+        codigos = np.full(len(claves), -1, dtype=np.int64)
+        codigos[validas] = self.claves.get_indexer(claves[validas])
+        por_texto = self.textos.get_indexer(pd.Index(textos[~validas]))
+        codigos[~validas] = np.where(por_texto >= 0, len(self.claves) + por_texto, -1)
+        return codigos
+
+    def posiciones(self, cedulas):
+        """Posición en esta base de la fila que corresponde a cada cédula (-1 si no está)"""
+        codigos = self.codigos(cedulas)
+        encontradas = codigos >= 0
+        codigos_encontrados = codigos[encontradas]
+
+        posiciones = np.full(len(codigos), -1, dtype=np.int64)
+        if self.repetidas:
+            ocurrencia = _ocurrencias(codigos_encontrados)
+            ocurrencia[ocurrencia >= self.cantidad[codigos_encontrados]] = 0
+            posiciones[encontradas] = self.orden[self.inicio[codigos_encontrados] + ocurrencia]
+        else:
+            posiciones[encontradas] = self.orden[self.inicio[codigos_encontrados]]
+        return posiciones
+
+def fusionar_por_cedula(df_origen, df_limpio, cedula_col, tel_cols, indice=None):
+    """Reemplaza los teléfonos de la base de origen por los de la base limpia, por cédula
+
+    Equivale a un pd.merge(how='left') sobre la cédula, pero sin copias
+    intermedias de la base: las columnas de la base limpia se toman por
+    posición con un IndiceCedulas (se puede pasar uno ya construido para la
+    misma base limpia). El resultado tiene siempre las mismas filas que la
+    base de origen; si hay cédulas repetidas se registra una advertencia.
+    """
+    if indice is None:
+        indice = IndiceCedulas(df_limpio[cedula_col])
+
+    if indice.invalidas:
+        logger.warning(f"⚠ {indice.invalidas} cédulas no válidas en la base limpia; se comparan como texto")
+
+    if indice.repetidas:
+        ejemplos = ", ".join(map(str, indice.ejemplos_repetidas))
+        logger.warning(f"⚠ {indice.repetidas} cédulas repetidas en la base limpia (p. ej. {ejemplos}); "
+                       f"cada aparición se une con una sola fila")
+
+    posiciones = indice.posiciones(df_origen[cedula_col])
+    sin_coincidencia = int((posiciones < 0).sum())
+    if sin_coincidencia:
+        logger.info(f"{sin_coincidencia} filas sin cédula en la base limpia")
+
+    columnas_origen = [col for col in df_origen.columns if col not in tel_cols]
+    columnas_limpio = [col for col in df_limpio.columns if col != cedula_col]
+
+    # Mismos sufijos que pd.merge para las columnas que están en ambas bases
+    repetidas = set(columnas_origen) & set(columnas_limpio)
+    columnas = {}
+    for col in columnas_origen:
+        nombre = f"{col}_x" if col in repetidas else col
+        columnas[nombre] = df_origen[col].array
+    for col in columnas_limpio:
+        nombre = f"{col}_y" if col in repetidas else col
+        columnas[nombre] = df_limpio[col].array.take(posiciones, allow_fill=True)
+
+    return pd.DataFrame(columnas, copy=False)
+
+def anexar_columnas(df_origen, df_limpio, cedula_col, tel_cols, sufijo=None):
+    """Reemplaza los teléfonos de la base de origen por los de la base limpia, por posición
+
+    Si se indica un sufijo, la cédula de la base limpia se conserva con ese
+    sufijo; de lo contrario se descarta.
+    """
+    df_sin_telefonos = quitar_columnas_telefono(df_origen, tel_cols)
+
+    if sufijo is None:
+        df_anexo = df_limpio.drop(columns=[cedula_col])
+    else:
+        df_anexo = df_limpio.rename(columns={cedula_col: f"{cedula_col}{sufijo}"})
+
+    # Simplemente concatenar columnas
+    return pd.concat([df_sin_telefonos, df_anexo], axis=1)
@@ -0,0 +1,326 @@
+"""Procesamiento en lote de varios archivos (y hojas) con la misma configuración
+
+Ejemplo:
+    python -m cleaning base.xlsx --cedula CEDULA --telefonos TEL1 TEL2 --salida limpia.xlsx \
+        --guardar-configuracion regionales.json
+    python -m cleaning.lote regionales.json entrada/ "otras/*.csv" --salida limpios/ --todas-las-hojas
+
+Cada archivo (o cada hoja, con --todas-las-hojas) se procesa en un proceso
+independiente de un ProcessPoolExecutor, usando por defecto todos los
+núcleos. Al terminar cada uno se registra su avance, y al final se guarda
+un reporte JSON con el resultado de cada archivo y las estadísticas sumadas
+(por defecto resumen_lote.json en la carpeta de salida).
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cleaning.carga import EXTENSIONES_CSV, EXTENSIONES_EXCEL, EXTENSIONES_PARQUET, formato_entrada, hojas_excel
+from cleaning.flujo import acumular_estadisticas, procesar_archivo, procesar_por_bloques
+from cleaning.progreso import ProcesoCancelado, notificar
+from cleaning.salida import FORMATOS_SALIDA, formato_de_ruta
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Códigos de salida (los mismos de python -m cleaning)
+EXITO = 0
+ERROR_PROCESO = 1
+ERROR_ARGUMENTOS = 2
+
+# Opciones de una configuración guardada y sus valores por defecto
+CONFIGURACION_POR_DEFECTO = {
+    "cedula": None,
+    "telefonos": [],
+    "fechas": [],
+    "comentarios": [],
+    "cero": [],
+    "consolidar": False,
+    "bloques": None,
+    "formato": "xlsx",
+    "todas_las_hojas": False,
+}
+
+# Nombre del reporte que se guarda en la carpeta de salida
+REPORTE_LOTE = "resumen_lote.json"
+
+def configuracion_desde_argumentos(args):
+    """Arma una configuración a partir de los argumentos de python -m cleaning"""
+    configuracion = {clave: getattr(args, clave) for clave in CONFIGURACION_POR_DEFECTO if hasattr(args, clave)}
+    configuracion["formato"] = args.formato or formato_de_ruta(args.salida)
+    return {**CONFIGURACION_POR_DEFECTO, **configuracion}
+
+def guardar_configuracion(configuracion, ruta):
+    """Guarda una configuración en un archivo JSON"""
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(configuracion, f, ensure_ascii=False, indent=2)
+
+def cargar_configuracion(ruta):
+    """Lee y valida una configuración guardada; lanza ValueError si no es válida"""
+    with open(ruta, encoding="utf-8") as f:
+        leida = json.load(f)
+
+    desconocidas = [clave for clave in leida if clave not in CONFIGURACION_POR_DEFECTO]
+    if desconocidas:
+        raise ValueError(f"Opciones desconocidas en la configuración: {', '.join(desconocidas)}")
+
+    configuracion = {**CONFIGURACION_POR_DEFECTO, **leida}
+    if not configuracion["cedula"] or not configuracion["telefonos"]:
+        raise ValueError("La configuración debe indicar la columna de cédula y al menos una de teléfono")
+    if configuracion["formato"] not in FORMATOS_SALIDA:
+        raise ValueError(f"Formato de salida no reconocido: {configuracion['formato']}")
+    if configuracion["bloques"] is not None and configuracion["bloques"] <= 0:
+        raise ValueError("bloques debe ser un número positivo")
+    if configuracion["bloques"] and configuracion["consolidar"]:
+        raise ValueError("consolidar necesita la base completa y no se puede usar con bloques")
+    return configuracion
+
+def buscar_archivos(entradas):
+    """Retorna los archivos de entrada: los de cada carpeta y los que coinciden con cada patrón
+
+    En las carpetas solo se toman los archivos con extensión de Excel, CSV
+    o Parquet (sin recorrer subcarpetas). Se omiten los archivos temporales
+    de Excel (~$) y los repetidos.
+    """
+    extensiones = EXTENSIONES_EXCEL + EXTENSIONES_CSV + EXTENSIONES_PARQUET
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = [os.path.join(entrada, nombre) for nombre in os.listdir(entrada)
+                           if nombre.lower().endswith(extensiones)]
+        else:
+            encontrados = glob.glob(entrada, recursive=True)
+        archivos.extend(ruta for ruta in sorted(encontrados)
+                        if os.path.isfile(ruta) and not os.path.basename(ruta).startswith("~$"))
+    return list(dict.fromkeys(os.path.abspath(ruta) for ruta in archivos))
+
+def _nombre_base(ruta):
+    """Nombre del archivo sin la extensión (también sin .csv de un .csv.gz)"""
+    nombre = os.path.basename(ruta)
+    for extension in sorted(EXTENSIONES_EXCEL + EXTENSIONES_CSV + EXTENSIONES_PARQUET, key=len, reverse=True):
+        if nombre.lower().endswith(extension):
+            return nombre[:-len(extension)]
+    return os.path.splitext(nombre)[0]
+
+def crear_tareas(archivos, configuracion, carpeta_salida):
+    """Crea una tarea por archivo, o por hoja de cada Excel con todas_las_hojas
+
+    Las tareas se ordenan de mayor a menor tamaño de archivo, para que los
+    archivos grandes empiecen primero y los procesos terminen a la par. Un
+    archivo que no se puede abrir (dañado, bloqueado, borrado) no detiene el
+    lote: se registra como un resultado con error. Retorna las tareas y
+    esos resultados.
+    """
+    tareas = []
+    errores = []
+    tamanos = {}
+    usados = set()
+    for ruta in archivos:
+        try:
+            tamanos[ruta] = os.path.getsize(ruta)
+            hojas = [None]
+            if configuracion["todas_las_hojas"] and formato_entrada(ruta) == "excel":
+                hojas = hojas_excel(ruta)
+        except Exception as e:
+            tarea = {"archivo": ruta, "hoja": None, "salida": None}
+            logger.error(f"Error en {_describir(tarea)}: {str(e)}")
+            errores.append({**tarea, "estado": "error", "error": str(e) or type(e).__name__, "segundos": None})
+            continue
+
+        for hoja in hojas:
+            nombre = _nombre_base(ruta)
+            if hoja is not None:
+                nombre += "_" + re.sub(r'[^\w\-]+', '_', hoja)
+            # Archivos con el mismo nombre en carpetas distintas no se pisan
+            candidato, numero = nombre, 1
+            while candidato in usados:
+                numero += 1
+                candidato = f"{nombre}_{numero}"
+            usados.add(candidato)
+
+            salida = os.path.join(carpeta_salida, f"{candidato}_limpio.{configuracion['formato']}")
+            tareas.append({"archivo": ruta, "hoja": hoja, "salida": salida})
+
+    tareas.sort(key=lambda tarea: tamanos[tarea["archivo"]], reverse=True)
+    return tareas, errores
+
+def _describir(tarea):
+    """Nombre corto de una tarea para los logs"""
+    nombre = os.path.basename(tarea["archivo"])
+    return nombre if tarea["hoja"] is None else f"{nombre} [{tarea['hoja']}]"
+
+def _iniciar_proceso(nivel_log):
+    """Configura los logs de cada proceso del lote"""
+    logging.basicConfig(
+        level=nivel_log,
+        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        stream=sys.stderr
+    )
+    # Con fork el proceso hereda la configuración de logs del principal
+    logger.setLevel(nivel_log)
+
+def procesar_tarea(tarea, configuracion):
+    """Limpia un archivo (o una hoja) en un proceso del lote
+
+    Los errores no se propagan: se registran en el resultado para que un
+    archivo con problemas no detenga el resto del lote. No se usa la caché
+    en disco: cada hoja se lee una sola vez, y varios procesos escribiendo y
+    liberando espacio en la misma carpeta podrían borrarse archivos entre sí.
+    """
+    inicio = time.perf_counter()
+    resultado = dict(tarea)
+    opciones = dict(
+        columnas_fecha=configuracion["fechas"], order_items=configuracion["comentarios"],
+        columnas_cero=configuracion["cero"], formato=configuracion["formato"], hoja=tarea["hoja"]
+    )
+    try:
+        if configuracion["bloques"]:
+            estadisticas = procesar_por_bloques(
+                tarea["archivo"], tarea["salida"], configuracion["cedula"], configuracion["telefonos"],
+                tamano_bloque=configuracion["bloques"], **opciones
+            )
+        else:
+            estadisticas = procesar_archivo(
+                tarea["archivo"], tarea["salida"], configuracion["cedula"], configuracion["telefonos"],
+                consolidar=configuracion["consolidar"], usar_cache=False, **opciones
+            )
+        resultado.update(estado="ok", estadisticas=estadisticas)
+    except Exception as e:
+        mensaje = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+        logger.error(f"Error en {_describir(tarea)}: {mensaje}")
+        resultado.update(estado="error", error=mensaje or type(e).__name__)
+    resultado["segundos"] = round(time.perf_counter() - inicio, 2)
+    return resultado
+
+def resumir_lote(resultados, segundos):
+    """Arma el reporte del lote: resultado de cada archivo y estadísticas sumadas"""
+    resultados = sorted(resultados, key=lambda r: (r["archivo"], r["hoja"] or ""))
+    totales = {}
+    for resultado in resultados:
+        if resultado["estado"] == "ok":
+            acumular_estadisticas(totales, resultado["estadisticas"])
+    return {
+        "archivos": len(resultados),
+        "procesados": sum(resultado["estado"] == "ok" for resultado in resultados),
+        "con_error": sum(resultado["estado"] == "error" for resultado in resultados),
+        "segundos": round(segundos, 2),
+        "totales": totales,
+        "resultados": resultados,
+    }
+
+def procesar_lote(tareas, configuracion, procesos=None, progreso=None, nivel_log=logging.WARNING,
+                  errores=()):
+    """Reparte las tareas entre procesos y retorna el reporte del lote
+
+    procesos es la cantidad de procesos (por defecto, uno por núcleo). Se
+    llama a progreso(terminadas, total) cada vez que termina una tarea; si
+    lanza ProcesoCancelado, las tareas que no empezaron se cancelan. errores
+    son los resultados con error de crear_tareas, que se incluyen en el
+    reporte.
+    """
+    inicio = time.perf_counter()
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(tareas)))
+    logger.info(f"Procesando {len(tareas)} archivo(s) con {procesos} proceso(s)...")
+
+    resultados = list(errores)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                             initargs=(nivel_log,)) as ejecutor:
+        futuros = {ejecutor.submit(procesar_tarea, tarea, configuracion): tarea for tarea in tareas}
+        try:
+            for terminadas, futuro in enumerate(as_completed(futuros), 1):
+                tarea = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    # El proceso terminó de forma anormal (por ejemplo, sin memoria)
+                    resultado = {**tarea, "estado": "error", "error": str(e) or type(e).__name__, "segundos": None}
+                resultados.append(resultado)
+
+                if resultado["estado"] == "ok":
+                    registros = resultado["estadisticas"].get("total_registros", 0)
+                    logger.info(f"[{terminadas}/{len(tareas)}] ✓ {_describir(tarea)}: "
+                                f"{registros:,} registros en {resultado['segundos']} s")
+                else:
+                    logger.warning(f"[{terminadas}/{len(tareas)}] ⚠ {_describir(tarea)}: {resultado['error']}")
+                notificar(progreso, terminadas, len(tareas))
+        except ProcesoCancelado:
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+
+    return resumir_lote(resultados, time.perf_counter() - inicio)
+
+def crear_parser():
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m cleaning.lote",
+        description="Limpieza de varios archivos con una configuración guardada"
+    )
+    parser.add_argument("configuracion",
+                        help="JSON con la configuración (ver python -m cleaning --guardar-configuracion)")
+    parser.add_argument("entradas", nargs="+",
+                        help="Carpetas o patrones de archivos (p. ej. 'regionales/*.xlsx')")
+    parser.add_argument("--salida", required=True, help="Carpeta donde se guardan los archivos limpios")
+    parser.add_argument("--procesos", type=int, metavar="N",
+                        help="Cantidad de procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--todas-las-hojas", action="store_true",
+                        help="Procesar cada hoja de los Excel por separado")
+    parser.add_argument("--reporte",
+                        help=f"Archivo del reporte JSON (por defecto {REPORTE_LOTE} en la carpeta de salida)")
+    parser.add_argument("--nivel-log", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Nivel de detalle de los logs del lote (por defecto INFO; "
+                             "los procesos solo registran advertencias y errores)")
+    return parser
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos; retorna el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, args.nivel_log),
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        stream=sys.stderr
+    )
+
+    if args.procesos is not None and args.procesos <= 0:
+        logger.error("--procesos debe ser un número positivo")
+        return ERROR_ARGUMENTOS
+
+    try:
+        configuracion = cargar_configuracion(args.configuracion)
+    except (OSError, ValueError) as e:
+        logger.error(f"Configuración no válida: {str(e)}")
+        return ERROR_ARGUMENTOS
+    configuracion["todas_las_hojas"] = configuracion["todas_las_hojas"] or args.todas_las_hojas
+
+    archivos = buscar_archivos(args.entradas)
+    if not archivos:
+        logger.error("No se encontraron archivos para procesar")
+        return ERROR_ARGUMENTOS
+
+    os.makedirs(args.salida, exist_ok=True)
+    tareas, errores = crear_tareas(archivos, configuracion, args.salida)
+    nivel_procesos = max(getattr(logging, args.nivel_log), logging.WARNING)
+    reporte = procesar_lote(tareas, configuracion, args.procesos, nivel_log=nivel_procesos, errores=errores)
+
+    ruta_reporte = args.reporte or os.path.join(args.salida, REPORTE_LOTE)
+    with open(ruta_reporte, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"✅ {reporte['procesados']} de {reporte['archivos']} archivo(s) procesados "
+                f"en {reporte['segundos']} s; reporte: {ruta_reporte}")
+    print(json.dumps({clave: valor for clave, valor in reporte.items() if clave != "resultados"},
+                     ensure_ascii=False))
+
+    return EXITO if not reporte["con_error"] else ERROR_PROCESO
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Interpretación de cada valor distinto una sola vez
+
+Las columnas de fechas y teléfonos tienen muchos menos valores distintos que
+filas (p. ej. 20 mil fechas distintas en 2 millones de filas). En lugar de
+interpretar cada fila, cleaning.fechas y cleaning.telefonos factorizan la
+columna (pd.factorize), interpretan solo cada valor distinto y reparten el
+resultado a las filas con los códigos. CacheResultados guarda además los
+resultados entre columnas y ejecuciones de la misma sesión.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Cantidad máxima de valores guardados en cada caché de resultados
+TAMANO_CACHE = 200000
+
+class CacheResultados:
+    """Caché acotada de resultados por valor; al llenarse descarta los usados hace más tiempo"""
+
+    def __init__(self, tamano_maximo=TAMANO_CACHE):
+        self.tamano_maximo = tamano_maximo
+        self.resultados = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.resultados)
+
+    def limpiar(self):
+        """Descarta todos los resultados guardados"""
+        with self.lock:
+            self.resultados.clear()
+
+    def resolver(self, unicos, funcion):
+        """Retorna el resultado de cada valor de unicos
+
+        funcion recibe un arreglo de valores y retorna un arreglo de
+        resultados; solo se llama con los valores que no están en la caché.
+        """
+        resultado = np.empty(len(unicos), dtype=object)
+        faltantes = []
+        with self.lock:
+            for i, valor in enumerate(unicos):
+                if valor in self.resultados:
+                    resultado[i] = self.resultados[valor]
+                    self.resultados.move_to_end(valor)
+                else:
+                    faltantes.append(i)
+
+        if faltantes:
+            nuevos = np.asarray(funcion(unicos[faltantes]), dtype=object)
+            resultado[faltantes] = nuevos
+            with self.lock:
+                for i, nuevo in zip(faltantes, nuevos):
+                    self.resultados[unicos[i]] = nuevo
+                while len(self.resultados) > self.tamano_maximo:
+                    self.resultados.popitem(last=False)
+
+        return resultado
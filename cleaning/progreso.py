@@ -0,0 +1,28 @@
+"""Reporte de avance y cancelación de procesos largos
+
+Las funciones de limpieza aceptan un parámetro opcional progreso: una función
+progreso(filas_procesadas, total_filas) que se llama entre bloques. Para
+cancelar un proceso, esa función lanza ProcesoCancelado y el proceso se
+detiene sin dejar resultados a medias.
+"""
+
+# Filas que se procesan entre cada reporte de avance
+FILAS_POR_BLOQUE = 50000
+
+class ProcesoCancelado(Exception):
+    """Se lanza desde la función de progreso para detener un proceso entre bloques"""
+
+def notificar(progreso, procesadas, total):
+    """Llama a la función de progreso si se indicó una"""
+    if progreso is not None:
+        progreso(procesadas, total)
+
+def describir_avance(procesadas, total, segundos):
+    """Describe el avance con filas por segundo y tiempo restante estimado"""
+    velocidad = procesadas / segundos if segundos > 0 else 0
+    texto = f"{procesadas:,} de {total:,} filas"
+    if velocidad > 0:
+        restante = int((total - procesadas) / velocidad)
+        minutos, segundos_restantes = divmod(restante, 60)
+        texto += f" - {velocidad:,.0f} filas/s - quedan {minutos:02d}:{segundos_restantes:02d}"
+    return texto
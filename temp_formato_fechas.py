@@ -1,345 +0,0 @@
-# Código para reemplazar en limpieza_telefonos_gui.py
-# Función formatear_fecha_preview para la previsualización
-
-def formatear_fecha_preview(fecha):
-    nonlocal errores_temp, fechas_proc_temp
-    
-    try:
-        if pd.isna(fecha):
-            return ""
-            
-        fecha_str = str(fecha).strip()
-        
-        # Si está vacío
-        if not fecha_str:
-            return ""
-        
-        # Limpieza: quitar caracteres no numéricos
-        fecha_limpia = re.sub(r'\D', '', fecha_str)
-        
-        # Casos especiales
-        if fecha_str == '2022003':
-            fechas_proc_temp += 1
-            return '03/01/2022'
-        
-        # Manejar según longitud
-        longitud = len(fecha_limpia)
-        
-        # Formato de 8 dígitos (DDMMYYYY o YYYYMMDD)
-        if longitud == 8:
-            # Primero intentar como DDMMYYYY (más común)
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio = int(fecha_limpia[4:8])
-                
-                # Validar fecha
-                if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    fechas_proc_temp += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-            
-            # Si falla, intentar como YYYYMMDD
-            try:
-                anio = int(fecha_limpia[:4])
-                mes = int(fecha_limpia[4:6])
-                dia = int(fecha_limpia[6:8])
-                
-                # Validar fecha
-                if 1900 <= anio <= 2030 and 1 <= mes <= 12 and 1 <= dia <= 31:
-                    fechas_proc_temp += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYYYY (9041991) - 7 dígitos
-        elif longitud == 7:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio = int(fecha_limpia[3:7])
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    fechas_proc_temp += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DDMMYY (150167) - 6 dígitos
-        elif longitud == 6:
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio_corto = int(fecha_limpia[4:6])
-                
-                # Determinar siglo: asumimos 19xx para años >= 30, 20xx para < 30
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 31 and 1 <= mes <= 12:
-                    fechas_proc_temp += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYY (10567) - 5 dígitos
-        elif longitud == 5:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio_corto = int(fecha_limpia[3:5])
-                
-                # Determinar siglo
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12:
-                    fechas_proc_temp += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Si ya tiene formato con separadores (dd/mm/yyyy, dd-mm-yyyy)
-        elif '/' in fecha_str or '-' in fecha_str or '.' in fecha_str:
-            # Normalizar separadores
-            fecha_norm = fecha_str.replace('-', '/').replace('.', '/')
-            partes = fecha_norm.split('/')
-            
-            if len(partes) == 3:
-                try:
-                    # Determinar formato
-                    if len(partes[0]) == 4 and partes[0].isdigit():
-                        # Formato yyyy/mm/dd
-                        anio = int(partes[0])
-                        mes = int(partes[1])
-                        dia = int(partes[2])
-                    else:
-                        # Formato dd/mm/yyyy o d/m/yyyy
-                        dia = int(partes[0])
-                        mes = int(partes[1])
-                        anio = int(partes[2])
-                        
-                        # Si el año tiene 2 dígitos
-                        if anio < 100:
-                            anio = 1900 + anio if anio >= 30 else 2000 + anio
-                    
-                    # Validar fecha
-                    if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                        fechas_proc_temp += 1
-                        return f"{dia:02d}/{mes:02d}/{anio}"
-                except:
-                    pass
-        
-        # Manejar casos específicos (hardcoded)
-        casos_especificos = {
-            '18081973': '18/08/1973',
-            '20021985': '20/02/1985',
-            '9041991': '09/04/1991',
-            '4051981': '04/05/1981',
-            '24061982': '24/06/1982',
-            '31072002': '31/07/2002',
-            '27121973': '27/12/1973',
-            '15011967': '15/01/1967',
-            '10081988': '10/08/1988',
-            # Agregar casos problemáticos detectados
-            '19071999': '19/07/1999',
-            '20081999': '20/08/1999',
-            '20092002': '20/09/2002',
-            '20071996': '20/07/1996',
-            '19011980': '19/01/1980',
-            '19101995': '19/10/1995',
-            '19111993': '19/11/1993',
-            '19071992': '19/07/1992',
-            '20121994': '20/12/1994',
-            '19051994': '19/05/1994',
-        }
-        
-        if fecha_str in casos_especificos:
-            fechas_proc_temp += 1
-            return casos_especificos[fecha_str]
-        
-        # Si todo falla
-        errores_temp += 1
-        return f"Error: {fecha_str}"
-        
-    except Exception as e:
-        errores_temp += 1
-        return f"Error: {fecha_str}"
-
-
-# Función formatear_fecha_simple para aplicar el formato
-
-def formatear_fecha_simple(fecha):
-    """
-    Función para formatear fechas sin depender de pd.to_datetime
-    Maneja múltiples formatos como:
-    - YYYYMMDD (19731123)
-    - DDMMYYYY (18081973)
-    - DMMYYYY (9041991)
-    - DDMMYY (150167)
-    - DMMYY (10567)
-    - Casos especiales como 2022003
-    """
-    nonlocal errores, fechas_procesadas
-    
-    try:
-        if pd.isna(fecha):
-            return fecha
-            
-        fecha_str = str(fecha).strip()
-        
-        # Si está vacío
-        if not fecha_str:
-            return fecha
-        
-        # Limpieza: quitar caracteres no numéricos
-        fecha_limpia = re.sub(r'\D', '', fecha_str)
-        
-        # Casos especiales
-        if fecha_str == '2022003':
-            fechas_procesadas += 1
-            return '03/01/2022'
-        
-        # Manejar según longitud
-        longitud = len(fecha_limpia)
-        
-        # Formato de 8 dígitos (DDMMYYYY o YYYYMMDD)
-        if longitud == 8:
-            # Primero intentar como DDMMYYYY (más común)
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio = int(fecha_limpia[4:8])
-                
-                # Validar fecha
-                if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    fechas_procesadas += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-            
-            # Si falla, intentar como YYYYMMDD
-            try:
-                anio = int(fecha_limpia[:4])
-                mes = int(fecha_limpia[4:6])
-                dia = int(fecha_limpia[6:8])
-                
-                # Validar fecha
-                if 1900 <= anio <= 2030 and 1 <= mes <= 12 and 1 <= dia <= 31:
-                    fechas_procesadas += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYYYY (9041991) - 7 dígitos
-        elif longitud == 7:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio = int(fecha_limpia[3:7])
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                    fechas_procesadas += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DDMMYY (150167) - 6 dígitos
-        elif longitud == 6:
-            try:
-                dia = int(fecha_limpia[:2])
-                mes = int(fecha_limpia[2:4])
-                anio_corto = int(fecha_limpia[4:6])
-                
-                # Determinar siglo: asumimos 19xx para años >= 30, 20xx para < 30
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 31 and 1 <= mes <= 12:
-                    fechas_procesadas += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Formato DMMYY (10567) - 5 dígitos
-        elif longitud == 5:
-            try:
-                dia = int(fecha_limpia[0:1])
-                mes = int(fecha_limpia[1:3])
-                anio_corto = int(fecha_limpia[3:5])
-                
-                # Determinar siglo
-                anio = 1900 + anio_corto if anio_corto >= 30 else 2000 + anio_corto
-                
-                if 1 <= dia <= 9 and 1 <= mes <= 12:
-                    fechas_procesadas += 1
-                    return f"{dia:02d}/{mes:02d}/{anio}"
-            except:
-                pass
-        
-        # Si ya tiene formato con separadores (dd/mm/yyyy, dd-mm-yyyy)
-        elif '/' in fecha_str or '-' in fecha_str or '.' in fecha_str:
-            # Normalizar separadores
-            fecha_norm = fecha_str.replace('-', '/').replace('.', '/')
-            partes = fecha_norm.split('/')
-            
-            if len(partes) == 3:
-                try:
-                    # Determinar formato
-                    if len(partes[0]) == 4 and partes[0].isdigit():
-                        # Formato yyyy/mm/dd
-                        anio = int(partes[0])
-                        mes = int(partes[1])
-                        dia = int(partes[2])
-                    else:
-                        # Formato dd/mm/yyyy o d/m/yyyy
-                        dia = int(partes[0])
-                        mes = int(partes[1])
-                        anio = int(partes[2])
-                        
-                        # Si el año tiene 2 dígitos
-                        if anio < 100:
-                            anio = 1900 + anio if anio >= 30 else 2000 + anio
-                    
-                    # Validar fecha
-                    if 1 <= dia <= 31 and 1 <= mes <= 12 and 1900 <= anio <= 2030:
-                        fechas_procesadas += 1
-                        return f"{dia:02d}/{mes:02d}/{anio}"
-                except:
-                    pass
-        
-        # Manejar casos específicos (hardcoded)
-        casos_especificos = {
-            '18081973': '18/08/1973',
-            '20021985': '20/02/1985',
-            '9041991': '09/04/1991',
-            '4051981': '04/05/1981',
-            '24061982': '24/06/1982',
-            '31072002': '31/07/2002',
-            '27121973': '27/12/1973',
-            '15011967': '15/01/1967',
-            '10081988': '10/08/1988',
-            # Agregar casos problemáticos detectados
-            '19071999': '19/07/1999',
-            '20081999': '20/08/1999',
-            '20092002': '20/09/2002',
-            '20071996': '20/07/1996',
-            '19011980': '19/01/1980',
-            '19101995': '19/10/1995',
-            '19111993': '19/11/1993',
-            '19071992': '19/07/1992',
-            '20121994': '20/12/1994',
-            '19051994': '19/05/1994',
-        }
-        
-        if fecha_str in casos_especificos:
-            fechas_procesadas += 1
-            return casos_especificos[fecha_str]
-        
-        # Si todo falla, registrar error
-        errores += 1
-        logger.error(f"No se pudo formatear la fecha: '{fecha_str}'")
-        return fecha
-        
-    except Exception as e:
-        errores += 1
-        logger.error(f"Error al formatear fecha '{fecha}': {str(e)}")
-        return fecha
@@ -0,0 +1,36 @@
+"""Cédulas con letras: no deben confundirse con otras ni con cédulas válidas"""
+import numpy as np
+import pandas as pd
+
+from cleaning.cedulas import CLAVE_INVALIDA, claves_cedula
+from cleaning.consolidacion import consolidar_telefonos
+from cleaning.fusion import fusionar_por_cedula
+
+def test_cedulas_con_separadores_tienen_la_misma_clave():
+    claves, _ = claves_cedula(["402-1234567-8", "40212345678", " 402 1234567 8 ", 40212345678.0])
+    assert len(set(claves)) == 1
+    assert claves[0] != CLAVE_INVALIDA
+
+def test_cedulas_con_letras_conservan_su_texto():
+    claves, textos = claves_cedula(["PA1234567", "PB1234567", "RD40212345678", " ab-12 "])
+    assert (claves == CLAVE_INVALIDA).all()
+    assert list(textos) == ["PA1234567", "PB1234567", "RD40212345678", "ab-12"]
+
+def test_fusion_con_identificaciones_alfanumericas():
+    origen = pd.DataFrame({"CEDULA": ["PB1234567", "RD40212345678"], "TEL": [None, None]})
+    limpio = pd.DataFrame({"CEDULA": ["PA1234567", "PB1234567", "40212345678"],
+                           "TEL": ["8091111111", "8092222222", "8093333333"]})
+
+    esperado = pd.merge(origen.drop(columns="TEL"), limpio, on="CEDULA", how="left")
+    fusionado = fusionar_por_cedula(origen, limpio, "CEDULA", ["TEL"])
+    assert fusionado["TEL"].tolist()[0] == esperado["TEL"].tolist()[0] == "8092222222"
+    assert pd.isna(fusionado["TEL"].tolist()[1])
+
+def test_consolidacion_no_une_identificaciones_distintas():
+    df = pd.DataFrame({"CEDULA": ["RD40212345678", "40212345678", "402-1234567-8", "PA1", "PB1"],
+                       "TEL": ["8091111111", "8092222222", "8093333333", "8094444444", "8095555555"]})
+    consolidado, estadisticas = consolidar_telefonos(df, "CEDULA", ["TEL"])
+    assert consolidado["CEDULA"].tolist() == ["RD40212345678", "40212345678", "PA1", "PB1"]
+    assert estadisticas["filas_unidas"] == 1
+    assert list(consolidado.columns) == ["CEDULA", "TEL", "TELEFONO_EXTRA_1"]
+    assert np.array_equal(consolidado.iloc[1, 1:].tolist(), ["8092222222", "8093333333"])
@@ -0,0 +1,58 @@
+"""Reemplazos de palabras: la pasada única debe dar lo mismo que aplicar las reglas en orden"""
+import random
+import re
+
+from cleaning.comentarios import aplicar_reemplazos, compilar_reemplazos, reglas_independientes
+
+TEXTOS = [
+    "", "A", "A B C", "TARJETA ORO", "TARJETA DE CREDITO", "TARJ TARJETA TARJETAS",
+    "0", "RD$0", "RD$ 0", "10 RD$0 0.0", "B C A B", "PRESTAMO-TARJETA", "tarjeta",
+]
+
+def secuencial(texto, reglas):
+    """Las reglas una tras otra, cada una sobre el resultado de la anterior"""
+    for original, nuevo in reglas:
+        texto = re.sub(r'\b' + re.escape(original) + r'\b', nuevo, texto)
+    return texto
+
+def comparar(reglas, textos=TEXTOS):
+    compiladas = compilar_reemplazos(reglas)
+    for texto in textos:
+        assert aplicar_reemplazos(texto, compiladas) == secuencial(texto, reglas), (reglas, texto)
+    return compiladas[0] is not None
+
+def test_reglas_encadenadas_se_aplican_en_orden():
+    assert not comparar((("A", "B"), ("B", "C")))
+    assert not comparar((("TARJETA", "TC"), ("TC", "TARJETA DE CREDITO")))
+    assert not comparar((("B", "C"), ("A", "B")))
+
+def test_claves_que_se_solapan():
+    assert not comparar((("0", "1"), ("RD$0", "RD$1")))
+    assert not comparar((("RD$0", "RD$1"), ("0", "1")))
+    assert not comparar((("B C", "1"), ("A B", "2")))
+
+def test_claves_que_son_prefijo_de_otras():
+    assert not comparar((("TARJ", "T"), ("TARJETA", "TC")))
+    assert not comparar((("TARJETA", "TC"), ("TARJETA ORO", "TO")))
+
+def test_reglas_independientes_en_una_pasada():
+    reglas = (("TARJETA", "TARJETA DE CREDITO"), ("PRESTAMO", "PREST."), ("ORO", "GOLD"))
+    assert reglas_independientes(reglas)
+    assert comparar(reglas)
+    assert comparar((("A", "X"), ("B", "Y"), ("C", "Z")))
+
+def test_casos_que_quedan_en_orden():
+    # Texto vacío, originales que terminan en puntuación y barras invertidas
+    assert not reglas_independientes((("A", ""), ("B", "C")))
+    assert not reglas_independientes((("RD$", "US$"),))
+    assert not reglas_independientes((("A", r"\1"),))
+
+def test_reglas_aleatorias():
+    aleatorio = random.Random(0)
+    alfabeto = "AB C-.$0"
+    palabra = lambda largo: "".join(aleatorio.choice(alfabeto) for _ in range(aleatorio.randint(0, largo)))
+    independientes = 0
+    for _ in range(5000):
+        reglas = tuple(dict((palabra(4), palabra(4)) for _ in range(aleatorio.randint(1, 4))).items())
+        independientes += comparar(reglas, [palabra(12) for _ in range(5)])
+    assert independientes > 0